@@ -0,0 +1 @@
+"""Benchmarks of CRD client against local stand-in backend."""
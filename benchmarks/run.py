@@ -0,0 +1,262 @@
+"""
+Benchmarks of ThreeScaleClientCRD operations against local stand-in backend.
+
+CRs are served by FakeTransport, REST fallbacks by RestStandIn. For every
+operation wall time, backend round trips, bytes parsed by client and peak
+memory are reported.
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+
+from threescale_api_crd import ThreeScaleClientCRD, constants
+from threescale_api_crd.fake import FakeTransport
+
+from benchmarks.standin import RestStandIn
+
+LIST_SIZES = (10, 100, 1000, 10000)
+PERIODS = ("eternity", "year", "month", "week", "day", "hour", "minute")
+
+
+class Backend:
+    """Stand-in backend with client connected to it."""
+
+    def __init__(self, reconcile_delay=0):
+        self.transport = FakeTransport(reconcile_delay=reconcile_delay)
+        self.rest = RestStandIn(self.transport).start()
+        self.client = ThreeScaleClientCRD(self.rest.url, "token", transport=self.transport)
+        self._names = itertools.count()
+
+    def name(self, prefix):
+        """Returns unique name."""
+        return f"{prefix}{next(self._names)}"
+
+    def counters(self):
+        """Returns round trips and bytes parsed so far."""
+        return (
+            self.transport.stats["requests"] + self.rest.stats["requests"],
+            self.transport.stats["bytes"] + self.rest.stats["bytes"],
+        )
+
+    def seed_products(self, count):
+        """Creates products directly in fake backend."""
+        for _ in range(count):
+            spec = copy.deepcopy(constants.SPEC_SERVICE)
+            name = self.name("seed")
+            spec["metadata"]["name"] = name
+            spec["metadata"]["namespace"] = self.transport.namespace
+            spec["spec"].pop("providerAccountRef")
+            spec["spec"].update({"name": name, "systemName": name, "description": name})
+            self.transport.create(spec)
+
+    def stop(self):
+        """Stops stand-in."""
+        self.rest.stop()
+
+
+def measure(backend, name, operation, repeat):
+    """Runs operation 'repeat' times and one more time to get peak memory."""
+    times, trips, parsed = [], [], []
+    for _ in range(repeat):
+        trips_before, bytes_before = backend.counters()
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+        trips_after, bytes_after = backend.counters()
+        trips.append(trips_after - trips_before)
+        parsed.append(bytes_after - bytes_before)
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "operation": name,
+        "runs": repeat,
+        "wall_ms": round(statistics.mean(times) * 1000, 2),
+        "round_trips": round(statistics.mean(trips), 1),
+        "bytes_parsed": int(statistics.mean(parsed)),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def bench_product_create(backend, repeat):
+    """Product create."""
+    services = backend.client.services
+    return [
+        measure(
+            backend,
+            "product_create",
+            lambda: services.create({"name": backend.name("product")}),
+            repeat,
+        )
+    ]
+
+
+def create_mapping_rules_in_batch(backend, service, count):
+    """Creates mapping rules in one batch of product changes."""
+    with service.batch():
+        for _ in range(count):
+            service.mapping_rules.create(
+                {"http_method": "GET", "pattern": "/" + backend.name("path"), "delta": 1}
+            )
+
+
+def list_limits_with_cold_cache(backend, plan, metric):
+    """Lists limits, ids of metrics are not cached."""
+    backend.client.identity_cache.invalidate()
+    return plan.limits(metric).list()
+
+
+def bench_nested_create(backend, repeat):
+    """Mapping rule, metric and limit create and limit list in one product."""
+    service = backend.client.services.create({"name": backend.name("nested")})
+    plan = service.app_plans.create({"name": "benchplan"})
+    metric = service.metrics.create({"name": "benchmetric", "unit": "hit"})
+    periods = itertools.cycle(PERIODS)
+    return [
+        measure(
+            backend,
+            "mapping_rule_create",
+            lambda: service.mapping_rules.create(
+                {"http_method": "GET", "pattern": "/" + backend.name("path"), "delta": 1}
+            ),
+            repeat,
+        ),
+        measure(
+            backend,
+            "mapping_rule_create_batch_10",
+            lambda: create_mapping_rules_in_batch(backend, service, 10),
+            repeat,
+        ),
+        measure(
+            backend,
+            "metric_create",
+            lambda: service.metrics.create(
+                {"name": backend.name("metric"), "unit": "hit"}
+            ),
+            repeat,
+        ),
+        measure(
+            backend,
+            "limit_create",
+            lambda: plan.limits(metric).create({"period": next(periods), "value": 10}),
+            repeat,
+        ),
+        measure(
+            backend,
+            "limit_list",
+            lambda: list_limits_with_cold_cache(backend, plan, metric),
+            repeat,
+        ),
+    ]
+
+
+def bench_list(backend, repeat, sizes=LIST_SIZES):
+    """Product list with growing number of products."""
+    results = []
+    seeded = len(backend.transport.objects("Product"))
+    for size in sizes:
+        backend.seed_products(max(size - seeded, 0))
+        seeded = max(size, seeded)
+        results.append(
+            measure(backend, f"list_{size}", backend.client.services.list, repeat)
+        )
+    return results
+
+
+def bench_application_read(backend, repeat):
+    """Application read, it includes REST credentials lookup."""
+    client = backend.client
+    service = client.services.create({"name": backend.name("appservice")})
+    account = client.accounts.create({"name": backend.name("account")})
+    app = account.applications.create(
+        {
+            "name": backend.name("app"),
+            "description": "benchmark",
+            "service_id": service.entity_id,
+            "plan_id": "AppPlanTest",
+        }
+    )
+    app_id = app.entity_id
+    return [
+        measure(
+            backend,
+            "application_read",
+            lambda: client.applications.read(app_id)["user_key"],
+            repeat,
+        )
+    ]
+
+
+def bench_promote(backend, repeat):
+    """Promote of product configuration."""
+    service = backend.client.services.create({"name": backend.name("promote")})
+    proxy = service.proxy.list()
+    return [measure(backend, "promote", proxy.deploy, repeat)]
+
+
+BENCHMARKS = {
+    "product_create": bench_product_create,
+    "nested_create": bench_nested_create,
+    "list": bench_list,
+    "application_read": bench_application_read,
+    "promote": bench_promote,
+}
+
+
+def print_table(results):
+    """Prints results as table."""
+    columns = ["operation", "runs", "wall_ms", "round_trips", "bytes_parsed", "peak_kib"]
+    widths = [
+        max(len(col), *(len(str(row[col])) for row in results)) for col in columns
+    ]
+    print("  ".join(col.ljust(width) for col, width in zip(columns, widths)))
+    for row in results:
+        print("  ".join(str(row[col]).ljust(width) for col, width in zip(columns, widths)))
+
+
+def main(argv=None):
+    """Runs benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "benchmarks", nargs="*", help="benchmarks to run: " + ", ".join(BENCHMARKS)
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per operation")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=LIST_SIZES, help="sizes of list benchmark"
+    )
+    parser.add_argument(
+        "--reconcile-delay", type=float, default=0, help="operator reconcile delay [s]"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as json")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error("unknown benchmarks: " + ", ".join(sorted(unknown)))
+    logging.disable(logging.INFO)
+
+    results = []
+    try:
+        for name in args.benchmarks or list(BENCHMARKS):
+            backend = Backend(args.reconcile_delay)
+            try:
+                if name == "list":
+                    results.extend(bench_list(backend, args.repeat, args.sizes))
+                else:
+                    results.extend(BENCHMARKS[name](backend, args.repeat))
+            finally:
+                backend.stop()
+    finally:
+        logging.disable(logging.NOTSET)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+    return results
@@ -0,0 +1,187 @@
+""" Local stand-in of 3scale admin REST API used by benchmarks """
+
+import collections
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RestStandIn:
+    """
+    Serves the part of 3scale admin REST API which is used by CRD client
+    as fallback. Responses are derived from CRs stored in FakeTransport.
+    """
+
+    ROUTES = [
+        (r"/admin/api/services/(\d+)/metrics\.json", "_metrics"),
+        (r"/admin/api/backend_apis/(\d+)/metrics\.json", "_backend_metrics"),
+        (r"/admin/api/services/(\d+)/proxy\.json", "_proxy"),
+        (r"/admin/api/accounts/(\d+)/applications/(\d+)\.json", "_application"),
+        (r"/admin/api/accounts/(\d+)/applications\.json", "_applications"),
+    ]
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.stats = collections.Counter()
+        self._ids = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        """Returns base url of running stand-in."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Starts HTTP server in background thread."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+                """Handles GET request."""
+                code, body = standin.handle(self.path.split("?")[0])
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stops HTTP server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, path):
+        """Returns status code and body of response for path."""
+        for pattern, method in RestStandIn.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if match:
+                body = getattr(self, method)(*[int(arg) for arg in match.groups()])
+                break
+        else:
+            body = None
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(json.dumps(body))
+        if body is None:
+            return 404, {"status": "Not found"}
+        return 200, body
+
+    def _id(self, *key):
+        with self._lock:
+            return self._ids.setdefault(key, len(self._ids) + 1)
+
+    def _by_status(self, kind, id_name, ide):
+        for obj in self.transport.objects(kind):
+            if obj.get("status", {}).get(id_name) == ide:
+                return obj
+        return None
+
+    def _metrics(self, service_id):
+        product = self._by_status("Product", "productId", service_id)
+        if product is None:
+            return None
+        return {
+            "metrics": [
+                {"metric": self._metric(product, name, spec, name)}
+                for name, spec in product["spec"].get("metrics", {}).items()
+            ]
+        }
+
+    def _backend_metrics(self, backend_id):
+        backend = self._by_status("Backend", "backendId", backend_id)
+        if backend is None:
+            return None
+        return {
+            "metrics": [
+                {"metric": self._metric(backend, name, spec, f"{name}.{backend_id}")}
+                for name, spec in backend["spec"].get("metrics", {}).items()
+            ]
+        }
+
+    def _metric(self, parent, name, spec, system_name):
+        return {
+            "id": self._id(parent["kind"], parent["metadata"]["name"], name),
+            "name": name,
+            "system_name": system_name,
+            "friendly_name": spec.get("friendlyName"),
+            "unit": spec.get("unit"),
+            "description": spec.get("description"),
+        }
+
+    def _proxy(self, service_id):
+        product = self._by_status("Product", "productId", service_id)
+        if product is None:
+            return None
+        name = product["metadata"]["name"]
+        return {
+            "proxy": {
+                "service_id": service_id,
+                "endpoint": f"https://{name}.example.com:443",
+                "sandbox_endpoint": f"https://{name}-staging.example.com:443",
+                "credentials_location": "query",
+                "auth_user_key": "user_key",
+                "auth_app_id": "app_id",
+                "auth_app_key": "app_key",
+                "api_test_path": "/",
+            }
+        }
+
+    def _application(self, account_id, application_id):
+        app = self._by_status("Application", "applicationID", application_id)
+        if app is None:
+            return None
+        return self._application_entity(account_id, app)
+
+    def _applications(self, account_id):
+        account = self._by_status("DeveloperAccount", "accountID", account_id)
+        if account is None:
+            return None
+        return {
+            "applications": [
+                self._application_entity(account_id, app)
+                for app in self.transport.objects("Application")
+                if app["spec"]["accountCR"]["name"] == account["metadata"]["name"]
+                and app.get("status", {}).get("applicationID")
+            ]
+        }
+
+    def _application_entity(self, account_id, app):
+        application_id = app["status"]["applicationID"]
+        product = next(
+            (
+                obj
+                for obj in self.transport.objects("Product")
+                if obj["metadata"]["name"] == app["spec"]["productCR"]["name"]
+            ),
+            {},
+        )
+        return {
+            "application": {
+                "id": application_id,
+                "account_id": account_id,
+                "service_id": product.get("status", {}).get("productId"),
+                "service_name": app["spec"]["productCR"]["name"],
+                "name": app["spec"].get("name"),
+                "state": app["status"].get("state"),
+                "user_key": f"key{application_id}",
+                "application_id": f"app{application_id}",
+                "client_id": f"client{application_id}",
+                "client_secret": f"secret{application_id}",
+            }
+        }
@@ -33,7 +33,7 @@ setup(name='3scale-api-crd',
       author_email='kudlej.martin@gmail.com',
       maintainer='Martin Kudlej',
       url='https://github.com/3scale-qe/3scale-api-python-crd',
-      packages=find_packages(exclude=("tests",)),
+      packages=find_packages(exclude=("tests", "benchmarks")),
       long_description=long_description,
       long_description_content_type='text/markdown',
       include_package_data=True,
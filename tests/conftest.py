@@ -1,3 +1,44 @@
+import pytest
+
 from threescale_api import log_config
 
+from threescale_api_crd import ThreeScaleClientCRD, defaults, resources
+from threescale_api_crd.fake import FakeTransport
+
 log_config.load_config()
+
+# class attributes switched at runtime, values of definitions are restored for unit tests
+CLASS_STATE = {
+    (klass, attr): vars(klass)[attr]
+    for module in (defaults, resources)
+    for klass in vars(module).values()
+    if isinstance(klass, type)
+    for attr in ("CRD_IMPLEMENTED", "LIST_TYPE")
+    if attr in vars(klass)
+}
+
+
+@pytest.fixture()
+def class_state():
+    for (klass, attr), value in CLASS_STATE.items():
+        setattr(klass, attr, value)
+
+
+@pytest.fixture()
+def transport():
+    return FakeTransport()
+
+
+@pytest.fixture()
+def rest(transport):
+    from benchmarks.standin import RestStandIn
+
+    rest = RestStandIn(transport).start()
+    yield rest
+    rest.stop()
+
+
+@pytest.fixture()
+def client(class_state, rest, transport):
+    # identity cache belongs to the client, new client does not see ids of other tests
+    return ThreeScaleClientCRD(rest.url, "token", transport=transport)
@@ -1,8 +1,7 @@
 import pytest
 
-import openshift_client as ocp
-from openshift_client import OpenShiftPythonException
 from threescale_api_crd import client
+from threescale_api_crd.transport import HttpTransport
 
 
 @pytest.fixture()
@@ -34,11 +33,16 @@ def api(url, token, ocp_provider_ref):
 
 
 @pytest.fixture()
-def namespace():
-    try:
-        return ocp.get_project_name()
-    except OpenShiftPythonException:
-        return "NOT LOGGED IN"
+def namespace(tmp_path, monkeypatch):
+    path = tmp_path / "config"
+    path.write_text(
+        "current-context: dev\n"
+        "contexts:\n"
+        "- name: dev\n"
+        "  context: {cluster: c1, user: u1, namespace: project}\n"
+    )
+    monkeypatch.setenv("KUBECONFIG", str(path))
+    return "project"
 
 
 @pytest.mark.smoke
@@ -49,3 +53,14 @@ def test_api_client_initialization(api, url, ocp_provider_ref, namespace):
     assert api.admin_api_url == f"{url}/admin/api"
     assert api.ocp_provider_ref == ocp_provider_ref
     assert api.ocp_namespace == namespace
+
+
+@pytest.mark.smoke
+def test_api_client_is_built_lazily(api, namespace, tmp_path, monkeypatch):
+    assert "services" not in vars(api)
+    assert api.services is api.services
+    assert api.services.threescale_client is api
+    monkeypatch.setenv("KUBECONFIG", str(tmp_path / "missing"))
+    monkeypatch.setattr(HttpTransport, "SERVICE_ACCOUNT_DIR", str(tmp_path))
+    assert client.ThreeScaleClientCRD.get_namespace(None) == "NOT LOGGED IN"
+    assert client.ThreeScaleClientCRD.get_namespace("ns") == "ns"
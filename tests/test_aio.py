@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import pytest
+
+from threescale_api_crd import AsyncThreeScaleClientCRD, ThreeScaleClientCRD
+from threescale_api_crd.fake import FakeTransport
+
+
+@pytest.mark.smoke
+def test_async_creates_in_flight_at_once():
+    transport = FakeTransport(delays={"Product": 0.3})
+
+    async def provision():
+        async with AsyncThreeScaleClientCRD(
+            "https://3scale.example.com", "token", transport=transport
+        ) as client:
+            start = time.monotonic()
+            services = await asyncio.gather(
+                *(client.services.create({"name": f"svc{i}"}) for i in range(10))
+            )
+            elapsed = time.monotonic() - start
+            listed = await client.services.list()
+            service = await client.services.read_by_name("svc3")
+            await client.services.update(params={"description": "changed"}, resource=service)
+            await client.services.delete(resource=services[0])
+            rules = client.collection(service.mapping_rules)
+            await rules.create({"http_method": "GET", "pattern": "/a", "delta": 1})
+            return services, elapsed, listed, await rules.list()
+
+    services, elapsed, listed, rules = asyncio.run(provision())
+    assert [service["system_name"] for service in services] == [f"svc{i}" for i in range(10)]
+    assert elapsed < 2
+    assert len(listed) == 10
+    assert len(rules) == 1
+    assert len(transport.objects("Product")) == 9
+    assert {obj["spec"].get("description") for obj in transport.objects("Product")} >= {"changed"}
+
+
+@pytest.mark.smoke
+def test_async_close_keeps_passed_client():
+    transport = FakeTransport()
+    sync = ThreeScaleClientCRD(
+        "https://3scale.example.com", "token", transport=transport, use_informers=True
+    )
+    sync.services.list()
+    executor, informer = sync.executor, sync.informer("Product")
+
+    async def provision():
+        async with AsyncThreeScaleClientCRD(client=sync) as client:
+            await client.services.create({"name": "svc"})
+
+    asyncio.run(provision())
+    assert sync.executor is executor
+    assert sync.informer("Product") is informer
+    assert len(sync.services.list()) == 1
+    sync.close()
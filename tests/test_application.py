@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+
+def create_apps(client, count):
+    service = client.services.create({"name": "appsvc"})
+    account = client.accounts.create({"name": "appacc"})
+    return [
+        account.applications.create(
+            {
+                "name": f"app{i}",
+                "description": "app",
+                "service_id": service.entity_id,
+                "plan_id": "AppPlanTest",
+            }
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.smoke
+def test_set_state_waits_by_watch(client, transport):
+    app = create_apps(client, 1)[0]
+    assert app["state"] == "live"
+    transport.delays["Application"] = 0.2
+    start = time.monotonic()
+    app = app.set_state("suspend")
+    assert app["state"] == "suspended"
+    assert time.monotonic() - start < 5
+    assert transport.objects("Application")[0]["status"]["state"] == "suspended"
+    assert app.set_state("unknown") is app
+
+
+@pytest.mark.smoke
+def test_set_state_many(client, transport):
+    apps = create_apps(client, 3)
+    transport.delays["Application"] = 0.2
+    apps = client.applications.list()
+    stats = transport.stats.copy()
+    with client.instrumentation.record() as rec:
+        apps = client.applications.set_state_many(apps, "suspend")
+    assert [app["state"] for app in apps] == ["suspended"] * 3
+    assert transport.stats["watch"] - stats["watch"] == 1
+    assert transport.stats["list"] == stats["list"]
+    # only the updates read CRDs, waiting does not
+    assert transport.stats["get"] - stats["get"] == len(apps)
+    assert not [r for r in rec.records if r.source == "rest"]
+    assert {obj["status"]["state"] for obj in transport.objects("Application")} == {"suspended"}
+    apps = client.applications.set_state_many(apps, "resume")
+    assert [app["state"] for app in apps] == ["live"] * 3
+
+
+@pytest.mark.smoke
+def test_keys_loaded_lazily_per_account(client, transport):
+    create_apps(client, 3)
+    apps = client.applications.list()
+    with client.instrumentation.record() as rec:
+        assert sorted(app["name"] for app in apps) == ["app0", "app1", "app2"]
+        assert {app["state"] for app in apps} == {"live"}
+    assert not rec.records
+    with client.instrumentation.record() as rec:
+        keys = {app["user_key"] for app in apps}
+        assert keys == {f"key{app['id']}" for app in apps}
+    assert [r.kind for r in rec.records if r.source == "rest"] == ["accounts/applications"]
+
+
+@pytest.mark.smoke
+def test_keys_loaded_again_after_read(client):
+    create_apps(client, 1)
+    app = client.applications.list()[0]
+    key = app["user_key"]
+    assert key == f"key{app['id']}"
+    app.read()
+    assert app["user_key"] == key
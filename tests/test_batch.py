@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from threescale_api_crd.transport import TransportError
+
+
+@pytest.mark.smoke
+def test_batch_sends_one_replace(client, transport):
+    service = client.services.create({"name": "svc"})
+    replaces = transport.stats["replace"]
+    with service.batch():
+        for i in range(20):
+            service.mapping_rules.create(
+                {"http_method": "GET", "pattern": f"/p{i}", "delta": 1}
+            )
+        metric = service.metrics.create({"name": "m1", "unit": "hit", "friendly_name": "m1"})
+        assert metric["system_name"] == "m1"
+        rule = service.mapping_rules.list()[0]
+        rule.update({"delta": 5})
+        service.mapping_rules.list()[1].delete()
+        assert not transport.objects("Product")[0]["spec"].get("mappingRules")
+    assert transport.stats["replace"] - replaces == 1
+    spec = transport.objects("Product")[0]["spec"]
+    assert len(spec["mappingRules"]) == 19
+    assert spec["mappingRules"][-1]["increment"] == 5
+    assert "m1" in spec["metrics"]
+    assert len(client.services.read(service.entity_id).mapping_rules.list()) == 19
+
+
+@pytest.mark.smoke
+def test_batch_drops_changes_on_error(client, transport):
+    service = client.services.create({"name": "svc"})
+    replaces = transport.stats["replace"]
+    with pytest.raises(RuntimeError):
+        with service.batch():
+            service.mapping_rules.create({"http_method": "GET", "pattern": "/a", "delta": 1})
+            raise RuntimeError("stop")
+    assert transport.stats["replace"] == replaces
+    assert not service.mapping_rules.list()
+
+
+@pytest.mark.smoke
+def test_batch_of_nested_limits(client, transport):
+    service = client.services.create({"name": "svc"})
+    metric = service.metrics.read_by_name("hits")
+    plan = service.app_plans.create({"name": "plan"})
+    with service.batch():
+        for period in ("day", "hour", "minute"):
+            plan.limits(metric).create({"period": period, "value": 10})
+    plans = transport.objects("Product")[0]["spec"]["applicationPlans"]
+    assert len(plans["plan"]["limits"]) == 3
+    assert len(plan.limits(metric).list()) == 3
+
+
+@pytest.mark.smoke
+def test_batch_keeps_concurrent_change(client, transport):
+    service = client.services.create({"name": "svc"})
+    replaces = transport.stats["replace"]
+    with service.batch():
+        service.mapping_rules.create({"http_method": "GET", "pattern": "/a", "delta": 1})
+        name = transport.objects("Product")[0]["metadata"]["name"]
+        transport.patch("Product", transport.namespace, name, {"spec": {"description": "other"}})
+    assert transport.stats["replace"] - replaces == 2
+    spec = transport.objects("Product")[0]["spec"]
+    assert spec["description"] == "other"
+    assert spec["mappingRules"][-1]["pattern"] == "/a"
+
+
+@pytest.mark.smoke
+def test_batch_without_base_raises_conflict(client, transport):
+    service = client.services.create({"name": "svc"})
+    crd = service.crd
+    client.services.begin_batch(crd)
+    name = crd.name()
+    transport.patch("Product", transport.namespace, name, {"spec": {"description": "other"}})
+    with pytest.raises(TransportError) as err:
+        client.services.end_batch(crd)
+    assert err.value.code == 409
+
+
+@pytest.mark.smoke
+def test_batch_is_local_to_thread(client, transport):
+    service = client.services.create({"name": "svc"})
+    seen = []
+    with service.batch():
+        service.mapping_rules.create({"http_method": "GET", "pattern": "/a", "delta": 1})
+        thread = threading.Thread(
+            target=lambda: seen.append(dict(client.batches)))
+        thread.start()
+        thread.join()
+        assert client.batches
+    assert seen == [{}]
@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks.run import main
+
+
+@pytest.mark.smoke
+def test_benchmarks_run(capsys):
+    results = main(["--repeat", "1", "--sizes", "10", "--json"])
+    operations = [row["operation"] for row in results]
+    assert operations == [
+        "product_create",
+        "mapping_rule_create",
+        "mapping_rule_create_batch_10",
+        "metric_create",
+        "limit_create",
+        "limit_list",
+        "list_10",
+        "application_read",
+        "promote",
+    ]
+    assert all(row["round_trips"] > 0 for row in results)
+    assert '"operation": "promote"' in capsys.readouterr().out
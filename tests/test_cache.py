@@ -0,0 +1,91 @@
+import pytest
+
+from threescale_api_crd import ThreeScaleClientCRD
+from threescale_api_crd.cache import IdentityCache
+
+
+@pytest.mark.smoke
+def test_identity_cache_lru_ttl_and_invalidation(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("threescale_api_crd.cache.time.monotonic", lambda: now[0])
+    cache = IdentityCache(maxsize=4, ttl=10)
+    cache.put("Metric", "hits", 1, owner=("Product", "a"), scope=("Product", "a"))
+    cache.put("Metric", "hits", 2, owner=("Product", "b"), scope=("Product", "b"))
+    assert cache.get_id("Metric", "hits", scope=("Product", "a")) == 1
+    assert cache.get_name("Metric", 2) == "hits"
+    assert cache.get_id("Metric", "hits") is None
+    # least recently used entries are evicted
+    cache.put("Service", "svc", 3, owner=("Product", "svc"))
+    assert cache.get_name("Metric", 1) is None
+    assert cache.get_id("Metric", "hits", scope=("Product", "b")) is None
+    assert cache.get_id("Metric", "hits", scope=("Product", "a")) == 1
+    cache.invalidate(("Product", "a"))
+    assert cache.get_id("Metric", "hits", scope=("Product", "a")) is None
+    now[0] += 11
+    assert cache.get_id("Service", "svc") is None
+    assert len(cache) == 2
+    assert cache.stats["hits"] == 3
+    assert cache.stats["misses"] == 5
+    assert cache.stats["evictions"] == 2
+    assert cache.stats["expirations"] == 1
+    assert cache.stats["invalidations"] == 1
+
+
+@pytest.mark.smoke
+def test_identity_cache_per_client(rest, transport, client):
+    other = ThreeScaleClientCRD(rest.url, "token", transport=transport)
+    service = client.services.create({"name": "svc"})
+    metric = service.metrics.read_by_name("hits")
+    plan = service.app_plans.create({"name": "plan"})
+    plan.limits(metric).create({"period": "day", "value": 10})
+    cache = client.identity_cache
+    client.services.list()
+    assert cache.get_id("Service", "svc") == service.entity_id
+    assert not other.identity_cache.get_id("Service", "svc")
+    with client.instrumentation.record() as rec:
+        limits = plan.limits(metric).list() + plan.limits(metric).list()
+    assert {limit["metric_id"] for limit in limits} == {
+        cache.get_id("Metric", "hits", scope=("Product", "svc"))
+    }
+    assert not [r for r in rec.records if r.source == "rest"]
+    service.update({"description": "changed"})
+    assert cache.get_id("Metric", "hits", scope=("Product", "svc")) is None
+
+
+@pytest.mark.smoke
+def test_metric_ids_of_limits_read_by_one_request(client):
+    service = client.services.create({"name": "svc"})
+    metrics = [
+        service.metrics.create({"name": f"m{i}", "unit": "hit", "friendly_name": f"m{i}"})
+        for i in range(3)
+    ]
+    plan = service.app_plans.create({"name": "plan"})
+    with service.batch():
+        for metric in metrics:
+            for period in ("day", "hour"):
+                plan.limits(metric).create({"period": period, "value": 10})
+    client.identity_cache.invalidate()
+    with client.instrumentation.record() as rec:
+        limits = [limit for metric in metrics for limit in plan.limits(metric).list()]
+    assert len(limits) == 6
+    assert len({limit["metric_id"] for limit in limits}) == 3
+    assert [r.kind for r in rec.records if r.source == "rest"] == ["services/metrics"]
+
+
+@pytest.mark.smoke
+def test_backend_of_limits_resolved_once(client):
+    service = client.services.create({"name": "svc"})
+    backend = client.backends.create(
+        {"name": "back", "private_endpoint": "https://back.example.com"}
+    )
+    metric = backend.metrics.read_by_name("hits")
+    plan = service.app_plans.create({"name": "plan"})
+    with service.batch():
+        for period in ("day", "hour", "minute"):
+            plan.limits(metric).create({"period": period, "value": 10})
+    client.identity_cache.invalidate()
+    with client.instrumentation.record() as rec:
+        limits = plan.limits(metric).list()
+    assert len(limits) == 3
+    assert len([r for r in rec.records if r.kind == "Backend"]) <= 1
+    assert {limit["metric_id"] for limit in limits} == {backend.metrics.metric_id("hits")}
\ No newline at end of file
@@ -0,0 +1,327 @@
+import gc
+import json
+import time
+import weakref
+
+import pytest
+
+import threescale_api.errors
+
+from threescale_api_crd import ThreeScaleClientCRD, constants
+from threescale_api_crd.defaults import DefaultResourceCRD, DictQuery
+from threescale_api_crd.fake import FakeTransport
+from threescale_api_crd.transport import TransportError
+
+
+def _product(name):
+    return {
+        "kind": "Product",
+        "apiVersion": "capabilities.3scale.net/v1beta1",
+        "metadata": {"name": name, "namespace": "fake"},
+        "spec": {"name": name},
+    }
+
+
+def _conditions(obj):
+    return {cond["type"]: cond["status"] for cond in obj["status"]["conditions"]}
+
+
+@pytest.fixture()
+def client():
+    return ThreeScaleClientCRD("https://3scale.example.com", "token", transport=FakeTransport())
+
+
+@pytest.mark.smoke
+def test_fake_reconciles_status():
+    transport = FakeTransport()
+    transport.create(_product("a"))
+    transport.create(_product("b"))
+    obj = transport.get("Product", "fake", "b")
+    assert obj["status"]["productId"] == 2
+    assert _conditions(obj)["Synced"] == "True"
+    assert "hits" in obj["spec"]["metrics"]
+    assert transport.get("Product", "other", "b") is None
+    with pytest.raises(TransportError) as err:
+        transport.create(_product("a"))
+    assert err.value.code == 409
+
+
+@pytest.mark.smoke
+def test_fake_failure_and_conflict():
+    transport = FakeTransport()
+    transport.fail("Product", "wrong spec")
+    obj = transport.create(_product("a"))
+    assert _conditions(transport.get("Product", "fake", "a"))["Failed"] == "True"
+    obj["spec"]["description"] = "changed"
+    with pytest.raises(TransportError) as err:
+        transport.replace(obj)
+    assert err.value.code == 409
+
+
+@pytest.mark.smoke
+def test_fake_patch():
+    transport = FakeTransport()
+    obj = transport.create(_product("a"))
+    patched = transport.patch("Product", "fake", "a", {"spec": {"description": "d", "name": None}})
+    assert patched["spec"]["description"] == "d"
+    assert "name" not in patched["spec"]
+    assert patched["status"]["productId"] == 1
+    with pytest.raises(TransportError) as err:
+        transport.patch("Product", "fake", "a", {"metadata": obj["metadata"], "spec": {}})
+    assert err.value.code == 409
+
+
+@pytest.mark.smoke
+def test_fake_client_patch_mode():
+    transport = FakeTransport()
+    client = ThreeScaleClientCRD(
+        "https://3scale.example.com", "token", transport=transport, update_mode="patch"
+    )
+    service = client.services.create({"name": "svc"})
+    service.mapping_rules.create({"http_method": "GET", "pattern": "/a", "delta": 1})
+    # operator changed status after the patch, known resourceVersion is stale
+    transport.stats.clear()
+    service.update({"description": "first"})
+    assert (transport.stats["patch"], transport.stats["get"]) == (2, 1)
+    service = client.services.read(service.entity_id)
+    transport.stats.clear()
+    service.update({"description": "changed"})
+    assert (transport.stats["patch"], transport.stats["get"]) == (1, 0)
+    product = transport.objects("Product")[0]
+    assert transport.stats["bytes_sent"] < len(json.dumps(product)) / 2
+    spec = product["spec"]
+    assert spec["description"] == "changed"
+    assert len(spec["mappingRules"]) == 1
+
+
+@pytest.mark.smoke
+def test_fake_reconcile_delay_and_watch():
+    transport = FakeTransport(delays={"Product": 0.1})
+    version = transport.list("Product", "fake")["metadata"]["resourceVersion"]
+    transport.create(_product("a"))
+    assert "status" not in transport.get("Product", "fake", "a")
+    with transport.watch("Product", "fake", version, timeout=5) as watch:
+        for event in watch:
+            if "status" in event["object"]:
+                break
+    assert event["type"] == "MODIFIED"
+    assert event["object"]["status"]["productId"] == 1
+
+
+@pytest.mark.smoke
+def test_fake_client_flows(client):
+    service = client.services.create({"name": "svc"})
+    assert service.entity_id == 1
+    rule = service.mapping_rules.create({"http_method": "GET", "pattern": "/a", "delta": 1})
+    assert rule["pattern"] == "/a"
+    metric = service.metrics.create({"name": "m1", "unit": "hit", "friendly_name": "m1"})
+    assert metric["system_name"] == "m1"
+    assert client.services.read(1)["system_name"] == "svc"
+    assert len(client.services.read_by_name("svc").mapping_rules.list()) == 1
+    service.delete()
+    assert not client.services.list()
+
+
+@pytest.mark.smoke
+def test_fake_client_waits_for_ready_by_watch():
+    transport = FakeTransport(delays={"Product": 0.2, "Backend": 5})
+    client = ThreeScaleClientCRD(
+        "https://3scale.example.com", "token", transport=transport, ready_timeouts={"Backend": 0.3}
+    )
+    start = time.monotonic()
+    service = client.services.create({"name": "svc"})
+    assert time.monotonic() - start < 0.9
+    assert service.entity_id == 1
+    assert (transport.stats["get"], transport.stats["watch"]) == (1, 1)
+    with pytest.raises(threescale_api.errors.ThreeScaleApiError):
+        client.backends.create({"name": "back", "private_endpoint": "https://back.example.com"})
+
+
+@pytest.mark.smoke
+def test_fake_client_stops_waiting_on_failure():
+    transport = FakeTransport(delays={"Product": 0.2})
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    transport.fail("Product", "wrong spec")
+    start = time.monotonic()
+    with pytest.raises(threescale_api.errors.ThreeScaleApiError) as err:
+        client.services.create({"name": "svc"})
+    assert "wrong spec" in str(err.value)
+    services = client.services.create_many([{"name": "s1"}, {"name": "s2"}])
+    assert all("wrong spec" in str(service) for service in services)
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.smoke
+def test_fake_client_create_many():
+    transport = FakeTransport(delays={"Product": 0.2, "DeveloperAccount": 0.2})
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    start = time.monotonic()
+    services = client.services.create_many([{"name": "s1"}, {"name": "s2"}, {"name": "s1"}])
+    assert time.monotonic() - start < 0.9
+    assert [service["system_name"] for service in services[:2]] == ["s1", "s2"]
+    assert isinstance(services[2], TransportError) and services[2].code == 409
+    assert transport.stats["watch"] == 1
+
+    accounts = client.accounts.create_many(
+        [
+            {"name": f"Acc-{i}", "org_name": f"Org {i}", "username": f"user{i}", "email": f"u{i}@example.com"}
+            for i in range(3)
+        ]
+    )
+    assert [account["org_name"] for account in accounts] == [f"Org {i}" for i in range(3)]
+    assert [account.crd.name() for account in accounts] == [f"acc{i}" for i in range(3)]
+    users = transport.objects("DeveloperUser")
+    assert sorted(user["spec"]["developerAccountRef"]["name"] for user in users) == ["acc0", "acc1", "acc2"]
+
+
+@pytest.mark.smoke
+def test_fake_client_entity_id_by_watch():
+    transport = FakeTransport()
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    service = client.services.create({"name": "svc"})
+    transport.delays["Product"] = 0.2
+    transport.create(_product("late"))
+    late = client.services.read_by_name("late")
+    assert late["id"] is None
+    future = late.entity_id_future()
+    start = time.monotonic()
+    assert late.entity_id == 2
+    assert time.monotonic() - start < 0.9
+    assert future.result(timeout=1) == 2
+    assert service.entity_id_future().result() == 1
+    transport.create(_product("never"))
+    assert client.services.read_by_name("never").get_id_from_crd(timeout=0.1) is None
+
+
+@pytest.mark.smoke
+def test_fake_client_with_informers():
+    client = ThreeScaleClientCRD(
+        "https://3scale.example.com", "token", transport=FakeTransport(), use_informers=True
+    )
+    try:
+        client.services.create({"name": "svc"})
+        deadline = time.monotonic() + 5
+        while not client.services.read(1) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.services.read(1)["system_name"] == "svc"
+    finally:
+        client.stop_informers()
+
+
+@pytest.mark.smoke
+def test_fake_client_backend_usages_share_backend_map(client):
+    backends = [
+        client.backends.create({"name": f"back{i}", "private_endpoint": "https://back.example.com"})
+        for i in range(3)
+    ]
+    service = client.services.create({"name": "svc"})
+    for i, backend in enumerate(backends):
+        service.backend_usages.create({"backend_id": backend.entity_id, "path": f"/b{i}"})
+    with client.instrumentation.record() as rec:
+        usages = service.backend_usages.list()
+        assert sorted(usage["backend_id"] for usage in usages) == [1, 2, 3]
+        usages[0].delete()
+        assert len(service.backend_usages.list()) == 2
+    # backends are not read again for every usage
+    assert not [r for r in rec.records if r.kind == "Backend"]
+    client.backends.create({"name": "back3", "private_endpoint": "https://back.example.com"})
+    assert client.backends.id_by_name("back3") == 4
+    assert client.backends.name_by_id(4) == "back3"
+
+
+@pytest.mark.smoke
+def test_translate_from_crd_inverts_keys(client):
+    services = client.services
+    params = {"name": "svc", "system_name": "svc", "description": "d", "unknown": 1}
+    spec = services.translate_to_crd(params)
+    assert spec == {"name": "svc", "systemName": "svc", "description": "d"}
+    entity = DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_SERVICE)
+    assert entity == {"name": "svc", "system_name": "svc", "description": "d"}
+    for name in dir(constants):
+        if name.startswith("CRD_KEYS_"):
+            keys = getattr(constants, name[len("CRD_"):])
+            assert constants.invert_keys(getattr(constants, name)) == keys
+
+
+@pytest.mark.smoke
+def test_dict_query_compiled_paths():
+    obj = {"spec": {"plans": [{"limits": [1]}, {"limits": []}, None], "name": "p"}}
+    assert DictQuery(obj).get("spec/name") == "p"
+    assert DictQuery(obj).get("spec/plans/limits") == [[1], [], None]
+    assert DictQuery(obj).get("spec/missing/name") is None
+    assert DictQuery.compile("spec/name") is DictQuery.compile("spec/name")
+    products = [_product("a"), {"spec": {}}, None]
+    assert list(DictQuery.extract(products, "spec/name", 0)) == [
+        (products[0], "a"),
+        (products[1], {}),
+        (None, 0),
+    ]
+
+
+@pytest.mark.smoke
+def test_fake_client_nested_list_reads_only_parent(client):
+    services = client.services.create_many([{"name": f"svc{i}"} for i in range(5)])
+    service = services[2]
+    service.metrics.create({"name": "m1", "unit": "hit", "friendly_name": "m1"})
+    with client.instrumentation.record() as rec:
+        metrics = service.metrics.list()
+    assert sorted(metric["system_name"] for metric in metrics) == ["hits", "m1"]
+    assert [(r.verb, r.kind) for r in rec.records] == [("get", "Product")]
+
+
+@pytest.mark.smoke
+def test_fake_client_sub_clients_are_memoized(client):
+    service = client.services.create({"name": "svc"})
+    assert service.metrics is service.metrics
+    assert service.mapping_rules is service.mapping_rules
+    assert service.metrics.parent is service
+    metric = service.metrics.create({"name": "m1", "unit": "hit", "friendly_name": "m1"})
+    assert metric.methods is metric.methods
+    # service and its sub-clients are collected together
+    ref = weakref.ref(service)
+    del service, metric
+    gc.collect()
+    assert ref() is None
+
+
+@pytest.mark.smoke
+def test_fake_client_wait_for_many_relists_after_expired_version():
+    transport = FakeTransport(history=2)
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    services = client.services.create_many([{"name": f"s{i}"} for i in range(3)])
+    names = [service.crd.name() for service in services]
+    lists = transport.stats["list"]
+    ready = client.services.wait_for_ready_many(names, version="1", timeout=5)
+    assert sorted(ready) == sorted(names)
+    assert not any(isinstance(obj, Exception) for obj in ready.values())
+    assert transport.stats["list"] - lists == 1
+
+
+@pytest.mark.smoke
+def test_password_secret_names_are_unique():
+    transport = FakeTransport()
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    # account + username are the same when concatenated
+    for account_name, username in (("acc", "1user"), ("acc1", "user")):
+        account = client.accounts.create(
+            {
+                "name": account_name,
+                "org_name": account_name,
+                "username": f"admin{account_name}",
+                "email": f"admin@{account_name}.example.com",
+            }
+        )
+        account.users.create(
+            {
+                "account_name": account.crd.name(),
+                "username": username,
+                "email": f"{username}@{account_name}.example.com",
+                "password": username,
+            }
+        )
+    users = [
+        user for user in transport.objects("DeveloperUser") if "admin" not in user["spec"]["username"]
+    ]
+    refs = {user["spec"]["passwordCredentialsRef"]["name"] for user in users}
+    assert len(users) == 2 and len(refs) == 2
+    assert all(ref.endswith("-pwdsec") for ref in refs)
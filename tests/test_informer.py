@@ -0,0 +1,134 @@
+import pytest
+
+from threescale_api_crd.fake import FakeTransport
+from threescale_api_crd.informer import Informer
+from threescale_api_crd.transport import Watch
+
+
+def _product(name, version, product_id=None):
+    obj = {"metadata": {"name": name, "resourceVersion": version}, "spec": {"name": name}}
+    if product_id:
+        obj["status"] = {"productId": product_id}
+    return obj
+
+
+class StubTransport:
+    def __init__(self):
+        self.listing = {"metadata": {"resourceVersion": "10"}, "items": [_product("a", "5"), _product("b", "6")]}
+        self.get = lambda kind, namespace, name: None
+
+    def list(self, kind, namespace):
+        return self.listing
+
+
+@pytest.fixture()
+def transport():
+    return StubTransport()
+
+
+@pytest.fixture()
+def informer(transport):
+    inf = Informer("Product", "ns", transport)
+    inf.relist()
+    return inf
+
+
+@pytest.mark.smoke
+def test_informer_initial_list(informer):
+    assert informer.resource_version == "10"
+    assert sorted(obj.name() for obj in informer.list()) == ["a", "b"]
+    assert informer.get("a").kind(lowercase=False) == "Product"
+    assert informer.get("missing") is None
+
+
+@pytest.mark.smoke
+def test_informer_watch_events(informer):
+    informer.handle_event({"type": "ADDED", "object": _product("c", "11")})
+    informer.handle_event({"type": "MODIFIED", "object": _product("a", "12", 7)})
+    informer.handle_event({"type": "DELETED", "object": _product("b", "13")})
+    informer.handle_event({"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "14"}}})
+    assert sorted(obj.name() for obj in informer.list()) == ["a", "c"]
+    assert informer.get("a").as_dict()["status"]["productId"] == 7
+    assert informer.resource_version == "14"
+
+
+@pytest.mark.smoke
+def test_informer_gone_relists(informer, transport):
+    transport.listing = {"metadata": {"resourceVersion": "20"}, "items": [_product("z", "19")]}
+    assert informer.handle_event({"type": "ERROR", "object": {"code": 410}})
+    assert [obj.name() for obj in informer.list()] == ["z"]
+    assert informer.resource_version == "20"
+
+
+@pytest.mark.smoke
+def test_informer_watch_restarts_after_relist(informer, transport):
+    watches = []
+
+    def watch(kind, namespace, resource_version=None, name=None, timeout=None):
+        watches.append(resource_version)
+        if len(watches) == 1:
+            transport.listing = {"metadata": {"resourceVersion": "20"}, "items": []}
+            events = [{"type": "ERROR", "object": {"code": 410}}, {"type": "ADDED", "object": _product("x", "9")}]
+        else:
+            informer._stopped.set()
+            events = []
+        return Watch(events, lambda: watches.append("closed"))
+
+    transport.watch = watch
+    informer._run()
+    assert watches == ["10", "closed", "20", "closed"]
+    assert informer.get("x") is None
+
+
+@pytest.mark.smoke
+def test_informer_stale_object_is_fetched(informer, transport):
+    fetched = []
+
+    def get(kind, namespace, name):
+        fetched.append(name)
+        return _product(name, "30", 3)
+
+    transport.get = get
+    informer.mark_stale("a")
+    assert informer.get("a").as_dict()["status"]["productId"] == 3
+    assert informer.get("a") is not None
+    assert fetched == ["a"]
+
+
+@pytest.mark.smoke
+def test_informer_stale_object_cleared_by_watch(informer, transport):
+    transport.get = lambda kind, namespace, name: pytest.fail("unexpected GET")
+    informer.mark_stale("a", "31")
+    informer.handle_event({"type": "MODIFIED", "object": _product("a", "31", 4)})
+    assert informer.get("a").as_dict()["status"]["productId"] == 4
+
+
+@pytest.mark.smoke
+def test_informer_stale_object_not_cleared_by_older_event(informer, transport):
+    transport.get = lambda kind, namespace, name: _product(name, "32", 5)
+    informer.mark_stale("a", "32")
+    # event produced before our change is still in flight
+    informer.handle_event({"type": "MODIFIED", "object": _product("a", "31", 4)})
+    assert informer.get("a").as_dict()["status"]["productId"] == 5
+
+
+@pytest.mark.smoke
+def test_informer_index(informer):
+    informer.add_index("productId", lambda obj: obj.get("status", {}).get("productId"))
+    informer.handle_event({"type": "MODIFIED", "object": _product("a", "40", 7)})
+    informer.handle_event({"type": "ADDED", "object": _product("c", "41", 8)})
+    assert [obj.name() for obj in informer.by_index("productId", 7)] == ["a"]
+    informer.handle_event({"type": "MODIFIED", "object": _product("a", "42", 9)})
+    assert informer.by_index("productId", 7) == []
+    assert [obj.name() for obj in informer.by_index("productId", 9)] == ["a"]
+    informer.handle_event({"type": "DELETED", "object": _product("c", "43", 8)})
+    assert informer.by_index("productId", 8) == []
+
+
+@pytest.mark.smoke
+def test_informer_stop_joins_watch_thread():
+    transport = FakeTransport()
+    informer = Informer("Product", "fake", transport).start()
+    thread = informer._thread
+    informer.stop()
+    assert not thread.is_alive()
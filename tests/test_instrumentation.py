@@ -0,0 +1,25 @@
+import pytest
+
+from threescale_api_crd.instrumentation import InstrumentedRest
+
+
+@pytest.mark.smoke
+def test_rest_kind():
+    assert InstrumentedRest.kind("https://3scale.example.com/admin/api/services/1/metrics") == "services/metrics"
+
+
+@pytest.mark.smoke
+def test_records_of_nested_create(client):
+    service = client.services.create({"name": "svc"})
+    plan = service.app_plans.create({"name": "plan"})
+    metric = service.metrics.create({"name": "m1", "unit": "hit"})
+    with client.instrumentation.record() as recorder:
+        plan.limits(metric).create({"period": "minute", "value": 10})
+
+    assert {rec.operation for rec in recorder.records} == {"Limits.create"}
+    assert all(rec.stack[1] == "Limits.in_create" for rec in recorder.records)
+    summary = recorder.summary()["Limits.create"]
+    assert summary["transport.replace"] == 1
+    assert summary["rest.GET"] == 1
+    assert summary["bytes"] == sum(rec.size for rec in recorder.records)
+    assert client.instrumentation.totals["Services.create"]["transport.create"] == 1
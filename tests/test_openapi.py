@@ -0,0 +1,156 @@
+import base64
+import collections
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from threescale_api_crd import ThreeScaleClientCRD
+from threescale_api_crd.fake import FakeTransport
+from threescale_api_crd.openapi import OpenApiLoader
+from threescale_api_crd.resources import OpenApiRef
+
+OAS = "openapi: 3.0.0\ninfo:\n  title: test\n  version: '1'\npaths: {}\n"
+
+
+@pytest.fixture()
+def server():
+    stats = collections.Counter()
+    status = {"code": 200}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802
+            stats["requests"] += 1
+            if self.headers.get("If-None-Match") == '"v1"':
+                stats["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            data = OAS.encode("utf-8")
+            self.send_response(status["code"])
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address[:2]
+    stats.status = status
+    yield f"http://{host}:{port}/oas.yaml", stats
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _active_doc(name, ref):
+    return {
+        "kind": "ActiveDoc",
+        "metadata": {"name": name, "namespace": "fake"},
+        "spec": {"name": name, "systemName": name, "activeDocOpenAPIRef": ref},
+    }
+
+
+@pytest.mark.smoke
+def test_openapi_loader_conditional_requests_and_size_bound(server):
+    url, stats = server
+    loader = OpenApiLoader(max_bytes=100)
+    body = loader.from_url(url)
+    assert json.loads(body)["info"]["title"] == "test"
+    assert loader.from_url(url) == body
+    assert stats["requests"] == 2 and stats["not_modified"] == 1
+    assert loader.stats["hits"] == 1
+    loader.max_bytes = 10
+    loader.clear()
+    loader.from_url(url)
+    # body bigger than the cache is not cached, so request is not conditional
+    loader.from_url(url)
+    assert stats["not_modified"] == 1
+
+
+@pytest.mark.smoke
+def test_openapi_loader_does_not_cache_error_response(server):
+    url, stats = server
+    loader = OpenApiLoader()
+    stats.status["code"] = 500
+    with pytest.raises(requests.HTTPError) as err:
+        loader.from_url(url)
+    assert err.value.response.status_code == 500
+    stats.status["code"] = 200
+    # error response left no validator, request is not conditional
+    assert "test" in loader.from_url(url)
+    assert stats["not_modified"] == 0
+
+
+@pytest.mark.smoke
+def test_active_doc_body_is_loaded_lazily(server):
+    url, stats = server
+    transport = FakeTransport()
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    secret = {
+        "kind": "Secret",
+        "metadata": {"name": "oas", "namespace": "fake"},
+        "data": {"oas": base64.b64encode(b"{}").decode("ascii")},
+    }
+    transport.create(secret)
+    for i in range(3):
+        transport.create(_active_doc(f"doc{i}", {"url": url}))
+    transport.create(_active_doc("docsecret", {"secretRef": {"name": "oas"}}))
+    docs = {doc.crd.name(): doc for doc in client.active_docs.list()}
+    assert len(docs) == 4
+    requests = transport.stats["requests"]
+    assert {doc["name"] for doc in docs.values()} == set(docs)
+    assert {doc["system_name"] for doc in docs.values()} == set(docs)
+    assert stats["requests"] == 0
+    assert transport.stats["requests"] == requests
+    assert docs["doc0"].entity["url"] == url
+    assert "body" not in docs["doc0"].entity
+    bodies = {json.loads(doc["body"])["info"]["title"] for name, doc in docs.items() if name != "docsecret"}
+    assert bodies == {"test"}
+    assert stats["requests"] == 3 and stats["not_modified"] == 2
+    gets = transport.stats["get"]
+    assert docs["docsecret"]["body"] == "{}"
+    assert docs["docsecret"].get("body") == "{}"
+    assert transport.stats["get"] - gets == 1
+
+
+@pytest.mark.smoke
+def test_active_doc_body_is_loaded_after_read():
+    transport = FakeTransport()
+    client = ThreeScaleClientCRD("https://3scale.example.com", "token", transport=transport)
+    secret = {
+        "kind": "Secret",
+        "metadata": {"name": "oas", "namespace": "fake"},
+        "data": {"oas": base64.b64encode(b"{}").decode("ascii")},
+    }
+    transport.create(secret)
+    transport.create(_active_doc("docsecret", {"secretRef": {"name": "oas"}}))
+    doc = client.active_docs.list()[0]
+    assert doc["body"] == "{}"
+    doc.read()
+    assert doc["body"] == "{}"
+
+
+@pytest.mark.smoke
+def test_openapi_secret_is_written_only_on_change():
+    transport = FakeTransport()
+    params = {"secret-name": "oas", "body": OAS}
+    OpenApiRef.create_secret_if_needed(dict(params), "ns", transport)
+    version = transport.get("Secret", "ns", "oas")["metadata"]["resourceVersion"]
+    transport.stats.clear()
+    OpenApiRef.create_secret_if_needed(dict(params), "ns", transport)
+    assert transport.stats["get"] == 1 and transport.stats["requests"] == 1
+    assert transport.get("Secret", "ns", "oas")["metadata"]["resourceVersion"] == version
+    transport.stats.clear()
+    OpenApiRef.create_secret_if_needed({"secret-name": "oas", "body": OAS + "# v2\n"}, "ns", transport)
+    assert transport.stats["replace"] == 1 and transport.stats["delete"] == 0
+    assert transport.stats["create"] == 0
+    secret = transport.get("Secret", "ns", "oas")
+    assert base64.b64decode(secret["data"]["oas"]).decode("ascii").endswith("# v2\n")
@@ -0,0 +1,187 @@
+import base64
+import json
+import os
+
+import pytest
+
+from threescale_api_crd.transport import (
+    HttpTransport,
+    OcTransport,
+    Transport,
+    TransportError,
+    apply_merge_patch,
+    merge_patch,
+)
+
+
+class Response:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.body = body
+        self.text = str(body)
+        self.content = self.text.encode("utf-8")
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture()
+def kubeconfig(tmp_path):
+    path = tmp_path / "config"
+    ca_data = base64.b64encode(b"CA").decode("ascii")
+    path.write_text(
+        f"""
+current-context: dev
+contexts:
+- name: dev
+  context: {{cluster: c1, user: u1, namespace: project}}
+clusters:
+- name: c1
+  cluster: {{server: "https://api.example.com:6443/", certificate-authority-data: {ca_data}}}
+users:
+- name: u1
+  user: {{token: sha256~secret}}
+"""
+    )
+    return str(path)
+
+
+@pytest.mark.smoke
+def test_transport_paths():
+    assert Transport.path("Product", "ns") == "/apis/capabilities.3scale.net/v1beta1/namespaces/ns/products"
+    assert Transport.path("Secret", "ns", "sec") == "/api/v1/namespaces/ns/secrets/sec"
+    assert OcTransport.qname("Backend", "b") == "backend.capabilities.3scale.net/b"
+    assert OcTransport.qname("Secret", "s") == "secret/s"
+
+
+@pytest.mark.smoke
+def test_http_transport_from_kubeconfig(kubeconfig):
+    transport = HttpTransport.from_kubeconfig(kubeconfig)
+    assert transport.namespace == "project"
+    assert transport._server == "https://api.example.com:6443"
+    assert transport._session.headers["Authorization"] == "Bearer sha256~secret"
+    with open(transport._session.verify, "rb") as ca_file:
+        assert ca_file.read() == b"CA"
+    transport.close()
+    assert not os.path.exists(transport._session.verify)
+
+
+class Context:
+    def get_oc_path(self):
+        return "oc"
+
+    def get_kubeconfig_path(self):
+        return None
+
+    def get_api_server(self):
+        return "https://api.example.com:6443"
+
+    def get_token(self):
+        return "sha256~secret"
+
+    def get_skip_tls_verify(self):
+        return False
+
+
+@pytest.mark.smoke
+def test_oc_command_does_not_expose_token(monkeypatch):
+    monkeypatch.setattr("threescale_api_crd.transport.ocp.cur_context", Context)
+    files = []
+    cmd = OcTransport._oc_command(files, "get", "--raw", "/api")
+    assert not [arg for arg in cmd if "secret" in arg]
+    assert cmd[1] == "--kubeconfig=" + files[0]
+    with open(files[0]) as config_file:
+        assert json.load(config_file)["users"][0]["user"]["token"] == "sha256~secret"
+    assert os.stat(files[0]).st_mode & 0o077 == 0
+    os.unlink(files[0])
+
+
+@pytest.mark.smoke
+def test_http_transport_requests(kubeconfig, monkeypatch):
+    transport = HttpTransport.from_kubeconfig(kubeconfig)
+    calls = []
+    responses = [Response(404), Response(201, {"kind": "Secret"}), Response(409, "exists")]
+
+    def request(method, url, **kwargs):
+        data = kwargs.get("data")
+        calls.append((method, url, json.loads(data) if data else None))
+        return responses.pop(0)
+
+    monkeypatch.setattr(transport._session, "request", request)
+    assert transport.get("Product", "ns", "missing") is None
+    obj = {"kind": "Secret", "metadata": {"name": "s", "namespace": "ns"}}
+    assert transport.create(obj) == {"kind": "Secret"}
+    with pytest.raises(TransportError) as err:
+        transport.replace(obj)
+    assert err.value.code == 409
+    assert calls == [
+        ("GET", "https://api.example.com:6443/apis/capabilities.3scale.net/v1beta1/namespaces/ns/products/missing", None),
+        ("POST", "https://api.example.com:6443/api/v1/namespaces/ns/secrets", obj),
+        ("PUT", "https://api.example.com:6443/api/v1/namespaces/ns/secrets/s", obj),
+    ]
+
+
+@pytest.mark.smoke
+def test_merge_patch():
+    old = {"name": "a", "metrics": {"hits": {"unit": "hit"}, "m1": {"unit": "hit"}}, "rules": [1, 2]}
+    new = {"name": "a", "metrics": {"hits": {"unit": "hit"}, "m2": {"unit": "call"}}, "rules": [1]}
+    patch = merge_patch(old, new)
+    assert patch == {"metrics": {"m1": None, "m2": {"unit": "call"}}, "rules": [1]}
+    assert apply_merge_patch(old, patch) == new
+    assert merge_patch(new, new) == {}
+
+
+@pytest.mark.smoke
+def test_http_transport_patch(kubeconfig, monkeypatch):
+    transport = HttpTransport.from_kubeconfig(kubeconfig)
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append((method, url, kwargs["headers"], json.loads(kwargs["data"])))
+        return Response(200, {"kind": "Product"})
+
+    monkeypatch.setattr(transport._session, "request", request)
+    assert transport.patch("Product", "ns", "p", {"spec": {"name": "b"}}) == {"kind": "Product"}
+    assert calls == [
+        (
+            "PATCH",
+            "https://api.example.com:6443/apis/capabilities.3scale.net/v1beta1/namespaces/ns/products/p",
+            {"Content-Type": "application/merge-patch+json"},
+            {"spec": {"name": "b"}},
+        )
+    ]
+
+
+class Result:
+    def __init__(self, status, out, err):
+        self._status, self._out, self._err = status, out, err
+
+    def status(self):
+        return self._status
+
+    def out(self):
+        return self._out
+
+    def err(self):
+        return self._err
+
+
+@pytest.mark.smoke
+def test_oc_transport_create_many(monkeypatch):
+    objs = [
+        {"kind": "Product", "metadata": {"name": name, "namespace": "ns"}} for name in ("a", "b", "c")
+    ]
+    calls = []
+
+    def invoke(verb, args, stdin_str=None, **kwargs):
+        calls.append((verb, args, json.loads(stdin_str)))
+        out = {"kind": "List", "items": [objs[0], objs[2]]}
+        err = 'Error from server (AlreadyExists): error when creating "STDIN": products "b" already exists'
+        return Result(1, json.dumps(out), err)
+
+    monkeypatch.setattr("threescale_api_crd.transport.ocp.invoke", invoke)
+    created = OcTransport.create_many(OcTransport.__new__(OcTransport), objs)
+    assert created[0] == objs[0] and created[2] == objs[2]
+    assert isinstance(created[1], TransportError) and created[1].code == 409
+    assert calls == [("create", ["-f", "-", "-o=json"], {"apiVersion": "v1", "kind": "List", "items": objs})]
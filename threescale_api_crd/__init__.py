@@ -3,3 +3,11 @@
 from .client import ThreeScaleClientCRD
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # asyncio client is imported on first use, import of the package does not import asyncio
+    if name == "AsyncThreeScaleClientCRD":
+        from .aio import AsyncThreeScaleClientCRD
+        return AsyncThreeScaleClientCRD
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,168 @@
+""" Module with asyncio API of ThreeScaleClientCRD """
+
+import asyncio
+import concurrent.futures
+import functools
+
+from threescale_api_crd.client import ThreeScaleClientCRD
+
+
+class AsyncThreeScaleClientCRD:
+    """
+    Asyncio client for CRD. Every call of wrapped ThreeScaleClientCRD runs
+    in thread pool, so many creates and readiness waits can be in flight
+    at once on one event loop.
+
+        async with AsyncThreeScaleClientCRD(url, token) as client:
+            services = await asyncio.gather(
+                *(client.services.create({"name": name}) for name in names)
+            )
+    """
+
+    def __init__(self, *args, max_workers=32, client=None, **kwargs):
+        # client passed by caller is not closed by the wrapper
+        self._own_client = client is None
+        self._client = client or ThreeScaleClientCRD(*args, **kwargs)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="threescale-crd"
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def run(self, func, *args, **kwargs):
+        """Runs any blocking call of the client, e.g. on resources, in thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def close(self):
+        """
+        Waits for running calls. Wrapped client is closed only if it was
+        created by the wrapper.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True)
+        )
+        if self._own_client:
+            await asyncio.get_running_loop().run_in_executor(None, self._client.close)
+
+    def collection(self, client):
+        """Returns asyncio wrapper of any collection client, e.g. 'service.mapping_rules'."""
+        return AsyncCollection(client, self)
+
+    @property
+    def sync(self) -> ThreeScaleClientCRD:
+        """Gets wrapped synchronous client"""
+        return self._client
+
+    @property
+    def services(self) -> "AsyncCollection":
+        """Gets services client"""
+        return self.collection(self._client.services)
+
+    @property
+    def active_docs(self) -> "AsyncCollection":
+        """Gets active docs client"""
+        return self.collection(self._client.active_docs)
+
+    @property
+    def policy_registry(self) -> "AsyncCollection":
+        """Gets policy registry client"""
+        return self.collection(self._client.policy_registry)
+
+    @property
+    def backends(self) -> "AsyncCollection":
+        """Gets backend client"""
+        return self.collection(self._client.backends)
+
+    @property
+    def accounts(self) -> "AsyncCollection":
+        """Gets accounts client"""
+        return self.collection(self._client.accounts)
+
+    @property
+    def account_users(self) -> "AsyncCollection":
+        """Gets account users client"""
+        return self.collection(self._client.account_users)
+
+    @property
+    def openapis(self) -> "AsyncCollection":
+        """Gets OpenApis client"""
+        return self.collection(self._client.openapis)
+
+    @property
+    def tenants(self) -> "AsyncCollection":
+        """Gets tenants client"""
+        return self.collection(self._client.tenants)
+
+    @property
+    def promotes(self) -> "AsyncCollection":
+        """Gets promotes client"""
+        return self.collection(self._client.promotes)
+
+    @property
+    def applications(self) -> "AsyncCollection":
+        """Gets applications client"""
+        return self.collection(self._client.applications)
+
+
+class AsyncCollection:
+    """Asyncio wrapper of CRD collection client, it returns synchronous resources."""
+
+    def __init__(self, client, aclient):
+        self._client = client
+        self._aclient = aclient
+
+    @property
+    def sync(self):
+        """Gets wrapped synchronous collection client"""
+        return self._client
+
+    async def create(self, params: dict = None, **kwargs):
+        """Creates resource and waits until it is ready."""
+        return await self._aclient.run(self._client.create, params, **kwargs)
+
+    async def create_many(self, params_list):
+        """Creates resources together, item of failed create is the exception."""
+        return await self._aclient.run(self._client.create_many, params_list)
+
+    async def read(self, entity_id: int = None, **kwargs):
+        """Reads resource by id."""
+        return await self._aclient.run(self._client.read, entity_id, **kwargs)
+
+    async def read_by_name(self, name: str, **kwargs):
+        """Reads resource by name."""
+        return await self._aclient.run(self._client.read_by_name, name, **kwargs)
+
+    async def list(self, **kwargs):
+        """Lists resources."""
+        return await self._aclient.run(self._client.list, **kwargs)
+
+    async def select_by(self, **params):
+        """Lists resources with matching attributes."""
+        return await self._aclient.run(self._client.select_by, **params)
+
+    async def exists(self, entity_id=None, **kwargs):
+        """Checks whether the resource exists."""
+        return await self._aclient.run(self._client.exists, entity_id, **kwargs)
+
+    async def update(self, entity_id=None, params: dict = None, resource=None, **kwargs):
+        """Updates resource, 'resource' is resource returned by other calls."""
+        return await self._aclient.run(
+            self._client.update,
+            entity_id=entity_id,
+            params=params,
+            resource=resource,
+            **kwargs,
+        )
+
+    async def delete(self, entity_id: int = None, resource=None, **kwargs):
+        """Deletes resource, 'resource' is resource returned by other calls."""
+        return await self._aclient.run(
+            self._client.delete, entity_id=entity_id, resource=resource, **kwargs
+        )
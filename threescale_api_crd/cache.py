@@ -0,0 +1,90 @@
+""" Module with cache of names and ids of 3scale objects """
+
+import collections
+import threading
+import time
+
+
+class IdentityCache:
+    """
+    Cache of names and ids of objects of one ThreeScaleClientCRD, e.g. system
+    names and ids of products and metrics. Names are unique in 'scope', e.g.
+    metrics in product. Every entry belongs to 'owner', the CRD which holds
+    the object, e.g. ("Product", "my-product"). Entries are evicted as least
+    recently used over 'maxsize' and after 'ttl' seconds. All entries of
+    owner are dropped when the client changes the CRD.
+    """
+
+    MAXSIZE = 10000
+    TTL = 300
+
+    def __init__(self, maxsize=MAXSIZE, ttl=TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = collections.Counter()
+        self._entries = collections.OrderedDict()
+        self._owners = {}
+        self._lock = threading.Lock()
+
+    def get_id(self, kind, name, scope=None):
+        """Returns id of object 'name' of the kind in 'scope' or None."""
+        return self._get(("id", kind, scope, name))
+
+    def get_name(self, kind, entity_id):
+        """Returns name of object of the kind with 'entity_id' or None."""
+        return self._get(("name", kind, entity_id))
+
+    def put(self, kind, name, entity_id, owner, scope=None):
+        """Stores name and id of object of the kind in 'scope' held by 'owner'."""
+        if name is None or entity_id is None:
+            return
+        with self._lock:
+            self._put(("id", kind, scope, name), entity_id, owner)
+            self._put(("name", kind, entity_id), name, owner)
+
+    def invalidate(self, owner=None):
+        """Drops entries of 'owner' or all entries if 'owner' is None."""
+        with self._lock:
+            if owner is None:
+                keys = list(self._entries)
+            else:
+                keys = self._owners.pop(owner, ())
+            for key in keys:
+                self._remove(key)
+            self.stats["invalidations"] += len(keys)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                self.stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def _put(self, key, value, owner):
+        self._remove(key)
+        self._entries[key] = (value, owner, time.monotonic() + self.ttl)
+        self._owners.setdefault(owner, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._owners.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._owners[entry[1]]
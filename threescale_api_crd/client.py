@@ -2,10 +2,22 @@
 Module with ThreeScaleClient for CRD.
 """
 
-import openshift_client as ocp
-from openshift_client import OpenShiftPythonException
+import concurrent.futures
+import functools
+import threading
+
 import threescale_api
 from threescale_api_crd import resources
+from threescale_api_crd.cache import IdentityCache
+from threescale_api_crd.defaults import NameIdMap
+from threescale_api_crd.informer import Informer
+from threescale_api_crd.openapi import OpenApiLoader
+from threescale_api_crd.instrumentation import (
+    Instrumentation,
+    InstrumentedRest,
+    InstrumentedTransport,
+)
+from threescale_api_crd.transport import OcTransport, default_namespace
 
 
 class ThreeScaleClientCRD(threescale_api.client.ThreeScaleClient):
@@ -13,118 +25,226 @@ class ThreeScaleClientCRD(threescale_api.client.ThreeScaleClient):
     Threescale client for CRD.
     """
 
-    def __init__(self, url, token, ocp_provider_ref=None, ocp_namespace=None, *args, **kwargs):
+    def __init__(
+        self,
+        url,
+        token,
+        ocp_provider_ref=None,
+        ocp_namespace=None,
+        *args,
+        use_informers=False,
+        transport=None,
+        update_mode="replace",
+        ready_timeouts=None,
+        identity_cache=None,
+        **kwargs
+    ):
         super().__init__(url, token, *args, **kwargs)
-        self._ocp_provider_ref = ocp_provider_ref
-        self._ocp_namespace = ThreeScaleClientCRD.get_namespace(ocp_namespace)
-        self._services = resources.Services(
-            parent=self, instance_klass=resources.Service
-        )
-        self._active_docs = resources.ActiveDocs(
-            parent=self, instance_klass=resources.ActiveDoc
-        )
-        self._policy_registry = resources.PoliciesRegistry(
-            parent=self, instance_klass=resources.PolicyRegistry
-        )
-        self._backends = resources.Backends(
-            parent=self, instance_klass=resources.Backend
-        )
-        self._accounts = resources.Accounts(
-            parent=self, instance_klass=resources.Account
-        )
-        self._accounts_users = resources.AccountUsers(
-            parent=self, instance_klass=resources.AccountUser
-        )
-        self._openapis = resources.OpenApis(
-            parent=self, instance_klass=resources.OpenApi
-        )
-        self._tenants = resources.Tenants(parent=self, instance_klass=resources.Tenant)
-        self._promotes = resources.Promotes(
-            parent=self, instance_klass=resources.Promote
-        )
-        self._applications = resources.Applications(
-            parent=self, account=None, instance_klass=resources.Application
+        self._instrumentation = Instrumentation()
+        self._rest = InstrumentedRest(self._rest, self._instrumentation)
+        self._transport = InstrumentedTransport(
+            transport or OcTransport(), self._instrumentation
         )
+        self._ocp_provider_ref = ocp_provider_ref
+        # default namespace is resolved on first use
+        self._ocp_namespace = ocp_namespace or self._transport.namespace
+        self._use_informers = use_informers
+        if update_mode not in ("replace", "patch"):
+            raise ValueError(f"Unknown update mode: {update_mode}")
+        self._update_mode = update_mode
+        self._ready_timeouts = ready_timeouts or {}
+        self._informers = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._name_id_maps = {}
+        self._identity_cache = identity_cache or IdentityCache()
+        self._openapi_loader = None
 
     @classmethod
     def get_namespace(_ignore, namespace):
         """
-        Returns namespace. If there is no valid Openshift 'oc' session, returns "NOT LOGGED IN".
+        Returns namespace. Default namespace is read from kubeconfig or from
+        service account, if there is none, returns "NOT LOGGED IN".
+        """
+        return namespace or default_namespace() or "NOT LOGGED IN"
+
+    def informer(self, kind):
+        """
+        Returns started informer for CRD kind or None if informers are not used.
+        """
+        if not self._use_informers:
+            return None
+        with self._lock:
+            if kind not in self._informers:
+                self._informers[kind] = Informer(
+                    kind, self.ocp_namespace, self.transport
+                ).start()
+            return self._informers[kind]
+
+    def stop_informers(self):
+        """Stops all running informers."""
+        with self._lock:
+            informers, self._informers = self._informers, {}
+        for informer in informers.values():
+            informer.stop()
+
+    def close(self):
+        """Stops informers and executor of background waits."""
+        self.stop_informers()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @property
+    def update_mode(self):
+        """
+        Gets update mode of CRDs, 'replace' sends whole CRD, 'patch' sends
+        only changed fields of spec as JSON merge patch
         """
-        try:
-            return namespace or ocp.get_project_name()
-        except OpenShiftPythonException:
-            return "NOT LOGGED IN"
+        return self._update_mode
 
     @property
+    def ready_timeouts(self):
+        """Gets deadlines in seconds of waiting for readiness of created CRDs per kind"""
+        return self._ready_timeouts
+
+    @property
+    def batches(self):
+        """Gets local copies of CRDs changed in running batches of current thread"""
+        batches = getattr(self._local, "batches", None)
+        if batches is None:
+            batches = self._local.batches = {}
+        return batches
+
+    @property
+    def identity_cache(self) -> IdentityCache:
+        """Gets cache of names and ids of objects, e.g. products and metrics"""
+        return self._identity_cache
+
+    @property
+    def openapi_loader(self) -> OpenApiLoader:
+        """Gets loader of OpenAPI documents referenced by CRDs"""
+        with self._lock:
+            if self._openapi_loader is None:
+                self._openapi_loader = OpenApiLoader()
+            return self._openapi_loader
+
+    def name_id_map(self, kind) -> NameIdMap:
+        """Returns map between names and ids of CRDs of the kind"""
+        with self._lock:
+            return self._name_id_maps.setdefault(kind, NameIdMap())
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        """Gets executor of background waits, e.g. futures of ids of CRDs"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="threescale-crd-wait"
+                )
+            return self._executor
+
+    @property
+    def instrumentation(self):
+        """Gets instrumentation of calls to API server and REST API"""
+        return self._instrumentation
+
+    @property
+    def transport(self):
+        """Gets transport used to access API server"""
+        return self._transport
+
+    @functools.cached_property
     def services(self) -> resources.Services:
         """Gets services client
         Returns(resources.Services): Services client
         """
-        return self._services
+        return resources.Services(
+            parent=self, instance_klass=resources.Service
+        )
 
-    @property
+    @functools.cached_property
     def active_docs(self) -> resources.ActiveDocs:
         """Gets active docs client
         Returns(resources.ActiveDocs): ActiveDocs client
         """
-        return self._active_docs
+        return resources.ActiveDocs(
+            parent=self, instance_klass=resources.ActiveDoc
+        )
 
-    @property
+    @functools.cached_property
     def policy_registry(self) -> resources.PolicyRegistry:
         """Gets policy registry client
         Returns(resources.PolicyRegistry): Policy Registry client
         """
-        return self._policy_registry
+        return resources.PoliciesRegistry(
+            parent=self, instance_klass=resources.PolicyRegistry
+        )
 
-    @property
+    @functools.cached_property
     def backends(self) -> resources.Backend:
         """Gets backend client
         Returns(resources.Backend): Backend client
         """
-        return self._backends
+        return resources.Backends(
+            parent=self, instance_klass=resources.Backend
+        )
 
-    @property
+    @functools.cached_property
     def accounts(self) -> resources.Accounts:
         """Gets accounts client
         Returns(resources.Accounts): Accounts client
         """
-        return self._accounts
+        return resources.Accounts(
+            parent=self, instance_klass=resources.Account
+        )
 
-    @property
+    @functools.cached_property
     def account_users(self) -> resources.AccountUsers:
         """Gets account users client
         Returns(resources.AccountUsers): Account Users client
         """
-        return self._accounts_users
+        return resources.AccountUsers(
+            parent=self, instance_klass=resources.AccountUser
+        )
 
-    @property
+    @functools.cached_property
     def openapis(self) -> resources.OpenApis:
         """Gets AopenApis client
         Returns(resources.OpenApis): OpenApis client
         """
-        return self._openapis
+        return resources.OpenApis(
+            parent=self, instance_klass=resources.OpenApi
+        )
 
-    @property
+    @functools.cached_property
     def tenants(self) -> resources.Tenants:
         """Gets tenants client
         Returns(resources.Tenants): Tenants client
         """
-        return self._tenants
+        return resources.Tenants(
+            parent=self, instance_klass=resources.Tenant
+        )
 
-    @property
+    @functools.cached_property
     def promotes(self) -> resources.Promotes:
         """Gets promotes client
         Returns(resources.Promotes): Promotes client
         """
-        return self._promotes
+        return resources.Promotes(
+            parent=self, instance_klass=resources.Promote
+        )
 
-    @property
+    @functools.cached_property
     def applications(self) -> resources.Applications:
         """Gets applications client
         Returns(resources.Applications): Applications client
         """
-        return self._applications
+        return resources.Applications(
+            parent=self, account=None, instance_klass=resources.Application
+        )
 
     @property
     def ocp_provider_ref(self):
@@ -134,4 +254,6 @@ class ThreeScaleClientCRD(threescale_api.client.ThreeScaleClient):
     @property
     def ocp_namespace(self):
         """Gets working namespace"""
+        if self._ocp_namespace is None:
+            self._ocp_namespace = ThreeScaleClientCRD.get_namespace(None)
         return self._ocp_namespace
@@ -549,6 +549,37 @@ KEYS_METHOD = {
     "system_name": "system_name",
 }
 
+
+def invert_keys(keys):
+    """Returns inverted KEYS_* table, CRD attribute -> entity attribute."""
+    return {value: key for key, value in keys.items()}
+
+
+# inverted KEYS_* tables used to translate CRD spec into entity
+CRD_KEYS_SERVICE = invert_keys(KEYS_SERVICE)
+CRD_KEYS_PROXY_RESPONSES = invert_keys(KEYS_PROXY_RESPONSES)
+CRD_KEYS_PROXY_SECURITY = invert_keys(KEYS_PROXY_SECURITY)
+CRD_KEYS_PROXY = invert_keys(KEYS_PROXY)
+CRD_KEYS_OIDC = invert_keys(KEYS_OIDC)
+CRD_KEYS_BACKEND = invert_keys(KEYS_BACKEND)
+CRD_KEYS_MAPPING_RULE = invert_keys(KEYS_MAPPING_RULE)
+CRD_KEYS_ACTIVE_DOC = invert_keys(KEYS_ACTIVE_DOC)
+CRD_KEYS_POLICY_REG = invert_keys(KEYS_POLICY_REG)
+CRD_KEYS_METRIC = invert_keys(KEYS_METRIC)
+CRD_KEYS_LIMIT = invert_keys(KEYS_LIMIT)
+CRD_KEYS_APP_PLANS = invert_keys(KEYS_APP_PLANS)
+CRD_KEYS_BACKEND_USAGE = invert_keys(KEYS_BACKEND_USAGE)
+CRD_KEYS_ACCOUNT = invert_keys(KEYS_ACCOUNT)
+CRD_KEYS_ACCOUNT_USER = invert_keys(KEYS_ACCOUNT_USER)
+CRD_KEYS_POLICY = invert_keys(KEYS_POLICY)
+CRD_KEYS_OPEN_API = invert_keys(KEYS_OPEN_API)
+CRD_KEYS_OPEN_API_OIDC = invert_keys(KEYS_OPEN_API_OIDC)
+CRD_KEYS_TENANT = invert_keys(KEYS_TENANT)
+CRD_KEYS_PRICING_RULE = invert_keys(KEYS_PRICING_RULE)
+CRD_KEYS_PROMOTE = invert_keys(KEYS_PROMOTE)
+CRD_KEYS_APPLICATION = invert_keys(KEYS_APPLICATION)
+CRD_KEYS_METHOD = invert_keys(KEYS_METHOD)
+
 SPEC_SECRET = {
     "kind": "Secret",
     "apiVersion": "v1",
@@ -559,3 +590,20 @@ SPEC_SECRET = {
     "data": {},
     "type": "Opaque",
 }
+
+# annotation of secret with hash of its data
+SECRET_HASH_ANNOTATION = "threescale-api-crd/content-hash"
+
+API_VERSIONS = {
+    "Product": "capabilities.3scale.net/v1beta1",
+    "Backend": "capabilities.3scale.net/v1beta1",
+    "ActiveDoc": "capabilities.3scale.net/v1beta1",
+    "CustomPolicyDefinition": "capabilities.3scale.net/v1beta1",
+    "DeveloperAccount": "capabilities.3scale.net/v1beta1",
+    "DeveloperUser": "capabilities.3scale.net/v1beta1",
+    "OpenAPI": "capabilities.3scale.net/v1beta1",
+    "Tenant": "capabilities.3scale.net/v1alpha1",
+    "ProxyConfigPromote": "capabilities.3scale.net/v1beta1",
+    "Application": "capabilities.3scale.net/v1beta1",
+    "Secret": "v1",
+}
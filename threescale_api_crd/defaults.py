@@ -1,15 +1,23 @@
 """ Module with default objects """
 
+import concurrent.futures
+import contextlib
 import logging
 import copy
+import functools
 import random
 import string
+import threading
 import time
 from typing import Dict, List, Union
 
 import threescale_api
 import threescale_api.errors
-import openshift_client as ocp
+from threescale_api_crd.instrumentation import instrumented
+from threescale_api_crd.lazy import LazyModule
+from threescale_api_crd.transport import TransportError, apply_merge_patch, merge_patch
+
+ocp = LazyModule("openshift_client")
 
 LOG = logging.getLogger(__name__)
 
@@ -22,18 +30,18 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
     SELECTOR = None
     KEYS = None
     ID_NAME = None
+    READY_TIMEOUT = 1000
+    ID_TIMEOUT = 100
 
     def __init__(
         self, parent=None, instance_klass=None, entity_name=None, entity_collection=None
     ):
-        ocp.set_default_loglevel(6)
         super().__init__(
             parent=parent,
             instance_klass=instance_klass,
             entity_name=entity_name,
             entity_collection=entity_collection,
         )
-        ocp.set_default_project(self.threescale_client.ocp_namespace)
 
     def get_list(self, typ="normal"):
         """Returns list of entities."""
@@ -46,15 +54,400 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             sel += "/" + obj_name
         return ocp.selector(sel)
 
+    @property
+    def transport(self):
+        """Returns transport used to access API server."""
+        return self.threescale_client.transport
+
+    @property
+    def informer(self):
+        """Returns informer for the CRD kind or None if informers are not used."""
+        return self.threescale_client.informer(self.SELECTOR)
+
     def read_crd(self, obj_name=None):
         """Read current CRD definition based on selector and/or object name."""
         LOG.info("CRD read %s %s", str(self.SELECTOR), str(obj_name))
-        return self.get_selector(obj_name).objects()
+        if obj_name:
+            obj = self.read_crd_by_name(obj_name)
+            return [obj] if obj else []
+        informer = self.informer
+        if informer:
+            return self._with_batches(informer.list())
+        response = self.transport.list(
+            self.SELECTOR, self.threescale_client.ocp_namespace
+        )
+        return self._with_batches(
+            [ocp.APIObject(obj) for obj in response.get("items", [])]
+        )
+
+    def read_crd_by_name(self, obj_name):
+        """Read one CRD by its name. Returns None if the CRD does not exist."""
+        LOG.info("CRD get %s %s", str(self.SELECTOR), str(obj_name))
+        batch = self.batch_crd(obj_name)
+        if batch is not None:
+            return batch
+        informer = self.informer
+        if informer:
+            return informer.get(obj_name)
+        obj = self.transport.get(
+            self.SELECTOR, self.threescale_client.ocp_namespace, obj_name
+        )
+        return ocp.APIObject(obj) if obj else None
+
+    def refresh_crd(self, crd):
+        """Reloads CRD object from API server."""
+        obj = self.transport.get(
+            self.SELECTOR, self.threescale_client.ocp_namespace, crd.name()
+        )
+        if obj is None:
+            raise TransportError(f"{self.SELECTOR} {crd.name()} not found", code=404)
+        crd.model = ocp.Model(obj)
+        return crd
+
+    @property
+    def ready_timeout(self):
+        """Returns deadline in seconds of waiting for readiness of CRD of this kind."""
+        return self.threescale_client.ready_timeouts.get(self.SELECTOR, self.READY_TIMEOUT)
+
+    def wait_for_ready(self, obj_name, timeout=None):
+        """
+        Waits until CRD is processed by operator and returns it. CRD is watched
+        and checked on every change, so it returns as soon as operator sets status.
+        """
+        return self.wait_for(obj_name, self._is_ready, timeout, failed=self._is_failed)
+
+    def wait_for(self, obj_name, condition, timeout=None, failed=None):
+        """
+        Waits until CRD satisfies 'condition' and returns it. CRD is watched and
+        'condition' is checked on every change until deadline. Waiting ends
+        with error if 'failed' returns message of failure of CRD.
+        """
+        timeout = self.ready_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            obj = self.transport.get(
+                self.SELECTOR, self.threescale_client.ocp_namespace, obj_name
+            )
+            version = None
+            if obj is not None:
+                obj = ocp.APIObject(obj)
+                found = self._check(obj, {obj_name}, condition, failed)
+                if found is not None:
+                    return self._ready_or_raise(found)
+                version = obj.model.metadata.resourceVersion
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise threescale_api.errors.ThreeScaleApiError(
+                    message=f"{self.SELECTOR} {obj_name} is not ready"
+                )
+            found, _ = self._watch_until(
+                {obj_name}, condition, version, remaining, name=obj_name, failed=failed
+            )
+            if found:
+                return self._ready_or_raise(found[obj_name])
+
+    def wait_for_ready_many(self, obj_names, version=None, timeout=None):
+        """
+        Waits until all CRDs are processed by operator. All CRDs of the kind
+        are watched together after 'version', e.g. version of the first created CRD.
+        Returns dict of ready CRDs by name, CRDs which are not ready before
+        deadline or failed have error instead.
+        """
+        return self.wait_for_many(
+            obj_names, self._is_ready, version, timeout, failed=self._is_failed
+        )
+
+    def wait_for_many(self, obj_names, condition, version=None, timeout=None, failed=None):
+        """
+        Waits until all CRDs satisfy 'condition'. If 'version' is None, CRDs
+        named in 'obj_names' are read first. Returns dict of CRDs by name,
+        CRDs which do not satisfy 'condition' before deadline or for which
+        'failed' returns message have error instead.
+        """
+        timeout = self.ready_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        pending = set(obj_names)
+        ready = {}
+        if version is None:
+            version = self._read_pending(pending, condition, failed, ready)
+        while pending:
+            if version is None:
+                # watched version expired, whole kind has to be listed again
+                version = self._list_pending(pending, condition, failed, ready)
+                if not pending:
+                    break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            found, version = self._watch_until(
+                pending, condition, version, remaining, failed=failed
+            )
+            ready.update(found)
+        for obj_name in pending:
+            ready[obj_name] = threescale_api.errors.ThreeScaleApiError(
+                message=f"{self.SELECTOR} {obj_name} is not ready"
+            )
+        return ready
+
+    def _read_pending(self, pending, condition, failed, ready):
+        """
+        Reads CRDs named in 'pending' one by one and moves finished ones
+        to 'ready'. Returns the oldest resourceVersion of read CRDs, changes
+        of all of them are watched after it. Returns None if some CRD does
+        not exist yet.
+        """
+        versions = []
+        for obj_name in list(pending):
+            obj = self.transport.get(
+                self.SELECTOR, self.threescale_client.ocp_namespace, obj_name
+            )
+            if obj is None:
+                return None
+            obj = ocp.APIObject(obj)
+            versions.append(obj.model.metadata.resourceVersion)
+            self._check(obj, pending, condition, failed, ready)
+        return DefaultClientCRD.oldest_version(versions)
+
+    @staticmethod
+    def oldest_version(versions):
+        """Returns the oldest of resourceVersions or None if there is none."""
+        versions = [ver for ver in versions if ver]
+        if not versions:
+            return None
+        return min(versions, key=lambda ver: int(ver) if ver.isdigit() else 0)
+
+    def _list_pending(self, pending, condition, failed, ready):
+        """
+        Lists all CRDs of the kind and moves finished ones from 'pending'
+        to 'ready'. Returns resourceVersion of the list.
+        """
+        response = self.transport.list(
+            self.SELECTOR, self.threescale_client.ocp_namespace
+        )
+        for obj in response.get("items", []):
+            self._check(ocp.APIObject(obj), pending, condition, failed, ready)
+        return response["metadata"].get("resourceVersion")
+
+    def _check(self, obj, pending, condition, failed, ready=None):
+        """
+        Checks CRD named in 'pending'. Returns the CRD if it satisfies 'condition'
+        or error if 'failed' returns message, otherwise None. Finished CRD
+        is removed from 'pending' and stored to 'ready'.
+        """
+        if obj.name() not in pending:
+            return None
+        found = None
+        if condition(obj):
+            found = obj
+        else:
+            message = failed(obj) if failed else None
+            if message:
+                found = threescale_api.errors.ThreeScaleApiError(
+                    message=f"{self.SELECTOR} {obj.name()} failed: {message}"
+                )
+        if found is not None:
+            pending.discard(obj.name())
+            if ready is not None:
+                ready[obj.name()] = found
+        return found
+
+    @staticmethod
+    def _ready_or_raise(found):
+        if isinstance(found, Exception):
+            raise found
+        return found
+
+    def _watch_until(self, pending, condition, version, timeout, name=None, failed=None):
+        """
+        Watches CRD changes after 'version' until all CRDs named in 'pending'
+        satisfy 'condition' or fail. These CRDs are removed from 'pending' and
+        returned by name together with the last seen resourceVersion, which is
+        None if 'version' expired. Watch ends earlier e.g. on timeout.
+        """
+        try:
+            watch = self.transport.watch(
+                self.SELECTOR,
+                self.threescale_client.ocp_namespace,
+                resource_version=version,
+                name=name,
+                timeout=timeout,
+            )
+        except TransportError as err:
+            LOG.warning("Watch of %s %s failed: %s", self.SELECTOR, name, str(err))
+            time.sleep(min(timeout, 5))
+            return {}, version
+        # watch is closed at deadline, server side timeout has granularity of seconds
+        expired = threading.Event()
+
+        def close():
+            expired.set()
+            watch.close()
+
+        timer = threading.Timer(timeout, close)
+        timer.daemon = True
+        timer.start()
+        ready = {}
+        try:
+            with watch:
+                version = self._collect(watch, version, pending, condition, failed, ready)
+        except Exception:  # pylint: disable=broad-except
+            if not expired.is_set():
+                raise
+        finally:
+            timer.cancel()
+        return ready, version
+
+    def _collect(self, watch, version, pending, condition, failed, ready):
+        """
+        Moves CRDs from watch events which satisfy 'condition' or fail
+        to 'ready'. Returns the last seen resourceVersion, None on error event.
+        """
+        for event in watch:
+            if event["type"] == "ERROR":
+                return None
+            version = event["object"]["metadata"].get("resourceVersion") or version
+            if event["type"] not in ("ADDED", "MODIFIED"):
+                continue
+            self._check(ocp.APIObject(event["object"]), pending, condition, failed, ready)
+            if not pending:
+                break
+        return version
+
+    def read_crd_by_id(self, entity_id):
+        """Read CRDs which have 'entity_id' in status attribute ID_NAME."""
+        key = str(entity_id)
+        batches = [
+            obj
+            for (kind, _), obj in self.threescale_client.batches.items()
+            if kind == self.SELECTOR
+            and DefaultClientCRD._status_id(obj.model, self.ID_NAME) == key
+        ]
+        if batches:
+            return batches
+        informer = self.informer
+        if informer:
+            id_name = self.ID_NAME
+            informer.add_index(
+                id_name, lambda obj: DefaultClientCRD._status_id(obj, id_name)
+            )
+            return self._with_batches(informer.by_index(id_name, key))
+        return [
+            obj
+            for obj in self.read_crd()
+            if DefaultClientCRD._status_id(obj.model, self.ID_NAME) == key
+        ]
+
+    @staticmethod
+    def _status_id(obj, id_name):
+        """Returns status id of CRD dict as string or None."""
+        status = obj.get("status") or {}
+        ide = status.get(id_name)
+        return str(ide) if ide is not None else None
+
+    def batch_crd(self, obj_name):
+        """Returns local copy of CRD changed in running batch or None."""
+        return self.threescale_client.batches.get((self.SELECTOR, obj_name))
+
+    def _with_batches(self, objs):
+        """Replaces CRDs changed in running batches by their local copies."""
+        batches = self.threescale_client.batches
+        if not batches:
+            return objs
+        return [batches.get((self.SELECTOR, obj.name()), obj) for obj in objs]
+
+    def begin_batch(self, crd):
+        """
+        Starts batch of changes of CRD. Updates of the CRD change only
+        its local copy until the batch ends. Returns False if the batch
+        of the CRD is already running.
+        """
+        key = (self.SELECTOR, crd.name())
+        batches = self.threescale_client.batches
+        if key in batches:
+            return False
+        self.refresh_crd(crd)
+        batches[key] = crd
+        return True
+
+    def end_batch(self, crd, commit=True, base=None, retries=3):
+        """
+        Ends batch of changes of CRD. Local copy of spec is sent to API server
+        by one replace if 'commit' is True, otherwise it is dropped.
+        resourceVersion read at the start of the batch is precondition of
+        the replace. If the CRD was changed meanwhile, only changes done in
+        the batch (diff from 'base' spec) are applied again to current CRD,
+        without 'base' the conflict is raised.
+        """
+        self.threescale_client.batches.pop((self.SELECTOR, crd.name()), None)
+        if not commit:
+            self.refresh_crd(crd)
+            return crd
+        new_crd = crd.as_dict()
+        patch = merge_patch(base, new_crd["spec"]) if base is not None else None
+        while True:
+            try:
+                crd.model = ocp.Model(self.transport.replace(new_crd))
+                break
+            except TransportError as err:
+                if err.code != 409 or patch is None or retries <= 0:
+                    LOG.error("[INSTANCE] Batch update of CRD failed: %s", str(err))
+                    raise
+                LOG.info("[INSTANCE] CRD %s changed during batch, apply it again", crd.name())
+                retries -= 1
+                self.refresh_crd(crd)
+                new_crd = crd.as_dict()
+                new_crd["spec"] = apply_merge_patch(new_crd["spec"], patch)
+        self.mark_crd_changed(crd.name(), DefaultClientCRD.crd_version(crd))
+        return crd
+
+    def mark_crd_changed(self, obj_name, version=None):
+        """
+        Marks CRD changed by this client as stale in informer store and drops
+        names and ids of objects held by the CRD from identity cache.
+        'version' is resourceVersion returned by the change, None for delete.
+        """
+        self.threescale_client.identity_cache.invalidate((self.SELECTOR, obj_name))
+        informer = self.informer
+        if informer:
+            informer.mark_stale(obj_name, version)
+
+    @staticmethod
+    def crd_version(crd):
+        """Returns resourceVersion of CRD object."""
+        return (crd.as_dict().get("metadata") or {}).get("resourceVersion")
 
     def is_crd_implemented(self):
         """Returns True is crd is implemented in the client"""
         return self.__class__.CRD_IMPLEMENTED
 
+    def rest_list(self, **kwargs) -> List[dict]:
+        """
+        Lists entity dicts by 3scale REST API, CRDs are not used. All pages
+        are read if the endpoint is paginated. Unlike switching CRD_IMPLEMENTED,
+        which is class attribute, it is safe to call from many threads.
+        """
+        kwargs = kwargs.copy()
+        params = dict(kwargs.pop("params", None) or {})
+        per_page = getattr(self, "per_page", None)
+        if per_page is None or "page" in params:
+            return self._rest_page(params, **kwargs)
+        params["per_page"] = per_page
+        params["page"] = 1
+        ret = page = self._rest_page(params, **kwargs)
+        while len(page) >= per_page:
+            params["page"] += 1
+            page = self._rest_page(params, **kwargs)
+            ret += page
+        return ret
+
+    def _rest_page(self, params, **kwargs):
+        response = self.rest.get(url=self._entity_url(), params=dict(params), **kwargs)
+        return self._extract_resource(response, collection=True) or []
+
+    def rest_fetch(self, entity_id: int = None, **kwargs) -> dict:
+        """Fetches entity dict by 3scale REST API, CRDs are not used."""
+        return threescale_api.defaults.DefaultClient.fetch(self, entity_id, **kwargs)
+
     def enable_crd_implemented(self):
         """Set True to crd is implemented attribute"""
         self.__class__.CRD_IMPLEMENTED = True
@@ -63,6 +456,7 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
         """Set False to crd is implemented attribute"""
         self.__class__.CRD_IMPLEMENTED = False
 
+    @instrumented("fetch_crd_entity")
     def fetch_crd_entity(self, name: str):
         """Fetches the entity based on crd name
         Args:
@@ -74,7 +468,10 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             raise threescale_api.errors.ThreeScaleApiError(
                 message="Not supported method"
             )
-        inst = self._create_instance(response=self.read_crd(name))
+        obj = self.read_crd_by_name(name)
+        if obj is None:
+            return None
+        inst = self._create_instance(response=[obj])
         return inst[0] if inst else None
 
     def read_by_name(self, name: str, **kwargs) -> "DefaultResourceCRD":
@@ -100,6 +497,7 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
         else:
             return threescale_api.defaults.DefaultClient.read(self, entity_id, **kwargs)
 
+    @instrumented("fetch")
     def fetch(self, entity_id: int = None, **kwargs):
         """Fetches the entity dictionary
         Args:
@@ -112,7 +510,10 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             self._log_message("[FETCH] CRD Fetch ", entity_id=entity_id, args=kwargs)
         )
         if self.is_crd_implemented():
-            list_crds = self.read_crd()
+            if entity_id is None:
+                list_crds = self.read_crd()
+            else:
+                list_crds = self.read_crd_by_id(entity_id)
             instance_list = self._create_instance(response=list_crds)
             ret = []
             if isinstance(instance_list, list):
@@ -146,6 +547,7 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
         )
         return self.fetch(entity_id, **kwargs)
 
+    @instrumented("list")
     def _list(self, **kwargs) -> List["DefaultResourceCRD"]:
         """Internal list implementation used in list or `select` methods
         Args:
@@ -179,64 +581,38 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             ):
                 del spec["spec"][value]
 
-    def create(self, params: dict = None, **kwargs) -> "DefaultResourceCRD":
-        LOG.info(self._log_message("[CREATE] Create CRD ", body=params, args=kwargs))
-        if self.is_crd_implemented():
-            spec = copy.deepcopy(self.SPEC)
-            name = params.get("name") or params.get(
-                "username"
-            )  # Developer User exception
-            if name is not None:
-                name = self.normalize(name)
-                if params.get("name"):
-                    params["name"] = name
-                else:
-                    params["username"] = name
+    def new_crd(self, params):
+        """Returns name and spec of new CRD built from 'params'."""
+        spec = copy.deepcopy(self.SPEC)
+        name = params.get("name") or params.get("username")  # Developer User exception
+        if name is not None:
+            name = self.normalize(name)
+            if params.get("name"):
+                params["name"] = name
             else:
-                name = self.normalize(
-                    "".join(random.choice(string.ascii_letters) for _ in range(16))
-                )
+                params["username"] = name
+        else:
+            name = self.normalize(
+                "".join(random.choice(string.ascii_letters) for _ in range(16))
+            )
 
-            spec["metadata"]["namespace"] = self.threescale_client.ocp_namespace
-            spec["metadata"]["name"] = name
-            spec = self._set_provider_ref_new_crd(spec)
-            self.before_create(params, spec)
+        spec["metadata"]["namespace"] = self.threescale_client.ocp_namespace
+        spec["metadata"]["name"] = name
+        spec = self._set_provider_ref_new_crd(spec)
+        self.before_create(params, spec)
 
-            spec["spec"].update(self.translate_to_crd(params))
-            DefaultClientCRD.cleanup_spec(spec, self.KEYS, params)
+        spec["spec"].update(self.translate_to_crd(params))
+        DefaultClientCRD.cleanup_spec(spec, self.KEYS, params)
+        return name, spec
 
-            result = ocp.create(spec)
-            assert result.status() == 0
-            # list_objs = self.read_crd(result.out().strip().split('/')[1])
-            created_objects = []
-            # counters = [89, 55, 34, 21, 13, 8, 5, 3, 2, 1, 1, 1]
-            # while len(list_objs) > 0 and len(counters) > 0:
-            #    list_objs2 = []
-            #    for obj in list_objs:
-            #        obj.refresh()
-            #        status = obj.as_dict().get('status', None)
-            #        if status:
-            #            new_id = status.get(self.ID_NAME, 0)
-            #            if self._is_ready(status, new_id):
-            #                created_objects.append(obj)
-            #            else:
-            #                list_objs2.append(obj)
-            #        else:
-            #            list_objs2.append(obj)
-            #    list_objs = list_objs2
-            #    if not list_objs:
-            #        time.sleep(counters.pop())
-
-            timeout = 1000
-            # if self.__class__.__name__ in ['Promotes']:
-            #    timeout = 1000
-
-            with ocp.timeout(timeout):
-                (success, created_objects, _) = result.until_all(
-                    success_func=lambda obj: self._is_ready(obj)
-                )
-                assert created_objects
-                assert success
+    @instrumented("create")
+    def create(self, params: dict = None, **kwargs) -> "DefaultResourceCRD":
+        LOG.info(self._log_message("[CREATE] Create CRD ", body=params, args=kwargs))
+        if self.is_crd_implemented():
+            name, spec = self.new_crd(params)
+            obj = self.transport.create(spec)
+            self.mark_crd_changed(name, obj["metadata"].get("resourceVersion"))
+            created_objects = [self.wait_for_ready(name)]
 
             instance = (self._create_instance(response=created_objects)[:1] or [None])[
                 0
@@ -245,6 +621,55 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
 
         return threescale_api.defaults.DefaultClient.create(self, params, **kwargs)
 
+    @instrumented("create_many")
+    def create_many(self, params_list: List[dict]) -> List["DefaultResourceCRD"]:
+        """
+        Creates CRDs by one submit and waits for readiness of all of them together.
+        Returns created resources in order of 'params_list', item of failed
+        create is the exception.
+        """
+        LOG.info(self._log_message("[CREATE] Create many CRDs ", body=params_list))
+        results = [None] * len(params_list)
+        if not self.is_crd_implemented():
+            for i, params in enumerate(params_list):
+                results[i] = self._create_or_error(params)
+            return results
+        specs = {}
+        for i, params in enumerate(params_list):
+            try:
+                specs[i] = self.new_crd(params)[1]
+            except Exception as err:  # pylint: disable=broad-except
+                results[i] = err
+        names = {}
+        versions = []
+        for i, obj in zip(specs, self.transport.create_many(list(specs.values()))):
+            if isinstance(obj, Exception):
+                results[i] = obj
+                continue
+            names[i] = obj["metadata"]["name"]
+            versions.append(obj["metadata"].get("resourceVersion") or "")
+            self.mark_crd_changed(names[i], versions[-1] or None)
+        # objects can be created concurrently, watch starts after the oldest one
+        version = None
+        if versions and all(ver.isdigit() for ver in versions):
+            version = min(versions, key=int)
+        ready = self.wait_for_ready_many(list(names.values()), version)
+        for i, name in names.items():
+            obj = ready[name]
+            results[i] = (
+                obj
+                if isinstance(obj, Exception)
+                else self._create_instance(response=[obj])[0]
+            )
+        return results
+
+    def _create_or_error(self, params):
+        """Returns created resource or the exception."""
+        try:
+            return self.create(params)
+        except Exception as err:  # pylint: disable=broad-except
+            return err
+
     def _set_provider_ref_new_crd(self, spec):
         """set provider reference to new crd"""
         if self.threescale_client.ocp_provider_ref is None:
@@ -275,6 +700,22 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             and (new_id != 0)
         )
 
+    @staticmethod
+    def _is_failed(obj):
+        """
+        Returns message of Failed or Invalid condition set by operator for
+        current generation of CRD, otherwise None.
+        """
+        crd = obj.as_dict()
+        status = crd.get("status") or {}
+        observed = status.get("observedGeneration")
+        if observed is not None and observed < crd["metadata"].get("generation", 0):
+            return None
+        for cond in status.get("conditions") or []:
+            if cond["type"] in ("Failed", "Invalid") and cond["status"] == "True":
+                return cond.get("message") or cond["type"]
+        return None
+
     def _create_instance(self, response, klass=None, collection: bool = False):
         klass = klass or self._instance_klass
         if self.is_crd_implemented():
@@ -317,6 +758,7 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
         )
         return instance
 
+    @instrumented("delete")
     def delete(
         self, entity_id: int = None, resource: "DefaultResourceCRD" = None, **kwargs
     ) -> bool:
@@ -325,12 +767,16 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             self._log_message("[DELETE] Delete CRD ", entity_id=entity_id, args=kwargs)
         )
         if self.is_crd_implemented():
-            resource.crd.delete()
+            self.transport.delete(
+                self.SELECTOR, self.threescale_client.ocp_namespace, resource.crd.name()
+            )
+            self.mark_crd_changed(resource.crd.name())
             return True
         return threescale_api.defaults.DefaultClient.delete(
             self, entity_id=entity_id, **kwargs
         )
 
+    @instrumented("update")
     def update(
         self,
         entity_id=None,
@@ -357,24 +803,24 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
                 resource = resource.read()
                 if isinstance(resource, list):
                     resource = resource[0]
-            else:
-                resource.crd.refresh()
-            new_crd = resource.crd.as_dict()
-            new_crd["spec"].update(new_spec)
-            if self.__class__.__name__ not in ["Tenants"]:
-                if self.threescale_client.ocp_provider_ref is None:
-                    new_crd["spec"].pop("providerAccountRef", None)
+            batch = self.batch_crd(resource.crd.name())
+            if batch is not None:
+                resource.crd = batch
+                batch.model = ocp.Model(self.updated_crd(batch, new_spec))
+                return resource
+            try:
+                if self.threescale_client.update_mode == "patch":
+                    self.patch_crd(resource.crd, new_spec)
                 else:
-                    new_crd["spec"]["providerAccountRef"] = {
-                        "name": self.threescale_client.ocp_provider_ref,
-                        # 'namespace': self.threescale_client.ocp_namespace
-                    }
-            resource.crd.model = ocp.Model(new_crd)
-            result = resource.crd.replace()
-
-            if result.status():
-                LOG.error("[INSTANCE] Update CRD failed: %s", str(result))
-                raise Exception(str(result))
+                    self.refresh_crd(resource.crd)
+                    new_crd = self.updated_crd(resource.crd, new_spec)
+                    resource.crd.model = ocp.Model(self.transport.replace(new_crd))
+            except TransportError as err:
+                LOG.error("[INSTANCE] Update CRD failed: %s", str(err))
+                raise
+            self.mark_crd_changed(
+                resource.crd.name(), DefaultClientCRD.crd_version(resource.crd)
+            )
             # return self.read(resource.entity_id)
             return resource
 
@@ -382,6 +828,52 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
             self, entity_id=entity_id, params=params, **kwargs
         )
 
+    def updated_crd(self, crd, new_spec):
+        """Returns dict of CRD with spec merged with 'new_spec'."""
+        new_crd = crd.as_dict()
+        new_crd["spec"].update(new_spec)
+        if self.__class__.__name__ not in ["Tenants"]:
+            if self.threescale_client.ocp_provider_ref is None:
+                new_crd["spec"].pop("providerAccountRef", None)
+            else:
+                new_crd["spec"]["providerAccountRef"] = {
+                    "name": self.threescale_client.ocp_provider_ref,
+                    # 'namespace': self.threescale_client.ocp_namespace
+                }
+        return new_crd
+
+    def patch_crd(self, crd, new_spec, retries=3):
+        """
+        Sends only changed fields of CRD spec as JSON merge patch. Known
+        resourceVersion is precondition of the patch, CRD is refreshed
+        and patch is computed again if the CRD was changed meanwhile.
+        """
+        while True:
+            old_crd = crd.as_dict()
+            patch = merge_patch(old_crd["spec"], self.updated_crd(crd, new_spec)["spec"])
+            if not patch:
+                return crd
+            patch = {
+                "metadata": {"resourceVersion": old_crd["metadata"]["resourceVersion"]},
+                "spec": patch,
+            }
+            try:
+                crd.model = ocp.Model(
+                    self.transport.patch(
+                        self.SELECTOR,
+                        self.threescale_client.ocp_namespace,
+                        crd.name(),
+                        patch,
+                    )
+                )
+                return crd
+            except TransportError as err:
+                if err.code != 409 or retries <= 0:
+                    raise
+                LOG.info("[INSTANCE] CRD %s changed meanwhile, patch again", crd.name())
+                retries -= 1
+                self.refresh_crd(crd)
+
     def trans_item(self, key, value, obj):
         """Transform one attribute in CRD spec."""
         return obj[key]
@@ -389,9 +881,8 @@ class DefaultClientCRD(threescale_api.defaults.DefaultClient):
     def translate_to_crd(self, obj):
         """Translate object attributes into object ready for merging into CRD."""
         map_ret = {}
-
+        LOG.debug("translate to CRD %s", obj)
         for key, value in self.KEYS.items():
-            LOG.debug("%s, %s, %s, %s", str(key), str(value), str(obj), str(type(obj)))
             if obj.get(key, None) is not None:
                 set_value = self.trans_item(key, value, obj)
                 if set_value is not None:
@@ -410,6 +901,25 @@ class DefaultClientNestedCRD(DefaultClientCRD):
         """Returns object id extracted from CRD."""
         return None
 
+    def read_crd(self, obj_name=None):
+        """
+        Nested objects are read from CRD of topmost parent, only this CRD is
+        read by its name (from informer store if informers are used), CRDs
+        of other parents are not listed. Nested objects of CRD in running
+        batch are read from its local copy.
+        """
+        if obj_name is None:
+            obj_name = self.topmost_parent().crd.name()
+        return super().read_crd(obj_name)
+
+    def read_crd_by_id(self, entity_id):
+        """Nested objects have no ids in CRD status, whole list is returned."""
+        return self.read_crd()
+
+    def read_by_name(self, name: str, **kwargs) -> "DefaultResourceCRD":
+        """Nested objects are not CRDs, they cannot be read by CRD name."""
+        return threescale_api.defaults.DefaultClient.read_by_name(self, name, **kwargs)
+
     # flake8: noqa C901
     def _extract_resource_crd(self, response, collection, klass) -> Union[List, Dict]:
         extract_params = {"response": response, "entity": self._entity_name}
@@ -418,27 +928,18 @@ class DefaultClientNestedCRD(DefaultClientCRD):
         extracted = None
         if isinstance(response, list):
             if self.is_crd_implemented():
-                parent_id = int(self.topmost_parent().entity_id)
+                parent = self.topmost_parent()
+                parent_id = int(parent.entity_id)
                 service_with_maps = {}
-                for prod in response:
-                    prod_dict = prod.as_dict()
-                    if prod_dict is None:
-                        prod_dict = {}
-                    idp = int(
-                        prod_dict.get("status", {}).get(
-                            self.topmost_parent().client.ID_NAME, 0
-                        )
-                    )
-                    if idp == parent_id:
+                id_path = "status/" + parent.client.ID_NAME
+                for prod, idp in DictQuery.extract(response, id_path, 0):
+                    if int(idp or 0) == parent_id:
                         service_with_maps = prod
                         break
                 spec = {}
                 if service_with_maps != {}:
-                    spec = (
-                        DictQuery(service_with_maps.as_dict()).get(
-                            klass.GET_PATH or self.get_path()
-                        )
-                    ) or []
+                    path = klass.GET_PATH or self.get_path()
+                    spec = DictQuery.compile(path)(service_with_maps.as_dict()) or []
                 if isinstance(spec, list):
                     return [{"spec": obj, "crd": service_with_maps} for obj in spec]
                 elif (
@@ -455,6 +956,7 @@ class DefaultClientNestedCRD(DefaultClientCRD):
 
         return extracted
 
+    @instrumented("create")
     def create(self, params: dict = None, **kwargs) -> "DefaultResourceCRD":
         LOG.info(
             self._log_message("[CREATE] Create CRD Nested ", body=params, args=kwargs)
@@ -481,10 +983,24 @@ class DefaultClientNestedCRD(DefaultClientCRD):
             spec["spec"].update(self.translate_to_crd(params))
             DefaultClientCRD.cleanup_spec(spec, self.KEYS, params)
 
-            return self.in_create(self.get_list_from_spec(), params, spec)
+            with self.threescale_client.instrumentation.operation(self, "in_create"):
+                return self.in_create(self.get_list_from_spec(), params, spec)
 
         return threescale_api.defaults.DefaultClient.create(self, params, **kwargs)
 
+    @instrumented("create_many")
+    def create_many(self, params_list: List[dict]) -> List["DefaultResourceCRD"]:
+        """
+        Creates nested objects in one batch of changes of parent CRD.
+        Returns created resources in order of 'params_list', item of failed
+        create is the exception.
+        """
+        if not self.is_crd_implemented():
+            return [self._create_or_error(params) for params in params_list]
+        with self.topmost_parent().batch():
+            return [self._create_or_error(params) for params in params_list]
+
+    @instrumented("delete")
     def delete(
         self, entity_id: int = None, resource: "DefaultResourceCRD" = None, **kwargs
     ) -> bool:
@@ -503,6 +1019,7 @@ class DefaultClientNestedCRD(DefaultClientCRD):
             self, entity_id=entity_id, **kwargs
         )
 
+    @instrumented("update")
     def update(
         self,
         entity_id=None,
@@ -566,12 +1083,23 @@ class DefaultResourceCRD(threescale_api.defaults.DefaultResource):
         super().__init__(**kwargs)
         self._crd = crd
 
+    @staticmethod
+    def translate_from_crd(spec, crd_keys):
+        """
+        Translates CRD spec into entity attributes, 'crd_keys' is inverted
+        KEYS_* table, e.g. constants.CRD_KEYS_SERVICE.
+        """
+        return {crd_keys[key]: value for key, value in spec.items() if key in crd_keys}
+
     @property
     def crd(self):
         """CRD object property."""
         if not self._crd:
             self.read()
-        return self._crd or self.entity.get("crd", None)
+        crd = self._crd or self.entity.get("crd", None)
+        if crd is not None and self.client.threescale_client.batches:
+            return self.client.batch_crd(crd.name()) or crd
+        return crd
 
     @crd.setter
     def crd(self, value):
@@ -585,19 +1113,90 @@ class DefaultResourceCRD(threescale_api.defaults.DefaultResource):
     def entity_id(self, value):
         self._entity_id = value
 
-    def get_id_from_crd(self):
-        """Returns object id extracted from CRD."""
-        counter = 5
-        while counter > 0:
-            self.crd = self.crd.refresh()
-            status = self.crd.as_dict()["status"]
-            ret_id = status.get(self.client.ID_NAME, None)
-            if ret_id:
-                return ret_id
-            time.sleep(20)
-            counter -= 1
+    def __str__(self) -> str:
+        # known id and fields only, logging of resource should not wait for id
+        # in CRD status nor load lazy fields, e.g. OpenAPI body
+        entity_id = self._entity_id or self._entity.get("id")
+        return self.__class__.__name__ + f"({entity_id}): " + str(self._entity)
+
+    def _lazy_load(self, **kwargs) -> "DefaultResourceCRD":
+        if self._entity is None:
+            fetched = self.fetch(**kwargs)
+            if isinstance(fetched, dict):
+                self._entity = fetched
+            elif fetched is not None:
+                self._entity = fetched._entity
+                self.take_lazy_fields(fetched)
+            else:
+                return None
+        return self
 
-        return None
+    def take_lazy_fields(self, fetched):
+        """
+        Takes fields which are loaded on first access, e.g. OpenAPI body,
+        from 'fetched' resource, so they are loaded again after read().
+        """
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Nested creates, updates and deletes inside the block change only
+        local copy of CRD spec, it is sent to API server by one replace
+        at the end of the block. Changes are dropped if the block raises.
+        Batch belongs to the thread which started it, other threads change
+        the CRD on API server and batch is applied over their changes.
+
+            with service.batch():
+                for rule in rules:
+                    service.mapping_rules.create(rule)
+        """
+        crd = self.crd
+        if not self.client.begin_batch(crd):
+            yield self
+            return
+        spec = crd.as_dict()["spec"]
+        try:
+            yield self
+        except BaseException:
+            self.client.end_batch(crd, commit=False)
+            raise
+        self.client.end_batch(crd, commit=crd.as_dict()["spec"] != spec, base=spec)
+
+    def get_id_from_crd(self, timeout=None):
+        """
+        Returns object id extracted from CRD status. If operator has not set
+        it yet, CRD is watched until the id appears or until deadline
+        (client ID_TIMEOUT by default). Returns None after deadline.
+        """
+        id_name = self.client.ID_NAME
+        ret_id = (self.crd.as_dict().get("status") or {}).get(id_name)
+        if ret_id:
+            return ret_id
+        timeout = self.client.ID_TIMEOUT if timeout is None else timeout
+        try:
+            obj = self.client.wait_for(
+                self.crd.name(),
+                lambda obj: bool((obj.as_dict().get("status") or {}).get(id_name)),
+                timeout,
+            )
+        except threescale_api.errors.ThreeScaleApiError:
+            return None
+        self.crd.model = obj.model
+        return obj.as_dict()["status"][id_name]
+
+    def entity_id_future(self, timeout=None) -> concurrent.futures.Future:
+        """
+        Returns future of object id, it does not block if operator
+        has not set the id in CRD status yet.
+        """
+        entity_id = self._entity_id or self._entity.get("id")
+        if entity_id:
+            future = concurrent.futures.Future()
+            future.set_result(entity_id)
+            return future
+        return self.client.threescale_client.executor.submit(
+            self.get_id_from_crd, timeout
+        )
 
     def get_path(self):
         """
@@ -607,23 +1206,110 @@ class DefaultResourceCRD(threescale_api.defaults.DefaultResource):
         return self.__class__.GET_PATH
 
 
+class NameIdMap:
+    """
+    Map between names (spec.name) and ids of CRDs of one kind, CRDs can be
+    found by name (also by CRD name or system name) as well. It is built by
+    one read of all CRDs and shared by all clients of one ThreeScaleClientCRD.
+    Changes done by the client invalidate it, with informers it is rebuilt
+    when informer sees any change. Unknown name or id causes one rebuild.
+    """
+
+    def __init__(self):
+        self._ids = None
+        self._names = None
+        self._crds = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drops the map, it is rebuilt on next lookup."""
+        with self._lock:
+            self._ids = None
+
+    def id_by_name(self, client, name):
+        """Returns id of CRD with 'name' or None."""
+        return self._lookup(client, lambda: self._ids.get(name))
+
+    def name_by_id(self, client, entity_id):
+        """Returns name of CRD with 'entity_id' or None."""
+        return self._lookup(client, lambda: self._names.get(int(entity_id)))
+
+    def crd_by_name(self, client, name):
+        """Returns CRD object with 'name' or None."""
+        return self._lookup(client, lambda: self._crds.get(name))
+
+    def _lookup(self, client, get):
+        informer = client.informer
+        version = informer.resource_version if informer else None
+        with self._lock:
+            if self._ids is not None and version == self._version:
+                ret = get()
+                if ret is not None:
+                    return ret
+            self._build(client, version)
+            return get()
+
+    def _build(self, client, version):
+        ids = {}
+        names = {}
+        crds = {}
+        for obj in client.read_crd():
+            crd = obj.as_dict()
+            ide = DefaultClientCRD._status_id(crd, client.ID_NAME)
+            name = (crd.get("spec") or {}).get("name")
+            if ide is None or not name:
+                continue
+            # CRD name is usually the same as spec.name, both can be used,
+            # system name is used by references, e.g. metricMethodRef.backend
+            keys = {crd["metadata"]["name"], name, crd["spec"].get("systemName")}
+            keys.discard(None)
+            for key in keys:
+                ids[key] = int(ide)
+                crds[key] = obj
+            names[int(ide)] = name
+        self._ids = ids
+        self._names = names
+        self._crds = crds
+        self._version = version
+
+
 class DictQuery(dict):
     """Get value from nested dictionary."""
 
     def get(self, path, default=None):
-        keys = path.split("/")
-        val = None
+        return DictQuery.compile(path)(self, default)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def compile(path):
+        """
+        Returns accessor of value on 'path' (e.g. 'spec/metrics') in nested
+        dictionary, lists on the path are walked item by item.
+        Accessors are cached by path.
+        """
+        keys = tuple(path.split("/"))
 
-        for key in keys:
-            if val:
+        def accessor(obj, default=None):
+            val = obj
+            for key in keys:
                 if isinstance(val, list):
-                    val = [v.get(key, default) if v else None for v in list(val)]
+                    val = [dict.get(v, key, default) if v else None for v in val]
                 else:
-                    val = val.get(key, default)
-            else:
-                val = dict.get(self, key, default)
+                    val = dict.get(val, key, default)
+                if not val:
+                    break
+            return val
 
-            if not val:
-                break
+        return accessor
 
-        return val
+    @staticmethod
+    def extract(objs, path, default=None):
+        """
+        Yields pairs of object and its value on 'path' for every object,
+        objects are dictionaries or APIObjects.
+        """
+        accessor = DictQuery.compile(path)
+        for obj in objs:
+            data = obj.as_dict() if hasattr(obj, "as_dict") else obj
+            yield obj, accessor(data or {}, default)
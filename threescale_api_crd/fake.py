@@ -0,0 +1,386 @@
+""" Module with in-memory fake of API server and 3scale operator """
+
+import base64
+import collections
+import copy
+import datetime
+import json
+import threading
+import time
+import uuid
+
+from threescale_api_crd import constants
+from threescale_api_crd.transport import (
+    Transport,
+    TransportError,
+    Watch,
+    add_payload_size,
+    apply_merge_patch,
+)
+
+
+class FakeTransport(Transport):
+    """
+    In-memory API server with emulated 3scale operator. Objects are stored
+    per namespace, operator sets status conditions and ids of CRs after
+    reconcile delay. Requests and responses are passed through json
+    in the same way as with real API server.
+    """
+
+    STATUS_IDS = {
+        "Product": "productId",
+        "Backend": "backendId",
+        "ActiveDoc": "activeDocId",
+        "CustomPolicyDefinition": "policyID",
+        "DeveloperAccount": "accountID",
+        "DeveloperUser": "developerUserID",
+        "Tenant": "tenantId",
+        "ProxyConfigPromote": "productId",
+        "Application": "applicationID",
+        "OpenAPI": None,
+    }
+    HISTORY = 1000
+
+    def __init__(self, namespace="fake", reconcile_delay=0, delays=None, history=HISTORY):
+        self.namespace = namespace
+        self.reconcile_delay = reconcile_delay
+        self.delays = delays or {}
+        self.stats = collections.Counter()
+        self._history = history
+        self._store = {}
+        self._events = []
+        self._version = 0
+        self._ids = collections.Counter()
+        self._failures = {}
+        self._cond = threading.Condition(threading.RLock())
+
+    def fail(self, kind, message="emulated failure"):
+        """Next reconciles of CRs of the kind end with Failed condition."""
+        self._failures[kind] = message
+
+    def heal(self, kind):
+        """Next reconciles of CRs of the kind succeed."""
+        self._failures.pop(kind, None)
+
+    def objects(self, kind, namespace=None):
+        """Returns copies of stored objects, it is not counted as request."""
+        with self._cond:
+            objs = list(self._objects(kind, namespace or self.namespace).values())
+            return copy.deepcopy(objs)
+
+    def list(self, kind, namespace):
+        with self._cond:
+            self._count("list")
+            return self._response(
+                {
+                    "kind": kind + "List",
+                    "apiVersion": constants.API_VERSIONS[kind],
+                    "metadata": {"resourceVersion": str(self._version)},
+                    "items": list(self._objects(kind, namespace).values()),
+                }
+            )
+
+    def get(self, kind, namespace, name):
+        with self._cond:
+            self._count("get")
+            obj = self._objects(kind, namespace).get(name)
+            return self._response(obj) if obj else None
+
+    def create(self, obj):
+        obj = self._request("create", obj)
+        kind = obj["kind"]
+        metadata = obj["metadata"]
+        metadata["namespace"] = metadata.get("namespace") or self.namespace
+        with self._cond:
+            objects = self._objects(kind, metadata["namespace"])
+            if metadata["name"] in objects:
+                raise TransportError(
+                    f'{kind} "{metadata["name"]}" already exists', code=409
+                )
+            obj.setdefault("apiVersion", constants.API_VERSIONS[kind])
+            obj.pop("status", None)
+            metadata["uid"] = str(uuid.uuid4())
+            metadata["generation"] = 1
+            metadata["creationTimestamp"] = _now()
+            self._save("ADDED", obj)
+            self._schedule(obj)
+            return self._response(obj)
+
+    def replace(self, obj):
+        obj = self._request("replace", obj)
+        with self._cond:
+            return self._modify(obj)
+
+    def patch(self, kind, namespace, name, patch):
+        patch = self._request("patch", patch)
+        with self._cond:
+            current = self._current(kind, namespace, name)
+            obj = apply_merge_patch(current, patch)
+            version = (patch.get("metadata") or {}).get("resourceVersion")
+            obj["metadata"]["resourceVersion"] = version
+            return self._modify(obj)
+
+    def _current(self, kind, namespace, name):
+        current = self._objects(kind, namespace).get(name)
+        if current is None:
+            raise TransportError(f'{kind} "{name}" not found', code=404)
+        return current
+
+    def _modify(self, obj):
+        """Stores changed object, status is kept, generation is increased on spec change."""
+        kind = obj["kind"]
+        metadata = obj["metadata"]
+        current = self._current(kind, metadata["namespace"], metadata["name"])
+        cur_meta = current["metadata"]
+        version = metadata.get("resourceVersion")
+        if version and version != cur_meta["resourceVersion"]:
+            raise TransportError(
+                f'Operation cannot be fulfilled on {kind} "{metadata["name"]}": '
+                "the object has been modified",
+                code=409,
+            )
+        obj.pop("status", None)
+        if "status" in current:
+            obj["status"] = copy.deepcopy(current["status"])
+        for key in ("uid", "creationTimestamp", "generation"):
+            metadata[key] = cur_meta[key]
+        changed = obj.get("spec") != current.get("spec")
+        if changed:
+            metadata["generation"] += 1
+        self._save("MODIFIED", obj)
+        if changed:
+            self._schedule(obj)
+        return self._response(obj)
+
+    def delete(self, kind, namespace, name):
+        with self._cond:
+            self._count("delete")
+            obj = self._objects(kind, namespace).pop(name, None)
+            if obj is not None:
+                obj = copy.deepcopy(obj)
+                self._version += 1
+                obj["metadata"]["resourceVersion"] = str(self._version)
+                self._add_event("DELETED", obj)
+
+    def watch(self, kind, namespace, resource_version=None, name=None, timeout=None):
+        closed = threading.Event()
+
+        def close():
+            closed.set()
+            with self._cond:
+                self._cond.notify_all()
+
+        events = self._watch_events(
+            kind, namespace, resource_version, name, timeout, closed
+        )
+        return Watch(events, close)
+
+    def _watch_events(self, kind, namespace, resource_version, name, timeout, closed):
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._cond:
+            self._count("watch")
+            if resource_version is None:
+                version = self._version
+                pending = [
+                    {"type": "ADDED", "object": obj}
+                    for obj in self._objects(kind, namespace).values()
+                    if name is None or obj["metadata"]["name"] == name
+                ]
+            else:
+                version = int(resource_version)
+                pending = []
+        while not closed.is_set():
+            for event in pending:
+                yield self._response(event)
+                if event["type"] == "ERROR":
+                    return
+            with self._cond:
+                pending = self._events_after(version, kind, namespace, name)
+                while not pending and not closed.is_set():
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return
+                    self._cond.wait(remaining)
+                    pending = self._events_after(version, kind, namespace, name)
+                if pending and pending[-1]["object"].get("metadata"):
+                    version = int(pending[-1]["object"]["metadata"]["resourceVersion"])
+
+    def _events_after(self, version, kind, namespace, name):
+        if self._events and version < self._events[0][0] - 1:
+            return [
+                {
+                    "type": "ERROR",
+                    "object": {
+                        "kind": "Status",
+                        "code": 410,
+                        "reason": "Expired",
+                        "message": "too old resource version",
+                    },
+                }
+            ]
+        return [
+            event
+            for (ev_version, ev_kind, ev_namespace, event) in self._events
+            if ev_version > version
+            and ev_kind == kind
+            and ev_namespace == namespace
+            and (name is None or event["object"]["metadata"]["name"] == name)
+        ]
+
+    def _objects(self, kind, namespace):
+        return self._store.setdefault((kind, namespace), {})
+
+    def _save(self, typ, obj):
+        """Stores object, stored objects are never changed in place."""
+        metadata = obj["metadata"]
+        self._version += 1
+        metadata["resourceVersion"] = str(self._version)
+        self._objects(obj["kind"], metadata["namespace"])[metadata["name"]] = obj
+        self._add_event(typ, obj)
+
+    def _add_event(self, typ, obj):
+        metadata = obj["metadata"]
+        self._events.append(
+            (
+                self._version,
+                obj["kind"],
+                metadata["namespace"],
+                {"type": typ, "object": obj},
+            )
+        )
+        if len(self._events) > 2 * self._history:
+            del self._events[: -self._history]
+        self._cond.notify_all()
+
+    def _schedule(self, obj):
+        kind = obj["kind"]
+        if kind not in FakeTransport.STATUS_IDS:
+            return
+        args = (kind, obj["metadata"]["namespace"], obj["metadata"]["name"])
+        args += (obj["metadata"]["generation"],)
+        delay = self.delays.get(kind, self.reconcile_delay)
+        if delay:
+            timer = threading.Timer(delay, self._reconcile, args)
+            timer.daemon = True
+            timer.start()
+        else:
+            self._reconcile(*args)
+
+    def _reconcile(self, kind, namespace, name, generation):
+        """Emulates operator, it sets status of CR."""
+        with self._cond:
+            current = self._objects(kind, namespace).get(name)
+            if current is None or current["metadata"]["generation"] != generation:
+                return
+            obj = copy.deepcopy(current)
+            if self._set_defaults(obj):
+                obj["metadata"]["generation"] += 1
+                generation = obj["metadata"]["generation"]
+            status = obj.setdefault("status", {})
+            message = self._failures.get(kind)
+            if message:
+                status["conditions"] = _conditions(Ready=False, Synced=False, Failed=message)
+            else:
+                self._operator_status(obj, status)
+                status["conditions"] = _conditions(
+                    Ready=True, Synced=True, Failed=False, Invalid=False, Orphan=False
+                )
+            status["observedGeneration"] = generation
+            self._save("MODIFIED", obj)
+
+    @staticmethod
+    def _set_defaults(obj):
+        """Operator sets system name and default 'hits' metric of Product and Backend."""
+        if obj["kind"] not in ("Product", "Backend"):
+            return False
+        spec = obj.setdefault("spec", {})
+        changed = False
+        if not spec.get("systemName"):
+            spec["systemName"] = spec.get("name") or obj["metadata"]["name"]
+            changed = True
+        metrics = spec.setdefault("metrics", {})
+        if "hits" not in metrics:
+            metrics["hits"] = {
+                "friendlyName": "Hits",
+                "unit": "hit",
+                "description": "Number of API hits",
+            }
+            changed = True
+        return changed
+
+    def _operator_status(self, obj, status):
+        kind = obj["kind"]
+        spec = obj.get("spec", {})
+        id_name = FakeTransport.STATUS_IDS[kind]
+        if kind == "ProxyConfigPromote":
+            product = self._objects("Product", obj["metadata"]["namespace"]).get(
+                spec.get("productCRName")
+            )
+            status[id_name] = (product or {}).get("status", {}).get(id_name)
+        elif id_name and id_name not in status:
+            self._ids[kind] += 1
+            status[id_name] = self._ids[kind]
+        if kind == "Tenant" and "adminId" not in status:
+            self._ids["TenantAdmin"] += 1
+            status["adminId"] = self._ids["TenantAdmin"]
+            self._tenant_secret(obj, status)
+        elif kind == "Application":
+            status["state"] = "suspended" if spec.get("suspend") else "live"
+        elif kind == "OpenAPI":
+            status["productResourceName"] = {"name": obj["metadata"]["name"]}
+            status["backendResourceNames"] = [{"name": obj["metadata"]["name"]}]
+
+    def _tenant_secret(self, obj, status):
+        spec = obj["spec"]
+        ref = spec.get("tenantSecretRef") or {}
+        if not ref.get("name"):
+            return
+        admin_url = f"https://{spec.get('username', 'tenant')}-admin.example.com"
+        data = {"adminURL": admin_url, "token": uuid.uuid4().hex}
+        secret = copy.deepcopy(constants.SPEC_SECRET)
+        secret["metadata"]["name"] = ref["name"]
+        secret["metadata"]["namespace"] = ref.get("namespace") or obj["metadata"]["namespace"]
+        secret["metadata"]["uid"] = str(uuid.uuid4())
+        secret["metadata"]["creationTimestamp"] = _now()
+        secret["data"] = {
+            key: base64.b64encode(value.encode("ascii")).decode("ascii")
+            for key, value in data.items()
+        }
+        self._save("ADDED", secret)
+
+    def _request(self, verb, obj):
+        data = json.dumps(obj)
+        self.stats["requests"] += 1
+        self.stats[verb] += 1
+        self.stats["bytes_sent"] += len(data)
+        add_payload_size(len(data))
+        return json.loads(data)
+
+    def _count(self, verb):
+        self.stats["requests"] += 1
+        self.stats[verb] += 1
+
+    def _response(self, obj):
+        data = json.dumps(obj)
+        self.stats["bytes"] += len(data)
+        add_payload_size(len(data))
+        return json.loads(data)
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _conditions(**states):
+    """Returns operator conditions, Failed condition holds message."""
+    now = _now()
+    conditions = []
+    for typ, state in states.items():
+        cond = {"type": typ, "status": "True" if state else "False"}
+        cond["lastTransitionTime"] = now
+        if isinstance(state, str):
+            cond["message"] = state
+        conditions.append(cond)
+    return conditions
@@ -0,0 +1,243 @@
+""" Module with watch-backed informer cache for CRD objects """
+
+import logging
+import threading
+
+from threescale_api_crd import constants
+from threescale_api_crd.lazy import LazyModule
+
+ocp = LazyModule("openshift_client")
+
+LOG = logging.getLogger(__name__)
+
+
+class Informer:
+    """
+    Local store of all CRs of one kind in one namespace.
+    Store is filled by one initial list and then it is kept current
+    by watch events processed in background thread.
+    """
+
+    RETRY_DELAY = 1
+    STOP_TIMEOUT = 5
+    GONE = 410
+
+    def __init__(self, kind, namespace, transport):
+        self._kind = kind
+        self._namespace = namespace
+        self._transport = transport
+        self._store = {}
+        self._stale = {}
+        self._resource_version = None
+        self._indexers = {}
+        self._indices = {}
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._watch = None
+
+    @property
+    def kind(self):
+        """Returns kind of objects in the store."""
+        return self._kind
+
+    @property
+    def resource_version(self):
+        """Returns last resourceVersion seen by informer."""
+        return self._resource_version
+
+    def start(self):
+        """Lists all objects and starts watch in background thread."""
+        if self._thread is not None:
+            return self
+        self._stopped.clear()
+        self.relist()
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{self._kind}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops background watch and waits for its thread (at most STOP_TIMEOUT),
+        so the transport is not used by the informer after return.
+        """
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.close()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(Informer.STOP_TIMEOUT)
+
+    def relist(self):
+        """Replaces content of the store by full list of objects."""
+        response = self._transport.list(self._kind, self._namespace)
+        with self._lock:
+            self._store = {}
+            self._indices = {name: {} for name in self._indexers}
+            for obj in response.get("items", []):
+                self._upsert(obj)
+            self._stale.clear()
+            self._resource_version = response.get("metadata", {}).get(
+                "resourceVersion"
+            )
+        LOG.info(
+            "[INFORMER] %s listed %d objects at %s",
+            self._kind,
+            len(self._store),
+            self._resource_version,
+        )
+
+    def get(self, name):
+        """Returns object by name or None."""
+        self._refresh_stale()
+        with self._lock:
+            obj = self._store.get(name)
+        return ocp.APIObject(obj) if obj else None
+
+    def list(self):
+        """Returns all objects in the store."""
+        self._refresh_stale()
+        with self._lock:
+            objs = list(self._store.values())
+        return [ocp.APIObject(obj) for obj in objs]
+
+    def add_index(self, index_name, key_func):
+        """
+        Adds index of objects in the store. 'key_func' returns index key
+        of object dict or None if object should not be indexed.
+        """
+        with self._lock:
+            if index_name in self._indexers:
+                return
+            self._indexers[index_name] = key_func
+            self._indices[index_name] = {}
+            for obj in self._store.values():
+                self._index_add(index_name, obj)
+
+    def by_index(self, index_name, key):
+        """Returns objects with 'key' in index 'index_name'."""
+        self._refresh_stale()
+        with self._lock:
+            names = self._indices[index_name].get(key, ())
+            objs = [self._store[name] for name in names]
+        return [ocp.APIObject(obj) for obj in objs]
+
+    def mark_stale(self, name, version=None):
+        """
+        Marks object as changed by this client, 'version' is resourceVersion
+        returned by the change (None for delete). Next read fetches the object
+        unless watch delivers this or newer version of it first, older events
+        of the object are not applied meanwhile.
+        """
+        with self._lock:
+            self._stale[name] = version
+
+    def handle_event(self, event):
+        """
+        Applies one watch event to the store. Returns True if the store was
+        listed again (watch expired) and the watch has to be restarted.
+        """
+        typ = event.get("type")
+        obj = event.get("object", {})
+        if typ == "ERROR":
+            if obj.get("code") == Informer.GONE:
+                self.relist()
+                return True
+            LOG.error("[INFORMER] %s watch error: %s", self._kind, obj)
+            return False
+        with self._lock:
+            version = self._object_version(obj)
+            if version:
+                self._resource_version = version
+            if typ == "BOOKMARK":
+                return False
+            name = obj["metadata"]["name"]
+            if name in self._stale:
+                target = self._stale[name]
+                if typ == "DELETED" or Informer._at_least(version, target):
+                    del self._stale[name]
+                else:
+                    # event older than our own change
+                    return False
+            if typ == "DELETED":
+                self._remove(name)
+            else:
+                self._upsert(obj)
+        return False
+
+    def _upsert(self, obj):
+        obj.setdefault("kind", self._kind)
+        obj.setdefault("apiVersion", constants.API_VERSIONS[self._kind])
+        name = obj["metadata"]["name"]
+        self._remove(name)
+        self._store[name] = obj
+        for index_name in self._indexers:
+            self._index_add(index_name, obj)
+
+    def _remove(self, name):
+        old = self._store.pop(name, None)
+        if old is None:
+            return
+        for index_name, key_func in self._indexers.items():
+            key = key_func(old)
+            names = self._indices[index_name].get(key)
+            if names:
+                names.discard(name)
+                if not names:
+                    del self._indices[index_name][key]
+
+    def _index_add(self, index_name, obj):
+        key = self._indexers[index_name](obj)
+        if key is not None:
+            self._indices[index_name].setdefault(key, set()).add(
+                obj["metadata"]["name"]
+            )
+
+    def _refresh_stale(self):
+        with self._lock:
+            names = list(self._stale.keys())
+        for name in names:
+            obj = self._transport.get(self._kind, self._namespace, name)
+            with self._lock:
+                if name not in self._stale:
+                    continue
+                del self._stale[name]
+                if obj is None:
+                    self._remove(name)
+                else:
+                    self._upsert(obj)
+
+    @staticmethod
+    def _at_least(version, target):
+        """Returns True if resourceVersion 'version' is 'target' or newer."""
+        if version is None or target is None:
+            return False
+        if version.isdigit() and target.isdigit():
+            return int(version) >= int(target)
+        return version == target
+
+    @staticmethod
+    def _object_version(obj):
+        if not obj:
+            return None
+        return obj.get("metadata", {}).get("resourceVersion")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            relisted = False
+            try:
+                self._watch = self._transport.watch(
+                    self._kind, self._namespace, self._resource_version
+                )
+                with self._watch:
+                    for event in self._watch:
+                        if self.handle_event(event):
+                            # old stream is closed, watch starts from the new list
+                            relisted = True
+                            break
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.error("[INFORMER] %s watch failed: %s", self._kind, err)
+            if not relisted:
+                self._stopped.wait(Informer.RETRY_DELAY)
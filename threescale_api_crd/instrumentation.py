@@ -0,0 +1,232 @@
+""" Module with instrumentation of calls to API server and 3scale REST API """
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+from urllib.parse import urlparse
+
+from threescale_api_crd.transport import Transport, payload_size, reset_payload_size
+
+Record = collections.namedtuple(
+    "Record", ["operation", "stack", "source", "verb", "kind", "duration", "size"]
+)
+Record.__doc__ = """
+One call to backend. 'operation' is the outermost client operation
+(e.g. 'Limits.create'), 'stack' holds all nested operations, 'source'
+is 'transport' or 'rest', 'size' is size of sent and received payload.
+"""
+
+
+class Instrumentation:
+    """
+    Collects records of all transport calls and REST requests of one client.
+    Records are passed to callbacks and rolled up in 'totals' per operation.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add_callback(self, callback):
+        """Adds callback called with every Record."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """Removes callback."""
+        with self._lock:
+            self._callbacks.remove(callback)
+
+    def record(self):
+        """Returns Recorder collecting records inside 'with' block."""
+        return Recorder(self)
+
+    def reset(self):
+        """Clears totals."""
+        with self._lock:
+            self.totals = {}
+
+    @contextlib.contextmanager
+    def operation(self, client, name):
+        """Marks calls done inside the block as part of client operation."""
+        stack = getattr(self._local, "stack", ())
+        self._local.stack = stack + (f"{client.__class__.__name__}.{name}",)
+        try:
+            yield
+        finally:
+            self._local.stack = stack
+
+    def report(self, source, verb, kind, duration, size):
+        """Reports one call to backend."""
+        stack = getattr(self._local, "stack", ())
+        record = Record(
+            stack[0] if stack else None, stack, source, verb, kind, duration, size
+        )
+        with self._lock:
+            totals = self.totals.setdefault(record.operation, collections.Counter())
+            totals[source] += 1
+            totals[f"{source}.{verb}"] += 1
+            totals["duration"] += duration
+            totals["bytes"] += size
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(record)
+
+
+class Recorder:
+    """Context manager which collects records reported inside it."""
+
+    def __init__(self, instrumentation):
+        self.records = []
+        self._instrumentation = instrumentation
+
+    def __enter__(self):
+        self._instrumentation.add_callback(self.records.append)
+        return self
+
+    def __exit__(self, *args):
+        self._instrumentation.remove_callback(self.records.append)
+
+    def summary(self):
+        """Returns counters of calls, duration and bytes per operation."""
+        ret = {}
+        for rec in self.records:
+            counter = ret.setdefault(rec.operation, collections.Counter())
+            counter[rec.source] += 1
+            counter[f"{rec.source}.{rec.verb}"] += 1
+            counter["duration"] += rec.duration
+            counter["bytes"] += rec.size
+        return ret
+
+
+def instrumented(name):
+    """Decorator of client methods which reports them as operation 'name'."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.threescale_client.instrumentation.operation(self, name):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class InstrumentedTransport(Transport):
+    """Transport which reports every call of wrapped transport."""
+
+    def __init__(self, transport, instrumentation):
+        self.transport = transport
+        self._instrumentation = instrumentation
+
+    @property
+    def namespace(self):
+        """Returns default namespace of wrapped transport."""
+        return self.transport.namespace
+
+    def list(self, kind, namespace):
+        return self._call("list", kind, self.transport.list, kind, namespace)
+
+    def get(self, kind, namespace, name):
+        return self._call("get", kind, self.transport.get, kind, namespace, name)
+
+    def create(self, obj):
+        return self._call("create", obj["kind"], self.transport.create, obj)
+
+    def replace(self, obj):
+        return self._call("replace", obj["kind"], self.transport.replace, obj)
+
+    def create_many(self, objs):
+        kind = objs[0]["kind"] if objs else None
+        return self._call("create_many", kind, self.transport.create_many, objs)
+
+    def patch(self, kind, namespace, name, patch):
+        return self._call(
+            "patch", kind, self.transport.patch, kind, namespace, name, patch
+        )
+
+    def delete(self, kind, namespace, name):
+        return self._call("delete", kind, self.transport.delete, kind, namespace, name)
+
+    def watch(self, kind, namespace, resource_version=None, name=None, timeout=None):
+        return self._call(
+            "watch",
+            kind,
+            self.transport.watch,
+            kind,
+            namespace,
+            resource_version,
+            name,
+            timeout,
+        )
+
+    def _call(self, verb, kind, func, *args):
+        reset_payload_size()
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._instrumentation.report(
+                "transport", verb, kind, time.perf_counter() - start, payload_size()
+            )
+
+
+class InstrumentedRest:
+    """3scale RestApiClient which reports every request."""
+
+    def __init__(self, rest, instrumentation):
+        self.rest = rest
+        self._instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        return getattr(self.rest, name)
+
+    def request(self, method="GET", url=None, path="", **kwargs):
+        """Sends request by wrapped client and reports it."""
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.rest.request(method, url=url, path=path, **kwargs)
+            return response
+        finally:
+            size = len(response.content) if response is not None else 0
+            self._instrumentation.report(
+                "rest",
+                method,
+                InstrumentedRest.kind(url or path),
+                time.perf_counter() - start,
+                size,
+            )
+
+    @staticmethod
+    def kind(url):
+        """Returns REST collection of url without ids, e.g. 'services/metrics'."""
+        path = urlparse(url).path
+        if path.startswith("/admin/api/"):
+            path = path[len("/admin/api/"):]
+        return "/".join(seg for seg in path.split("/") if seg and not seg.isdigit())
+
+    def get(self, *args, **kwargs):
+        """GET request"""
+        return self.request("GET", *args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        """POST request"""
+        return self.request("POST", *args, **kwargs)
+
+    def put(self, *args, **kwargs):
+        """PUT request"""
+        return self.request("PUT", *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """DELETE request"""
+        return self.request("DELETE", *args, **kwargs)
+
+    def patch(self, *args, **kwargs):
+        """PATCH request"""
+        return self.request("PATCH", *args, **kwargs)
@@ -0,0 +1,24 @@
+""" Module with lazy import of heavy dependencies """
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module which is imported on first access of its attribute, e.g.
+    `ocp = LazyModule("openshift_client")` does not import openshift_client
+    until `ocp.APIObject` is used.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            # import_module is serialized by import lock
+            module = importlib.import_module(self.__name__)
+            self._module = module
+        return getattr(module, attr)
@@ -0,0 +1,124 @@
+""" Module with loader of OpenAPI documents referenced by CRDs """
+
+import base64
+import collections
+import json
+import threading
+
+from threescale_api_crd.lazy import LazyModule
+
+yaml = LazyModule("yaml")
+
+
+class OpenApiLoader:
+    """
+    Loads OpenAPI documents referenced by ActiveDoc and OpenAPI CRDs.
+    Documents referenced by url are downloaded by pooled session with
+    conditional requests (ETag, Last-Modified). Loaded documents are cached
+    by url and its validator or by secret and its resourceVersion, cache is
+    bounded by size of documents and least recently used are evicted.
+    """
+
+    MAX_BYTES = 64 * 1024 * 1024
+    TIMEOUT = 30
+
+    def __init__(self, session=None, max_bytes=MAX_BYTES, timeout=TIMEOUT):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.stats = collections.Counter()
+        self._session = session
+        self._bodies = collections.OrderedDict()
+        self._size = 0
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    def from_url(self, url):
+        """Returns document referenced by url, yaml is converted to json."""
+        with self._lock:
+            if self._session is None:
+                # requests are imported on first download, not by import of the client
+                import requests  # pylint: disable=import-outside-toplevel
+
+                self._session = requests.Session()
+            validator = self._validators.get(url)
+        headers = {}
+        if validator:
+            headers[validator[0]] = validator[1]
+        res = self._session.get(url, headers=headers, timeout=self.timeout)
+        self.stats["downloads"] += 1
+        if res.status_code == 304 and validator:
+            body = self._get(("url", url, validator))
+            if body is not None:
+                return body
+            res = self._session.get(url, timeout=self.timeout)
+            self.stats["downloads"] += 1
+        # error page is neither parsed nor cached as document
+        res.raise_for_status()
+        body = OpenApiLoader.parse(url, res.content)
+        validator = OpenApiLoader._validator(res)
+        if validator and self._put(("url", url, validator), body):
+            with self._lock:
+                self._validators[url] = validator
+        return body
+
+    def from_secret(self, transport, namespace, name):
+        """Returns document stored in secret."""
+        secret = transport.get("Secret", namespace, name)
+        key = ("secret", namespace, name, secret["metadata"].get("resourceVersion"))
+        body = self._get(key)
+        if body is None:
+            enc_body = list(secret["data"].values())[0]
+            body = base64.b64decode(enc_body).decode("ascii")
+            self._put(key, body)
+        return body
+
+    def clear(self):
+        """Drops all cached documents."""
+        with self._lock:
+            self._bodies.clear()
+            self._validators.clear()
+            self._size = 0
+
+    @staticmethod
+    def parse(url, content):
+        """Returns body of document, yaml is converted to json."""
+        if url.endswith(".yaml") or url.endswith(".yml"):
+            return json.dumps(yaml.load(content, Loader=yaml.SafeLoader))
+        return content
+
+    @staticmethod
+    def _validator(res):
+        if res.headers.get("ETag"):
+            return ("If-None-Match", res.headers["ETag"])
+        if res.headers.get("Last-Modified"):
+            return ("If-Modified-Since", res.headers["Last-Modified"])
+        return None
+
+    def _get(self, key):
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is None:
+                self.stats["misses"] += 1
+                return None
+            self._bodies.move_to_end(key)
+            self.stats["hits"] += 1
+            return body
+
+    def _put(self, key, body):
+        """Stores body, returns False if body is bigger than the cache."""
+        size = len(body)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._bodies.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._bodies[key] = body
+            self._size += size
+            while self._size > self.max_bytes:
+                old_key, old = self._bodies.popitem(last=False)
+                self._size -= len(old)
+                self.stats["evictions"] += 1
+                if old_key[0] == "url" and self._validators.get(old_key[1]) == old_key[2]:
+                    del self._validators[old_key[1]]
+        return True
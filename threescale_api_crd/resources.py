@@ -1,17 +1,13 @@
 """ Module with resources for CRD for Threescale client """
 
+import functools
+import hashlib
 import logging
-import copy
-import json
 import base64
 import string
 import os
 import secrets
 import random
-import yaml
-import requests
-import openshift_client as ocp
-import time
 
 import threescale_api
 import threescale_api.resources
@@ -69,7 +65,7 @@ class Services(DefaultClientCRD, threescale_api.resources.Services):
         #    resource.entity['deployment'][key]['authentication'] = \
         #    constants.SERVICE_AUTH_DEFS[new_params['backend_version']]
 
-    @property
+    @functools.cached_property
     def metrics(self) -> "Metrics":
         """Returns metrics related to service/product."""
         return Metrics(parent=self, instance_klass=Metric)
@@ -245,11 +241,37 @@ class Backends(DefaultClientCRD, threescale_api.resources.Backends):
     def before_update(self, new_params, resource):
         """Called before update."""
 
-    @property
+    @functools.cached_property
     def metrics(self) -> "BackendMetrics":
         """Returns metrics related to this backend."""
         return BackendMetrics(parent=self, instance_klass=BackendMetric)
 
+    def mark_crd_changed(self, obj_name, version=None):
+        super().mark_crd_changed(obj_name, version)
+        self.threescale_client.name_id_map(self.SELECTOR).invalidate()
+
+    def id_by_name(self, name):
+        """Returns id of backend with 'name' or None."""
+        return self.threescale_client.name_id_map(self.SELECTOR).id_by_name(self, name)
+
+    def name_by_id(self, backend_id):
+        """Returns name of backend with 'backend_id' or None."""
+        return self.threescale_client.name_id_map(self.SELECTOR).name_by_id(
+            self, backend_id
+        )
+
+    def metric_id(self, backend_name, metric_name):
+        """
+        Returns id of metric 'metric_name' of backend 'backend_name' or None.
+        Backend CRD is taken from name-id map, it is not read again.
+        """
+        crd = self.threescale_client.name_id_map(self.SELECTOR).crd_by_name(
+            self, backend_name
+        )
+        if crd is None:
+            return None
+        return self._create_instance(response=[crd])[0].metrics.metric_id(metric_name)
+
 
 class MappingRules(DefaultClientNestedCRD, threescale_api.resources.MappingRules):
     """
@@ -456,14 +478,14 @@ class ActiveDocs(DefaultClientCRD, threescale_api.resources.ActiveDocs):
         """Called before create."""
         if "service_id" in params.keys():
             ide = int(params.pop("service_id"))
-            sys_name = Service.id_to_system_name.get(ide, None)
+            sys_name = self.threescale_client.identity_cache.get_name("Service", ide)
             if not sys_name:
                 sys_name = self.parent.services.read(ide)["system_name"]
             spec["spec"]["productSystemName"] = sys_name
         if "body" in params.keys():
             params["secret-name"] = params["name"] + "secret"
             OpenApiRef.create_secret_if_needed(
-                params, self.threescale_client.ocp_namespace
+                params, self.threescale_client.ocp_namespace, self.transport
             )
             spec["spec"]["activeDocOpenAPIRef"] = {}
             spec["spec"]["activeDocOpenAPIRef"]["secretRef"] = {}
@@ -475,7 +497,7 @@ class ActiveDocs(DefaultClientCRD, threescale_api.resources.ActiveDocs):
         """Called before update."""
         if "service_id" in new_params.keys():
             ide = int(new_params.pop("service_id"))
-            sys_name = Service.id_to_system_name.get(ide, None)
+            sys_name = self.threescale_client.identity_cache.get_name("Service", ide)
             if not sys_name:
                 sys_name = self.parent.services.read(ide)["system_name"]
             new_params[self.KEYS["service_id"]] = sys_name
@@ -483,7 +505,7 @@ class ActiveDocs(DefaultClientCRD, threescale_api.resources.ActiveDocs):
             if "secret-name" not in new_params:
                 new_params["secret-name"] = new_params["name"] + "secret"
             OpenApiRef.create_secret_if_needed(
-                new_params, self.threescale_client.ocp_namespace
+                new_params, self.threescale_client.ocp_namespace, self.transport
             )
             new_params["activeDocOpenAPIRef"] = {}
             new_params["activeDocOpenAPIRef"]["secretRef"] = {}
@@ -586,6 +608,33 @@ class Metrics(DefaultClientNestedCRD, threescale_api.resources.Metrics):
         """Returns list of entities."""
         return self.parent.metrics.list()
 
+    def metric_id(self, name):
+        """
+        Returns 3scale id of metric 'name' of the parent. Ids of metrics
+        are not in CRD, ids of all metrics of the parent are read by one
+        REST request and kept in identity cache.
+        """
+        cache = self.threescale_client.identity_cache
+        owner = (self.SELECTOR, self.parent.crd.name())
+        ide = cache.get_id("Metric", name, scope=owner)
+        if ide is None:
+            ids = self.read_metric_ids()
+            for metric_name, metric_id in ids.items():
+                cache.put("Metric", metric_name, metric_id, owner=owner, scope=owner)
+            ide = ids.get(name)
+        return ide
+
+    def read_metric_ids(self):
+        """Reads ids of all metrics of the parent by REST API."""
+        return {
+            self.metric_name(metric["system_name"]): int(metric["id"])
+            for metric in self.rest_list()
+        }
+
+    def metric_name(self, system_name):
+        """Returns system name of metric in CRD from system name in REST API."""
+        return system_name
+
     def in_create(self, maps, params, spec):
         """Do steps to create new instance"""
         name = params.pop(
@@ -656,6 +705,13 @@ class BackendMetrics(Metrics, threescale_api.resources.BackendMetrics):
             **kwargs,
         )
 
+    def metric_name(self, system_name):
+        """System name of backend metric in REST API has backend id suffix."""
+        suffix = "." + str(self.parent["id"])
+        if system_name.endswith(suffix):
+            return system_name[: -len(suffix)]
+        return system_name
+
 
 class BackendUsages(DefaultClientNestedCRD, threescale_api.resources.BackendUsages):
     """
@@ -707,9 +763,7 @@ class BackendUsages(DefaultClientNestedCRD, threescale_api.resources.BackendUsag
     def in_create(self, maps, params, spec):
         """Do steps to create new instance"""
         backend_id = spec["spec"].pop("backend_id")
-        back = self.parent.parent.backends.read(int(backend_id))
-
-        maps[back[BackendUsages.ID_NAME]] = spec["spec"]
+        maps[self._backend_name(backend_id)] = spec["spec"]
         self.parent.read()
         self.parent.update({"backend_usages": maps})
         params.pop("name", None)
@@ -726,8 +780,7 @@ class BackendUsages(DefaultClientNestedCRD, threescale_api.resources.BackendUsag
         """Modify some details in data before updating the list"""
         backend_id = spec.pop("backend_id")
         spec.pop("service_id")
-        back = self.threescale_client.backends.read(int(backend_id))
-        maps[back[BackendUsages.ID_NAME]] = spec
+        maps[self._backend_name(backend_id)] = spec
         return maps
 
     def update_list(self, maps):
@@ -742,11 +795,18 @@ class BackendUsages(DefaultClientNestedCRD, threescale_api.resources.BackendUsag
         for mapi in mapis:
             map_ret = self.translate_to_crd(mapi.entity)
             if map_ret != spec:
-                backend_id = mapi["backend_id"]
-                back = self.parent.parent.backends.read(int(backend_id))
-                maps[back[BackendUsages.ID_NAME]] = map_ret
+                maps[self._backend_name(mapi["backend_id"])] = map_ret
         return maps
 
+    def _backend_name(self, backend_id):
+        """Returns name of backend used as key of backend usages in CRD."""
+        name = self.threescale_client.backends.name_by_id(backend_id)
+        if name is None:
+            raise threescale_api.errors.ThreeScaleApiError(
+                message=f"Backend {backend_id} does not exist"
+            )
+        return name
+
     def topmost_parent(self):
         """
         Returns topmost parent. In most cases it is the same as parent
@@ -1003,13 +1063,42 @@ class Accounts(DefaultClientCRD, threescale_api.resources.Accounts):
     def before_create(self, params, spec):
         """Called before create."""
         if "username" in params:
-            pars = params.copy()
-            pars["account_name"] = pars["name"]
-            pars["name"] = secrets.token_urlsafe(8)
-            # first user should be admin
-            pars["role"] = "admin"
+            pars = Accounts.admin_params(params)
             self.parent.threescale_client.account_users.create(params=pars)
 
+    @staticmethod
+    def admin_params(params):
+        """Returns params of admin user of new account."""
+        pars = params.copy()
+        pars["account_name"] = DefaultClientCRD.normalize(pars["name"])
+        pars["name"] = secrets.token_urlsafe(8)
+        # first user should be admin
+        pars["role"] = "admin"
+        return pars
+
+    def create_many(self, params_list):
+        """Admin users of all accounts are created together before accounts."""
+        if not self.is_crd_implemented():
+            return super().create_many(params_list)
+        results = [None] * len(params_list)
+        admins = [i for i, params in enumerate(params_list) if "username" in params]
+        users = self.threescale_client.account_users.create_many(
+            [Accounts.admin_params(params_list[i]) for i in admins]
+        )
+        for i, user in zip(admins, users):
+            if isinstance(user, Exception):
+                results[i] = user
+        todo = [i for i, result in enumerate(results) if result is None]
+        accounts = super().create_many(
+            [
+                {key: value for key, value in params_list[i].items() if key != "username"}
+                for i in todo
+            ]
+        )
+        for i, account in zip(todo, accounts):
+            results[i] = account
+        return results
+
     def before_update(self, new_params, resource):
         """Called before update."""
 
@@ -1040,7 +1129,10 @@ class AccountUsers(DefaultClientCRD, threescale_api.resources.AccountUsers):
         """Called before create."""
         password = params.get("password", secrets.token_urlsafe(8))
         password_name = AccountUser.create_password_secret(
-            password, self.threescale_client.ocp_namespace
+            password,
+            self.threescale_client.ocp_namespace,
+            self.transport,
+            name=AccountUser.password_secret_name(params["account_name"], params["username"]),
         )
         spec["spec"]["passwordCredentialsRef"]["name"] = password_name
         spec["spec"]["developerAccountRef"]["name"] = params["account_name"]
@@ -1103,7 +1195,7 @@ class OpenApis(DefaultClientCRD, threescale_api.defaults.DefaultClient):
                 params["name"] = DefaultClientCRD.normalize(joined_name)
             params["secret-name"] = params["name"] + "secret"
             OpenApiRef.create_secret_if_needed(
-                params, self.threescale_client.ocp_namespace
+                params, self.threescale_client.ocp_namespace, self.transport
             )
             spec["spec"]["openapiRef"] = {}
             spec["spec"]["openapiRef"]["secretRef"] = {}
@@ -1121,7 +1213,7 @@ class OpenApis(DefaultClientCRD, threescale_api.defaults.DefaultClient):
                 )
             new_params["secret-name"] = new_params["name"] + "secret"
             OpenApiRef.create_secret_if_needed(
-                new_params, self.threescale_client.ocp_namespace
+                new_params, self.threescale_client.ocp_namespace, self.transport
             )
             new_params["openapiRef"] = {}
             new_params["openapiRef"]["secretRef"] = {}
@@ -1217,7 +1309,10 @@ class Tenants(DefaultClientCRD, threescale_api.resources.Tenants):
         mast_sec_name = params["username"] + "mastsec"
         mas_params = {"MASTER_ACCESS_TOKEN": self.threescale_client.token}
         Tenants.create_secret(
-            mast_sec_name, self.threescale_client.ocp_namespace, mas_params
+            mast_sec_name,
+            self.threescale_client.ocp_namespace,
+            mas_params,
+            self.transport,
         )
         spec["spec"]["masterCredentialsRef"]["name"] = mast_sec_name
         # create tenant admin secret
@@ -1229,7 +1324,10 @@ class Tenants(DefaultClientCRD, threescale_api.resources.Tenants):
             )
         }
         Tenants.create_secret(
-            admin_sec_name, self.threescale_client.ocp_namespace, admin_params
+            admin_sec_name,
+            self.threescale_client.ocp_namespace,
+            admin_params,
+            self.transport,
         )
         spec["spec"]["passwordCredentialsRef"]["name"] = admin_sec_name
 
@@ -1251,17 +1349,9 @@ class Tenants(DefaultClientCRD, threescale_api.resources.Tenants):
         new_params.update(new_pars)
 
     @staticmethod
-    def create_secret(name, namespace, params):
+    def create_secret(name, namespace, params, transport):
         """Creates secret if it is needed"""
-        spec_sec = copy.deepcopy(constants.SPEC_SECRET)
-        spec_sec["metadata"]["name"] = name
-        spec_sec["metadata"]["namespace"] = namespace
-        for key, value in params.items():
-            spec_sec["data"][key] = base64.b64encode(str(value).encode("ascii")).decode(
-                "ascii"
-            )
-        result = ocp.create(spec_sec)
-        assert result.status() == 0
+        transport.apply_secret(namespace, name, params)
 
     def read(self, entity_id, **kwargs):
         return DefaultClientCRD.fetch(self, entity_id, **kwargs)
@@ -1276,7 +1366,27 @@ class Tenants(DefaultClientCRD, threescale_api.resources.Tenants):
         )
 
 
-class Limits(DefaultClientNestedCRD, threescale_api.resources.Limits):
+class MetricRefs:
+    """
+    Client of items of application plan which refer to metric of product
+    or backend by 'metricMethodRef', i.e. limits and pricing rules.
+    """
+
+    def metric_name(self, params):
+        """Returns system name of metric of limit or pricing rule in 'params'."""
+        if "metric_name" in params:
+            return params["metric_name"]
+        name = self.threescale_client.identity_cache.get_name("Metric", params["metric_id"])
+        return name or self.metric[Metrics.ID_NAME]
+
+    def metric_ref_id(self, ref):
+        """Returns id of metric referred by 'metricMethodRef' in CRD."""
+        if "backend" in ref:
+            return self.threescale_client.backends.metric_id(ref["backend"], ref["systemName"])
+        return self.topmost_parent().metrics.metric_id(ref["systemName"])
+
+
+class Limits(MetricRefs, DefaultClientNestedCRD, threescale_api.resources.Limits):
     """CRD client for Limits."""
 
     CRD_IMPLEMENTED = True
@@ -1331,11 +1441,11 @@ class Limits(DefaultClientNestedCRD, threescale_api.resources.Limits):
 
     def in_create(self, maps, params, spec):
         """Do steps to create new instance"""
-        maps = Limits.insert_to_list(maps, params, spec)
+        maps = self.insert_to_list(maps, params, spec)
         self.parent.read()
         self.parent.update({"limits": maps})
         maps = self.get_list(typ="normal")
-        return Limits.get_from_list(maps, params, spec)
+        return self.get_from_list(maps, params, spec)
 
     def get_list_from_spec(self):
         """Returns list from spec"""
@@ -1368,21 +1478,14 @@ class Limits(DefaultClientNestedCRD, threescale_api.resources.Limits):
         """
         return self.parent.parent
 
-    @staticmethod
-    def insert_to_list(maps, params, spec):
+    def insert_to_list(self, maps, params, spec):
         """
         It inserts limit into the list of limits. There can be none or one combination
         of app_plan x metric x period.
         """
         ret = []
+        metric_name = self.metric_name(params)
         for obj in maps:
-            metric_name = ""
-            if "metric_name" in params:
-                metric_name = params["metric_name"]
-            elif "backend" in obj["metricMethodRef"]:
-                metric_name = BackendMetric.id_to_system_name[params["metric_id"]]
-            else:
-                metric_name = Metric.id_to_system_name[params["metric_id"]]
             if (
                 obj["period"] != params["period"]
                 or obj["metricMethodRef"]["systemName"] != metric_name
@@ -1392,21 +1495,14 @@ class Limits(DefaultClientNestedCRD, threescale_api.resources.Limits):
         ret.append(spec["spec"])
         return ret
 
-    @staticmethod
-    def get_from_list(maps, params, spec):
+    def get_from_list(self, maps, params, spec):
         """
         It gets limit from the list of limits. There can be none or one combination
         of app_plan x metric x period.
         """
         ret = []
+        metric_name = self.metric_name(params)
         for obj in maps:
-            metric_name = ""
-            if "metric_name" in params:
-                metric_name = params["metric_name"]
-            elif "backend" in obj["metricMethodRef"]:
-                metric_name = BackendMetric.id_to_system_name[params["metric_id"]]
-            else:
-                metric_name = Metric.id_to_system_name[params["metric_id"]]
             if (
                 obj["period"] == params["period"]
                 and obj["metricMethodRef"]["systemName"] == metric_name
@@ -1462,7 +1558,7 @@ class Limits(DefaultClientNestedCRD, threescale_api.resources.Limits):
             return [obj for obj in instance]
 
 
-class PricingRules(DefaultClientNestedCRD, threescale_api.resources.PricingRules):
+class PricingRules(MetricRefs, DefaultClientNestedCRD, threescale_api.resources.PricingRules):
     """CRD client for PricingRules."""
 
     CRD_IMPLEMENTED = True
@@ -1522,11 +1618,11 @@ class PricingRules(DefaultClientNestedCRD, threescale_api.resources.PricingRules
 
     def in_create(self, maps, params, spec):
         """Do steps to create new instance"""
-        maps = PricingRules.insert_to_list(maps, params, spec)
+        maps = self.insert_to_list(maps, params, spec)
         self.parent.read()
         self.parent.update({"pricingRules": maps})
         maps = self.get_list(typ="normal")
-        return PricingRules.get_from_list(maps, params, spec)
+        return self.get_from_list(maps, params, spec)
 
     def get_list_from_spec(self):
         """Returns list from spec"""
@@ -1537,7 +1633,7 @@ class PricingRules(DefaultClientNestedCRD, threescale_api.resources.PricingRules
     def before_update_list(self, maps, new_params, spec, resource):
         """Modify some details in data before updating the list"""
         spec = self.translate_to_crd(new_params)
-        return PricingRules.insert_to_list(maps, new_params, {"spec": spec})
+        return self.insert_to_list(maps, new_params, {"spec": spec})
 
     def update_list(self, maps):
         """Returns updated list."""
@@ -1560,21 +1656,14 @@ class PricingRules(DefaultClientNestedCRD, threescale_api.resources.PricingRules
         """
         return self.parent.parent
 
-    @staticmethod
-    def insert_to_list(maps, params, spec):
+    def insert_to_list(self, maps, params, spec):
         """
         It inserts limit into the list of limits. There can be none or one combination
         of app_plan x metric x period.
         """
         ret = []
+        metric_name = self.metric_name(params)
         for obj in maps:
-            metric_name = ""
-            if "metric_name" in params:
-                metric_name = params["metric_name"]
-            elif "backend" in obj["metricMethodRef"]:
-                metric_name = BackendMetric.id_to_system_name[params["metric_id"]]
-            else:
-                metric_name = Metric.id_to_system_name[params["metric_id"]]
             if (
                 obj["from"] != params["min"]
                 or obj["to"] != params["max"]
@@ -1585,21 +1674,14 @@ class PricingRules(DefaultClientNestedCRD, threescale_api.resources.PricingRules
         ret.append(spec["spec"])
         return ret
 
-    @staticmethod
-    def get_from_list(maps, params, spec):
+    def get_from_list(self, maps, params, spec):
         """
         It gets limit from the list of limits. There can be none or one combination
         of app_plan x metric x period.
         """
         ret = []
+        metric_name = self.metric_name(params)
         for obj in maps:
-            metric_name = ""
-            if "metric_name" in params:
-                metric_name = params["metric_name"]
-            elif "backend" in obj["metricMethodRef"]:
-                metric_name = BackendMetric.id_to_system_name[params["metric_id"]]
-            else:
-                metric_name = Metric.id_to_system_name[params["metric_id"]]
             if (
                 obj["min"] == params["min"]
                 and obj["max"] == params["max"]
@@ -1671,6 +1753,9 @@ class Applications(DefaultClientCRD, threescale_api.resources.Applications):
     KEYS = constants.KEYS_APPLICATION
     SELECTOR = "Application"
     ID_NAME = "applicationID"
+    STATE_TIMEOUT = 240
+    # state: (spec.suspend, status.state)
+    STATES = {"suspend": (True, "suspended"), "resume": (False, "live")}
 
     def __init__(
         self,
@@ -1722,6 +1807,49 @@ class Applications(DefaultClientCRD, threescale_api.resources.Applications):
             and obj.as_dict()["status"]["conditions"][0]["status"] == "True"
         )
 
+    @staticmethod
+    def crd_state(obj):
+        """Returns state of application in CRD status."""
+        return (obj.as_dict().get("status") or {}).get("state")
+
+    def set_state_many(self, apps: list, state: str) -> list:
+        """
+        Sets the state of many applications and waits for all of them together.
+        Returns applications in order of 'apps', item of failed
+        application is the exception.
+        """
+        if state not in Applications.STATES:
+            return list(apps)
+        suspend, status = Applications.STATES[state]
+
+        def update(app):
+            try:
+                return app.update({"suspend": suspend})
+            except Exception as err:  # pylint: disable=broad-except
+                return err
+
+        results = list(self.threescale_client.executor.map(update, apps))
+        updated = [app for app in results if not isinstance(app, Exception)]
+        # changes made by operator after the oldest update are watched, CRDs are not read again
+        version = self.oldest_version(self.crd_version(app.crd) for app in updated)
+        changed = self.wait_for_many(
+            [app.crd.name() for app in updated],
+            lambda obj: Applications.crd_state(obj) == status,
+            version=version,
+            timeout=self.STATE_TIMEOUT,
+            failed=self._is_failed,
+        )
+        for i, app in enumerate(results):
+            if isinstance(app, Exception):
+                continue
+            obj = changed[app.crd.name()]
+            if isinstance(obj, Exception):
+                results[i] = obj
+            else:
+                app.crd.model = obj.model
+                app.entity["state"] = status
+        return results
+
     def trans_item(self, key, value, obj):
         """Translate entity to CRD."""
         if key in ["service_name", "account_name"]:
@@ -1729,6 +1857,53 @@ class Applications(DefaultClientCRD, threescale_api.resources.Applications):
         else:
             return obj[key]
 
+    def _create_instance_trans(self, instance):
+        # keys of listed applications are loaded together
+        group = [app for app in instance if app.keys_group is not None]
+        for app in group:
+            app.keys_group = group
+        return instance
+
+    def load_keys(self, apps):
+        """
+        Loads auth keys of applications. Applications of one account are
+        read by one REST request, auth of product is read once per product.
+        """
+        apps = [app for app in apps if app.keys_group is not None]
+        # entity of application does not load keys again while they are loaded
+        for app in apps:
+            app.keys_group = None
+        try:
+            by_account = {}
+            for app in apps:
+                by_account.setdefault(app.entity["account_name"], []).append(app)
+            auths = {}
+            for account_apps in by_account.values():
+                client = account_apps[0].account.applications
+                rest_apps = {app["id"]: app for app in client.rest_list()}
+                for app in account_apps:
+                    service_name = app.entity["service_name"]
+                    if service_name not in auths:
+                        service = self.parent.services.read_by_name(service_name)
+                        auths[service_name] = service["backend_version"]
+                    Applications._set_keys(
+                        app.entity, rest_apps.get(app.entity["id"], {}), auths[service_name]
+                    )
+        except Exception:
+            for app in apps:
+                app.keys_group = apps
+            raise
+
+    @staticmethod
+    def _set_keys(entity, rest_entity, auth):
+        if auth == Service.AUTH_USER_KEY:
+            entity["user_key"] = rest_entity.get("user_key")
+        elif auth == Service.AUTH_APP_ID_KEY:
+            entity["application_id"] = rest_entity.get("application_id")
+        elif auth == Service.AUTH_OIDC:
+            entity["client_id"] = rest_entity.get("client_id")
+            entity["client_secret"] = rest_entity.get("client_secret")
+
 
 class Methods(DefaultClientNestedCRD, threescale_api.resources.Methods):
     """Method client class"""
@@ -1830,8 +2005,6 @@ class Service(DefaultResourceCRD, threescale_api.resources.Service):
     """
 
     GET_PATH = "spec"
-    system_name_to_id = {}
-    id_to_system_name = {}
 
     def __init__(self, entity_name="system_name", **kwargs):
         entity = None
@@ -1839,15 +2012,18 @@ class Service(DefaultResourceCRD, threescale_api.resources.Service):
             entity = {}
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_SERVICE.items():
-                    if key == walue:
-                        entity[cey] = value
-            entity["id"] = crd.as_dict().get("status").get(Services.ID_NAME)
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_SERVICE)
+            )
+            entity["id"] = (crd.as_dict().get("status") or {}).get(Services.ID_NAME)
             # add ids to cache
             if entity["id"] and entity[entity_name]:
-                Service.id_to_system_name[int(entity["id"])] = entity[entity_name]
-                Service.system_name_to_id[entity[entity_name]] = int(entity["id"])
+                kwargs["client"].threescale_client.identity_cache.put(
+                    "Service",
+                    entity[entity_name],
+                    int(entity["id"]),
+                    owner=(Services.SELECTOR, crd.name()),
+                )
             auth = crd.model.spec.get("deployment", None)
             # TODO add better authentication work
             if auth:
@@ -1861,27 +2037,27 @@ class Service(DefaultResourceCRD, threescale_api.resources.Service):
             # to creater empty object without any data. This is related to "lazy load"
             super().__init__(entity_name=entity_name, **kwargs)
 
-    @property
+    @functools.cached_property
     def mapping_rules(self) -> "MappingRules":
         return MappingRules(instance_klass=MappingRule, parent=self)
 
-    @property
+    @functools.cached_property
     def proxy(self) -> "Proxies":
         return Proxies(parent=self, instance_klass=Proxy)
 
-    @property
+    @functools.cached_property
     def policies_registry(self) -> "PoliciesRegistry":
         return PoliciesRegistry(parent=self, instance_klass=PoliciesRegistry)
 
-    @property
+    @functools.cached_property
     def metrics(self) -> "Metrics":
         return Metrics(instance_klass=Metric, parent=self)
 
-    @property
+    @functools.cached_property
     def backend_usages(self) -> "BackendUsages":
         return BackendUsages(instance_klass=BackendUsage, parent=self)
 
-    @property
+    @functools.cached_property
     def app_plans(self) -> "ApplicationPlans":
         return ApplicationPlans(instance_klass=ApplicationPlan, parent=self)
 
@@ -1905,7 +2081,7 @@ class Proxy(DefaultResourceCRD, threescale_api.resources.Proxy):
             self.spec_path = []
             entity = {}
             # there is no attribute which can simulate Proxy id, service id should be used
-            entity["id"] = crd.as_dict().get("status").get(Services.ID_NAME)
+            entity["id"] = (crd.as_dict().get("status") or {}).get(Services.ID_NAME)
             # apicastHosted or ApicastSelfManaged
             if len(spec.values()):
                 apicast_key = list(spec.keys())[0]
@@ -1916,10 +2092,9 @@ class Proxy(DefaultResourceCRD, threescale_api.resources.Proxy):
                 self.spec_path.append(apicast_key)
                 spec = spec.get(apicast_key, {})
                 # add endpoint and sandbox_endpoint
-                for key, value in spec.items():
-                    for cey, walue in constants.KEYS_PROXY.items():
-                        if key == walue:
-                            entity[cey] = value
+                entity.update(
+                    DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_PROXY)
+                )
 
                 spec = spec.get("authentication", {})
                 self.spec_path.append("authentication")
@@ -1928,31 +2103,31 @@ class Proxy(DefaultResourceCRD, threescale_api.resources.Proxy):
                     self.spec_path.append(list(spec.keys())[0])
                     spec = list(spec.values())[0]
                     # add credentials_location
-                    for key, value in spec.items():
-                        if key == "authenticationFlow":
-                            for key2, value2 in spec[key].items():
-                                for cey, walue in constants.KEYS_OIDC.items():
-                                    if key2 == walue:
-                                        self.oidc["oidc_configuration"][cey] = value2
-                        else:
-                            for cey, walue in constants.KEYS_PROXY.items():
-                                if key == walue:
-                                    entity[cey] = value
+                    entity.update(
+                        DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_PROXY)
+                    )
+                    self.oidc["oidc_configuration"].update(
+                        DefaultResourceCRD.translate_from_crd(
+                            spec.get("authenticationFlow", {}), constants.CRD_KEYS_OIDC
+                        )
+                    )
 
                     secret = spec.get("security", {})
                     if secret:
                         self.secret = True
-                    for key, value in secret.items():
-                        for cey, walue in constants.KEYS_PROXY_SECURITY.items():
-                            if key == walue:
-                                entity[cey] = value
+                    entity.update(
+                        DefaultResourceCRD.translate_from_crd(
+                            secret, constants.CRD_KEYS_PROXY_SECURITY
+                        )
+                    )
                     spec = spec.get("gatewayResponse", {})
                     if spec:
                         self.responses = True
-                        for key, value in spec.items():
-                            for cey, walue in constants.KEYS_PROXY_RESPONSES.items():
-                                if key == walue:
-                                    entity[cey] = value
+                        entity.update(
+                            DefaultResourceCRD.translate_from_crd(
+                                spec, constants.CRD_KEYS_PROXY_RESPONSES
+                            )
+                        )
 
             super().__init__(crd=crd, entity=entity, **kwargs)
 
@@ -1969,13 +2144,9 @@ class Proxy(DefaultResourceCRD, threescale_api.resources.Proxy):
                 "api_test_path"
             ]
             if any([att not in entity for att in required_attrs]):
-                self.client.disable_crd_implemented()
-                self.parent.client.disable_crd_implemented()
-                tmp_proxy = self.parent.proxy.fetch()
+                tmp_proxy = self.parent.proxy.rest_fetch()
                 for name in required_attrs:
                     self.entity[name] = tmp_proxy[name]
-                self.client.enable_crd_implemented()
-                self.parent.client.enable_crd_implemented()
         else:
             # this is not here because of some backup, but because we need to have option
             # to creater empty object without any data. This is related to "lazy load"
@@ -2023,7 +2194,7 @@ class Proxy(DefaultResourceCRD, threescale_api.resources.Proxy):
     def mapping_rules(self) -> MappingRules:
         return self.parent.mapping_rules
 
-    @property
+    @functools.cached_property
     def policies(self) -> "Policies":
         return Policies(parent=self.parent, instance_klass=Policy)
 
@@ -2073,10 +2244,9 @@ class MappingRule(DefaultResourceCRD, threescale_api.resources.MappingRule):
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_MAPPING_RULE.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_MAPPING_RULE)
+            )
             # simulate entity_id by list of attributes
             entity["id"] = (entity["http_method"], entity["pattern"])
             self.entity_id = entity.get("id")
@@ -2135,7 +2305,7 @@ class OpenApiRef:
     """Open API reference."""
 
     @staticmethod
-    def load_openapi(entity, spec):
+    def load_openapi(entity, spec, client):
         """
         if OAS is referenced by url:
         1) OAS is loaded to body
@@ -2146,45 +2316,59 @@ class OpenApiRef:
         1) OAS is loaded from secret and stored into body
         2) when body is updated, secret is changed
         """
-
+        loader = client.threescale_client.openapi_loader
         if "url" in spec:
-            url = spec["url"]
-            entity["url"] = url
-            res = requests.get(url)
-            if url.endswith(".yaml") or url.endswith(".yml"):
-                entity["body"] = json.dumps(
-                    yaml.load(res.content, Loader=yaml.SafeLoader)
-                )
-            else:
-                entity["body"] = res.content
+            entity["url"] = spec["url"]
+            entity["body"] = loader.from_url(spec["url"])
         elif "secretRef" in spec:
-            secret_name = spec["secretRef"]["name"]
-            secret = ocp.selector("secret/" + secret_name).objects()[0]
-            enc_body = list(secret.as_dict()["data"].values())[0]
-            entity["body"] = base64.b64decode(enc_body).decode("ascii")
+            entity["body"] = loader.from_secret(
+                client.transport,
+                client.threescale_client.ocp_namespace,
+                spec["secretRef"]["name"],
+            )
 
     @staticmethod
-    def create_secret_if_needed(params, namespace):
-        """Creates secret for tenant."""
-        body_ascii = str(params["body"]).encode("ascii")
-        body_enc = base64.b64encode(body_ascii)
-        spec_sec = copy.deepcopy(constants.SPEC_SECRET)
-        spec_sec["metadata"]["name"] = params["secret-name"]
-        spec_sec["metadata"]["namespace"] = namespace
-        spec_sec["data"][params["secret-name"]] = body_enc.decode("ascii")
-        result = ocp.selector("secret/" + params["secret-name"])
-        if result.status() == 0:
-            objs = result.objects()
-            if objs:
-                objs[0].delete()
-        result = ocp.create(spec_sec)
-        assert result.status() == 0
+    def create_secret_if_needed(params, namespace, transport):
+        """Creates or updates secret with OAS, secret is not written if OAS is not changed."""
+        transport.apply_secret(
+            namespace, params["secret-name"], {params["secret-name"]: params["body"]}
+        )
         if "url" in params:
             del params["url"]
         del params["body"]
 
 
-class ActiveDoc(DefaultResourceCRD, threescale_api.resources.ActiveDoc):
+class OpenApiBody:
+    """
+    Resource with OpenAPI document in 'body'. Document is loaded on first
+    access of 'body', e.g. listing of resources or reading of name does not
+    download it.
+    """
+
+    openapi_ref = None
+
+    def __getitem__(self, item: str):
+        if item == "body":
+            self.load_body()
+        return super().__getitem__(item)
+
+    def get(self, item):
+        if item == "body":
+            self.load_body()
+        return super().get(item)
+
+    def load_body(self):
+        """Loads OpenAPI document to 'body' if it is not loaded yet."""
+        ref, self.openapi_ref = self.openapi_ref, None
+        if ref is not None:
+            OpenApiRef.load_openapi(self.entity, ref, self.client)
+
+    def take_lazy_fields(self, fetched):
+        # body of fetched resource is not loaded yet
+        self.openapi_ref = fetched.openapi_ref
+
+
+class ActiveDoc(OpenApiBody, DefaultResourceCRD, threescale_api.resources.ActiveDoc):
     """
     CRD resource for ActiveDoc.
     """
@@ -2197,20 +2381,21 @@ class ActiveDoc(DefaultResourceCRD, threescale_api.resources.ActiveDoc):
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_ACTIVE_DOC.items():
-                    if key == walue:
-                        entity[cey] = value
-            entity["id"] = crd.as_dict().get("status").get(ActiveDocs.ID_NAME)
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_ACTIVE_DOC)
+            )
+            entity["id"] = (crd.as_dict().get("status") or {}).get(ActiveDocs.ID_NAME)
+            client = kwargs["client"]
             if "service_id" in entity:
-                ide = Service.system_name_to_id.get(entity["service_id"], None)
+                ide = client.threescale_client.identity_cache.get_id(
+                    "Service", entity["service_id"]
+                )
                 if not ide:
-                    ide = kwargs["client"].parent.services.read_by_name(
-                        entity["service_id"]
-                    )["id"]
+                    ide = client.parent.services.read_by_name(entity["service_id"])["id"]
                 entity["service_id"] = ide
-
-            OpenApiRef.load_openapi(entity, spec["activeDocOpenAPIRef"])
+            if "url" in spec["activeDocOpenAPIRef"]:
+                entity["url"] = spec["activeDocOpenAPIRef"]["url"]
+            self.openapi_ref = spec["activeDocOpenAPIRef"]
 
             super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
         else:
@@ -2236,11 +2421,10 @@ class PolicyRegistry(DefaultResourceCRD, threescale_api.resources.PolicyRegistry
             # isinstance(spec['schema']['description'], list):
             #     spec['schema']['description'] = os.linesep.join(spec['schema']['description'])
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_POLICY_REG.items():
-                    if key == walue:
-                        entity[cey] = value
-            entity["id"] = crd.as_dict().get("status").get(PoliciesRegistry.ID_NAME)
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_POLICY_REG)
+            )
+            entity["id"] = (crd.as_dict().get("status") or {}).get(PoliciesRegistry.ID_NAME)
             super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
         else:
             # this is not here because of some backup, but because we need to have option
@@ -2261,11 +2445,10 @@ class Backend(DefaultResourceCRD, threescale_api.resources.Backend):
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_BACKEND.items():
-                    if key == walue:
-                        entity[cey] = value
-            entity["id"] = crd.as_dict().get("status").get(Backends.ID_NAME)
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_BACKEND)
+            )
+            entity["id"] = (crd.as_dict().get("status") or {}).get(Backends.ID_NAME)
 
             super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
         else:
@@ -2273,11 +2456,11 @@ class Backend(DefaultResourceCRD, threescale_api.resources.Backend):
             # to creater empty object without any data. This is related to "lazy load"
             super().__init__(entity_name=entity_name, **kwargs)
 
-    @property
+    @functools.cached_property
     def mapping_rules(self) -> "BackendMappingRules":
         return BackendMappingRules(parent=self, instance_klass=BackendMappingRule)
 
-    @property
+    @functools.cached_property
     def metrics(self) -> "BackendMetrics":
         return BackendMetrics(parent=self, instance_klass=BackendMetric)
 
@@ -2307,8 +2490,6 @@ class Metric(DefaultResourceCRD, threescale_api.resources.Metric):
     """
 
     GET_PATH = "spec/metrics"
-    system_name_to_id = {}
-    id_to_system_name = {}
 
     def __init__(self, entity_name="system_name", **kwargs):
         entity = None
@@ -2317,10 +2498,9 @@ class Metric(DefaultResourceCRD, threescale_api.resources.Metric):
             crd = kwargs.pop("crd")
             # client = kwargs.get('client')
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_METRIC.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_METRIC)
+            )
             # simulate id because CRD has no ids
             entity["id"] = (entity[entity_name], entity["unit"])
             self.entity_id = entity.get("id")
@@ -2347,7 +2527,7 @@ class Metric(DefaultResourceCRD, threescale_api.resources.Metric):
     def service(self) -> "Service":
         return self.parent
 
-    @property
+    @functools.cached_property
     def methods(self) -> "Methods":
         return Methods(parent=self, instance_klass=Method)
 
@@ -2367,8 +2547,6 @@ class BackendMetric(Metric):
     """
 
     GET_PATH = "spec/metrics"
-    system_name_to_id = {}
-    id_to_system_name = {}
 
     def __init__(self, entity_name="system_name", *args, **kwargs):
         super().__init__(entity_name=entity_name, *args, **kwargs)
@@ -2388,18 +2566,15 @@ class BackendUsage(DefaultResourceCRD, threescale_api.resources.BackendUsage):
             crd = kwargs.pop("crd")
             client = kwargs.get("client")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_BACKEND_USAGE.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_BACKEND_USAGE)
+            )
             entity["service_id"] = int(
                 crd.as_dict().get("status", {}).get(Services.ID_NAME, 0)
             )
-            back = client.threescale_client.backends.read_by_name(spec["name"])
-            # # exception for deleting BackendUsage which is used in any proxy,
-            # # backendusage should be removed first and then proxy.deploy should be performed
-            # entity['backend_id'] = int(back['id']) if back['id'] else None
-            entity["backend_id"] = int(back["id"])
+            entity["backend_id"] = client.threescale_client.backends.id_by_name(
+                spec["name"]
+            )
             # simulate entity_id by list of attributes
             entity["id"] = (entity["path"], entity["backend_id"], entity["service_id"])
             self.entity_id = entity.get("id")
@@ -2431,8 +2606,6 @@ class ApplicationPlan(DefaultResourceCRD, threescale_api.resources.ApplicationPl
     """
 
     GET_PATH = "spec/applicationPlans"
-    system_name_to_id = {}
-    id_to_system_name = {}
 
     def __init__(self, entity_name="system_name", **kwargs):
         entity = None
@@ -2441,10 +2614,9 @@ class ApplicationPlan(DefaultResourceCRD, threescale_api.resources.ApplicationPl
             crd = kwargs.pop("crd")
             client = kwargs.get("client")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_APP_PLANS.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_APP_PLANS)
+            )
             if entity_name in spec:
                 entity["name"] = spec[entity_name]
             spec["state_event"] = (
@@ -2506,10 +2678,9 @@ class Account(DefaultResourceCRD, threescale_api.resources.Account):
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_ACCOUNT.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_ACCOUNT)
+            )
             status = crd.as_dict().get("status", None)
             if status:
                 entity["id"] = status.get(Accounts.ID_NAME)
@@ -2567,10 +2738,9 @@ class AccountUser(DefaultResourceCRD, threescale_api.resources.AccountUser):
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_ACCOUNT_USER.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_ACCOUNT_USER)
+            )
             status = crd.as_dict().get("status", None)
             if status:
                 entity["id"] = status.get(AccountUsers.ID_NAME)
@@ -2584,17 +2754,21 @@ class AccountUser(DefaultResourceCRD, threescale_api.resources.AccountUser):
             super().__init__(entity=entity, entity_name=entity_name, **kwargs)
 
     @staticmethod
-    def create_password_secret(password, namespace):
-        """Creates password in secret."""
-        password_ascii = str(password).encode("ascii")
-        password_enc = base64.b64encode(password_ascii)
-        spec_sec = copy.deepcopy(constants.SPEC_SECRET)
-        name = secrets.token_urlsafe(8).lower().replace("_", "").replace("-", "")
-        spec_sec["metadata"]["name"] = name
-        spec_sec["metadata"]["namespace"] = namespace
-        spec_sec["data"]["password"] = password_enc.decode("ascii")
-        result = ocp.create(spec_sec)
-        assert result.status() == 0
+    def password_secret_name(account_name, username):
+        """
+        Returns name of secret with password of user. Hash of account name
+        and username keeps names unique also when normalization drops characters.
+        """
+        digest = hashlib.sha256(f"{account_name}\0{username}".encode("utf-8")).hexdigest()[:10]
+        prefix = DefaultClientCRD.normalize(account_name) + "-" + DefaultClientCRD.normalize(username)
+        return f"{prefix[:200]}-{digest}-pwdsec"
+
+    @staticmethod
+    def create_password_secret(password, namespace, transport, name=None):
+        """Creates password in secret, secret is not written if password is not changed."""
+        if name is None:
+            name = secrets.token_urlsafe(8).lower().replace("_", "").replace("-", "")
+        transport.apply_secret(namespace, name, {"password": password})
         return name
 
     # @property
@@ -2630,10 +2804,9 @@ class Policy(DefaultResourceCRD, threescale_api.resources.Policy):
             crd = kwargs.pop("crd")
             # client = kwargs.get('client')
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_POLICY.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_POLICY)
+            )
             entity["service_id"] = int(
                 crd.as_dict().get("status", {}).get(Services.ID_NAME, 0)
             )
@@ -2661,7 +2834,7 @@ class Policy(DefaultResourceCRD, threescale_api.resources.Policy):
 #        self._entity_id = value or self._entity.get('id')
 
 
-class OpenApi(DefaultResourceCRD):
+class OpenApi(OpenApiBody, DefaultResourceCRD):
     """
     CRD resource for OpenApi.
     """
@@ -2676,10 +2849,9 @@ class OpenApi(DefaultResourceCRD):
             crd = kwargs.pop("crd")
 
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_OPEN_API.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_OPEN_API)
+            )
             status = crd.as_dict().get("status")
             entity["id"] = status.get(OpenApis.ID_NAME)
             entity["productResourceName"] = status.get("productResourceName", {}).get(
@@ -2688,7 +2860,9 @@ class OpenApi(DefaultResourceCRD):
             entity["backendResourceNames"] = []
             for back_name in status.get("backendResourceNames", []):
                 entity["backendResourceNames"].append(back_name.get("name"))
-            OpenApiRef.load_openapi(entity, spec["openapiRef"])
+            if "url" in spec["openapiRef"]:
+                entity["url"] = spec["openapiRef"]["url"]
+            self.openapi_ref = spec["openapiRef"]
 
         super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
 
@@ -2720,19 +2894,20 @@ class Tenant(DefaultResourceCRD, threescale_api.resources.Tenant):
             crd = kwargs.pop("crd")
             entity = {Tenant.FOLD[0]: {Tenant.FOLD[1]: {}}}
             insert = entity[Tenant.FOLD[0]][Tenant.FOLD[1]]
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_TENANT.items():
-                    if key == walue:
-                        insert[cey] = value
+            insert.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_TENANT)
+            )
 
             insert["id"] = crd.as_dict()["status"][Tenants.ID_NAME]
             self.entity_id = insert.get("id")
             # get secret created by operator
-            sec_data = (
-                ocp.selector("secret/" + insert["tenantSecretRef"]["name"])
-                .objects()[0]
-                .as_dict()["data"]
-            )
+            client = kwargs["client"]
+            sec_ref = insert["tenantSecretRef"]
+            sec_data = client.transport.get(
+                "Secret",
+                sec_ref.get("namespace", client.threescale_client.ocp_namespace),
+                sec_ref["name"],
+            )["data"]
             insert["admin_base_url"] = base64.b64decode(sec_data["adminURL"])
             entity[Tenant.FOLD[0]]["access_token"] = {
                 "value": base64.b64decode(sec_data["token"])
@@ -2763,21 +2938,13 @@ class Limit(DefaultResourceCRD, threescale_api.resources.Limit):
             crd = kwargs.pop("crd")
             client = kwargs.get("client")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_LIMIT.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_LIMIT)
+            )
             entity["plan_id"] = client.parent["id"]
             entity["metric_name"] = spec["metricMethodRef"]["systemName"]
-            backend = None
             if "backend" in spec["metricMethodRef"]:
                 entity["backend_name"] = spec["metricMethodRef"]["backend"]
-                entity["metric_id"] = BackendMetric.system_name_to_id.get(
-                    entity["metric_name"], None
-                )
-                backend = client.threescale_client.backends.read_by_name(
-                    entity["backend_name"]
-                )
                 # simulate id because CRD has no ids
                 entity["id"] = (
                     entity["period"],
@@ -2785,42 +2952,10 @@ class Limit(DefaultResourceCRD, threescale_api.resources.Limit):
                     entity["backend_name"],
                 )
             else:
-                entity["metric_id"] = Metric.system_name_to_id.get(
-                    entity["metric_name"], None
-                )
                 # simulate id because CRD has no ids
                 entity["id"] = (entity["period"], entity["metric_name"])
             self.entity_id = entity.get("id")
-            if not entity["metric_id"]:
-                if "backend" in spec["metricMethodRef"]:
-                    backend.metrics.disable_crd_implemented()
-                    entity["metric_id"] = int(
-                        threescale_api.resources.BackendMetrics.read_by_name(
-                            backend.metrics,
-                            entity["metric_name"] + "." + str(backend["id"]),
-                        ).entity_id
-                    )
-                    BackendMetric.system_name_to_id[entity["metric_name"]] = entity[
-                        "metric_id"
-                    ]
-                    BackendMetric.id_to_system_name[entity["metric_id"]] = entity[
-                        "metric_name"
-                    ]
-                    backend.metrics.enable_crd_implemented()
-                else:
-                    client.topmost_parent().metrics.disable_crd_implemented()
-                    entity["metric_id"] = int(
-                        threescale_api.resources.Metrics.read_by_name(
-                            client.topmost_parent().metrics, entity["metric_name"]
-                        ).entity_id
-                    )
-                    Metric.system_name_to_id[entity["metric_name"]] = entity[
-                        "metric_id"
-                    ]
-                    Metric.id_to_system_name[entity["metric_id"]] = entity[
-                        "metric_name"
-                    ]
-                    client.topmost_parent().metrics.enable_crd_implemented()
+            entity["metric_id"] = client.metric_ref_id(spec["metricMethodRef"])
 
             super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
         else:
@@ -2845,21 +2980,13 @@ class PricingRule(DefaultResourceCRD, threescale_api.resources.PricingRule):
             crd = kwargs.pop("crd")
             client = kwargs.get("client")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_PRICING_RULE.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_PRICING_RULE)
+            )
             entity["plan_id"] = client.parent["id"]
             entity["metric_name"] = spec["metricMethodRef"]["systemName"]
-            backend = None
             if "backend" in spec["metricMethodRef"]:
                 entity["backend_name"] = spec["metricMethodRef"]["backend"]
-                entity["metric_id"] = BackendMetric.system_name_to_id.get(
-                    entity["metric_name"], None
-                )
-                backend = client.threescale_client.backends.read_by_name(
-                    entity["backend_name"]
-                )
                 # simulate id because CRD has no ids
                 entity["id"] = (
                     entity["min"],
@@ -2868,42 +2995,10 @@ class PricingRule(DefaultResourceCRD, threescale_api.resources.PricingRule):
                     entity["backend_name"],
                 )
             else:
-                entity["metric_id"] = Metric.system_name_to_id.get(
-                    entity["metric_name"], None
-                )
                 # simulate id because CRD has no ids
                 entity["id"] = (entity["min"], entity["max"], entity["metric_name"])
             self.entity_id = entity.get("id")
-            if not entity["metric_id"]:
-                if "backend" in spec["metricMethodRef"]:
-                    backend.metrics.disable_crd_implemented()
-                    entity["metric_id"] = int(
-                        threescale_api.resources.BackendMetrics.read_by_name(
-                            backend.metrics,
-                            entity["metric_name"] + "." + str(backend["id"]),
-                        ).entity_id
-                    )
-                    BackendMetric.system_name_to_id[entity["metric_name"]] = entity[
-                        "metric_id"
-                    ]
-                    BackendMetric.id_to_system_name[entity["metric_id"]] = entity[
-                        "metric_name"
-                    ]
-                    backend.metrics.enable_crd_implemented()
-                else:
-                    client.topmost_parent().metrics.disable_crd_implemented()
-                    entity["metric_id"] = int(
-                        threescale_api.resources.Metrics.read_by_name(
-                            client.topmost_parent().metrics, entity["metric_name"]
-                        ).entity_id
-                    )
-                    Metric.system_name_to_id[entity["metric_name"]] = entity[
-                        "metric_id"
-                    ]
-                    Metric.id_to_system_name[entity["metric_id"]] = entity[
-                        "metric_name"
-                    ]
-                    client.topmost_parent().metrics.enable_crd_implemented()
+            entity["metric_id"] = client.metric_ref_id(spec["metricMethodRef"])
 
             super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
         else:
@@ -2931,10 +3026,9 @@ class Promote(DefaultResourceCRD):
             crd = kwargs.pop("crd")
 
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_PROMOTE.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_PROMOTE)
+            )
             entity["id"] = crd.as_dict().get("status", {}).get(Promotes.ID_NAME, None)
 
         super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
@@ -2946,6 +3040,7 @@ class Application(DefaultResourceCRD, threescale_api.resources.Application):
     """
 
     GET_PATH = "spec"
+    KEYS = ("user_key", "application_id", "client_id", "client_secret")
 
     def __init__(self, entity_name="name", **kwargs):
         entity = None
@@ -2953,10 +3048,9 @@ class Application(DefaultResourceCRD, threescale_api.resources.Application):
             entity = {}
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_APPLICATION.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_APPLICATION)
+            )
             status = crd.as_dict().get("status")
             entity["id"] = status.get(Applications.ID_NAME)
             entity["state"] = status.get("state")
@@ -2964,27 +3058,37 @@ class Application(DefaultResourceCRD, threescale_api.resources.Application):
             entity["service_name"] = spec.get("productCR").get("name")
             entity["account_name"] = spec.get("accountCR").get("name")
 
-            # load auth keys
-            client = kwargs["client"]
-            client.disable_crd_implemented()
-            acc = client.parent.accounts.select_by(name=entity["account_name"])[0]
-            app = acc.applications.read(entity["id"])
-            auth = app.service["backend_version"]
-            if auth == Service.AUTH_USER_KEY:
-                entity["user_key"] = app["user_key"]
-            elif auth == Service.AUTH_APP_ID_KEY:
-                entity["application_id"] = app["application_id"]
-            elif auth == Service.AUTH_OIDC:
-                entity["client_id"] = app["client_id"]
-                entity["client_secret"] = app["client_secret"]
-            client.enable_crd_implemented()
-
+            # auth keys are loaded on first access, together with the group
+            self.keys_group = [self]
             super().__init__(crd=crd, entity=entity, entity_name=entity_name, **kwargs)
         else:
             # this is not here because of some backup, but because we need to have option
             # to creater empty object without any data. This is related to "lazy load"
+            self.keys_group = None
             super().__init__(entity_name=entity_name, **kwargs)
 
+    def __getitem__(self, item: str):
+        if item in Application.KEYS:
+            self.load_keys()
+        return super().__getitem__(item)
+
+    def get(self, item):
+        if item in Application.KEYS:
+            self.load_keys()
+        return super().get(item)
+
+    def load_keys(self):
+        """
+        Loads auth keys if they are not loaded yet. Keys of all applications
+        of the same list are loaded together.
+        """
+        if self.keys_group is not None:
+            self.client.load_keys(self.keys_group)
+
+    def take_lazy_fields(self, fetched):
+        # keys of fetched application are not loaded yet
+        self.keys_group = [self] if fetched.keys_group is not None else None
+
     @property
     def service(self) -> "Service":
         "The service to which this application is bound"
@@ -3005,26 +3109,27 @@ class Application(DefaultResourceCRD, threescale_api.resources.Application):
 
         Returns(Application): Application resource instance
         """
-        app = self
-        status = None
-        if state == "suspend":
-            app = self.update({"suspend": True})
-            status = "suspended"
-        if state == "resume":
-            app = self.update({"suspend": False})
-            status = "live"
-        counters = [89, 55, 34, 21, 13, 8, 5, 3, 2, 1, 1, 1]
-        while app["state"] != status and len(counters):
-            time.sleep(counters.pop())
-            app = app.read()
-
+        if state not in Applications.STATES:
+            return self
+        app = self.update({"suspend": Applications.STATES[state][0]})
+        status = Applications.STATES[state][1]
+        try:
+            obj = app.client.wait_for(
+                app.crd.name(),
+                lambda obj: Applications.crd_state(obj) == status,
+                app.client.STATE_TIMEOUT,
+                failed=app.client._is_failed,
+            )
+        except threescale_api.errors.ThreeScaleApiError as err:
+            LOG.warning("Application %s: %s", app.crd.name(), str(err))
+            return app
+        app.crd.model = obj.model
+        app.entity["state"] = status
         return app
 
 
 class Method(DefaultResourceCRD, threescale_api.resources.Method):
     GET_PATH = "spec/methods"
-    system_name_to_id = {}
-    id_to_system_name = {}
 
     def __init__(self, entity_name="system_name", **kwargs):
         entity = None
@@ -3032,10 +3137,9 @@ class Method(DefaultResourceCRD, threescale_api.resources.Method):
             spec = kwargs.pop("spec")
             crd = kwargs.pop("crd")
             entity = {}
-            for key, value in spec.items():
-                for cey, walue in constants.KEYS_METHOD.items():
-                    if key == walue:
-                        entity[cey] = value
+            entity.update(
+                DefaultResourceCRD.translate_from_crd(spec, constants.CRD_KEYS_METHOD)
+            )
             # simulate id because CRD has no ids
             if "name" not in entity:
                 entity["name"] = entity["friendly_name"]
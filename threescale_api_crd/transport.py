@@ -0,0 +1,627 @@
+""" Module with transports used by CRD clients to access API server """
+
+import base64
+import concurrent.futures
+import copy
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import weakref
+from urllib.parse import quote
+
+import threescale_api.errors
+from threescale_api_crd import constants
+from threescale_api_crd.lazy import LazyModule
+
+ocp = LazyModule("openshift_client")
+yaml = LazyModule("yaml")
+requests = LazyModule("requests")
+
+LOG = logging.getLogger(__name__)
+
+_PAYLOAD = threading.local()
+
+
+def payload_size():
+    """Returns size of payload sent and received by transport calls in this thread."""
+    return getattr(_PAYLOAD, "size", 0)
+
+
+def add_payload_size(size):
+    """Adds size of payload sent or received by transport."""
+    _PAYLOAD.size = payload_size() + size
+
+
+def reset_payload_size():
+    """Resets payload size counter of this thread."""
+    _PAYLOAD.size = 0
+
+
+def merge_patch(old, new):
+    """Returns JSON merge patch (RFC 7386) which changes dict 'old' to dict 'new'."""
+    patch = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        old_value = old.get(key)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            sub_patch = merge_patch(old_value, value)
+            if sub_patch:
+                patch[key] = sub_patch
+        elif key not in old or old_value != value:
+            patch[key] = value
+    return patch
+
+
+def apply_merge_patch(obj, patch):
+    """Returns copy of 'obj' with applied JSON merge patch."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    ret = copy.deepcopy(obj) if isinstance(obj, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            ret.pop(key, None)
+        else:
+            ret[key] = apply_merge_patch(ret.get(key), value)
+    return ret
+
+
+class TransportError(threescale_api.errors.ThreeScaleApiError):
+    """Error returned by API server."""
+
+    def __init__(self, message, code=None):
+        self.code = code
+        super().__init__(message)
+
+
+class Watch:
+    """Iterator over watch events. It can be closed from another thread."""
+
+    def __init__(self, events, close):
+        self._events = events
+        self._close = close
+
+    @classmethod
+    def from_lines(cls, lines, close):
+        """Returns Watch over events encoded as json lines."""
+        return cls((json.loads(line) for line in lines if line and line.strip()), close)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def close(self):
+        """Stops watching."""
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Transport:
+    """
+    Base class of transports. Objects are passed as dicts in the same
+    form as API server returns them.
+    """
+
+    namespace = None
+
+    @staticmethod
+    def path(kind, namespace, name=None):
+        """Returns API server path of the collection or object."""
+        api_version = constants.API_VERSIONS[kind]
+        prefix = "/apis/" if "/" in api_version else "/api/"
+        path = f"{prefix}{api_version}/namespaces/{namespace}/{kind.lower()}s"
+        if name:
+            path += "/" + name
+        return path
+
+    @staticmethod
+    def watch_params(resource_version=None, name=None, timeout=None):
+        """Returns query parameters of watch request."""
+        params = {"watch": "true", "allowWatchBookmarks": "true"}
+        if resource_version:
+            params["resourceVersion"] = resource_version
+        if name:
+            params["fieldSelector"] = "metadata.name=" + name
+        if timeout:
+            params["timeoutSeconds"] = str(max(int(timeout), 1))
+        return params
+
+    def list(self, kind, namespace):
+        """Returns List of all objects of the kind."""
+        raise NotImplementedError
+
+    def get(self, kind, namespace, name):
+        """Returns object or None if it does not exist."""
+        raise NotImplementedError
+
+    def create(self, obj):
+        """Creates object and returns it."""
+        raise NotImplementedError
+
+    def replace(self, obj):
+        """Replaces object and returns it."""
+        raise NotImplementedError
+
+    def create_many(self, objs):
+        """
+        Creates objects. Returns list of created objects in order of 'objs',
+        item of failed create is TransportError.
+        """
+        return [self._create_or_error(obj) for obj in objs]
+
+    def _create_or_error(self, obj):
+        try:
+            return self.create(obj)
+        except TransportError as err:
+            return err
+
+    def patch(self, kind, namespace, name, patch):
+        """
+        Applies JSON merge patch to object and returns it. If the patch contains
+        'metadata.resourceVersion', it is precondition of the change.
+        """
+        raise NotImplementedError
+
+    def apply_secret(self, namespace, name, data, retries=3):
+        """
+        Creates secret with 'data' (values are base64 encoded here) or updates
+        existing secret in place. Hash of data is stored in annotation of
+        the secret, secret with the same hash is not written. Returns secret.
+        """
+        data = {
+            key: base64.b64encode(str(value).encode("ascii")).decode("ascii")
+            for key, value in data.items()
+        }
+        digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+        for _ in range(retries):
+            secret = self.get("Secret", namespace, name)
+            if secret is None:
+                secret = copy.deepcopy(constants.SPEC_SECRET)
+                secret["metadata"]["name"] = name
+                secret["metadata"]["namespace"] = namespace
+            else:
+                annotations = secret["metadata"].get("annotations") or {}
+                if annotations.get(constants.SECRET_HASH_ANNOTATION) == digest:
+                    return secret
+            secret["metadata"]["annotations"] = {
+                **(secret["metadata"].get("annotations") or {}),
+                constants.SECRET_HASH_ANNOTATION: digest,
+            }
+            secret["data"] = data
+            try:
+                if "resourceVersion" in secret["metadata"]:
+                    return self.replace(secret)
+                return self.create(secret)
+            except TransportError as err:
+                # secret was created or changed meanwhile
+                if err.code != 409:
+                    raise
+        raise TransportError(f'Secret "{name}" is changed by others', code=409)
+
+    def delete(self, kind, namespace, name):
+        """Deletes object, missing object is ignored."""
+        raise NotImplementedError
+
+    def watch(self, kind, namespace, resource_version=None, name=None, timeout=None):
+        """Returns Watch with events of objects of the kind."""
+        raise NotImplementedError
+
+
+class OcTransport(Transport):
+    """Transport which runs `oc` via openshift_client."""
+
+    ERROR_CODES = {"(NotFound)": 404, "(AlreadyExists)": 409, "(Conflict)": 409}
+
+    _loglevel = None
+
+    def __init__(self, loglevel=6):
+        # openshift_client is imported on first `oc` call, not by construction
+        self._loglevel = loglevel
+
+    def _ocp(self):
+        """Returns openshift_client, default loglevel is set on first use."""
+        if self._loglevel is not None:
+            ocp.set_default_loglevel(self._loglevel)
+            self._loglevel = None
+        return ocp
+
+    @staticmethod
+    def qname(kind, name):
+        """Returns qualified name of the object used by `oc`."""
+        group = constants.API_VERSIONS[kind].rpartition("/")[0]
+        qkind = kind.lower() + ("." + group if group else "")
+        return qkind + "/" + name
+
+    def list(self, kind, namespace):
+        return json.loads(self._invoke("get", ["--raw", self.path(kind, namespace)]))
+
+    def get(self, kind, namespace, name):
+        out = self._invoke(
+            "get",
+            [self.qname(kind, name), "-o=json", "--ignore-not-found"],
+            namespace=namespace,
+        )
+        return json.loads(out) if out.strip() else None
+
+    def create(self, obj):
+        return json.loads(self._invoke("create", ["-f", "-", "-o=json"], obj=obj))
+
+    def replace(self, obj):
+        return json.loads(self._invoke("replace", ["-f", "-", "-o=json"], obj=obj))
+
+    def create_many(self, objs):
+        """All objects are created by one `oc create` of List."""
+        if not objs:
+            return []
+        stdin_str = json.dumps({"apiVersion": "v1", "kind": "List", "items": objs})
+        result = self._ocp().invoke(
+            "create",
+            ["-f", "-", "-o=json"],
+            stdin_str=stdin_str,
+            no_namespace=True,
+            auto_raise=False,
+        )
+        add_payload_size(len(stdin_str) + len(result.out()))
+        out = json.loads(result.out()) if result.out().strip() else {}
+        created = {
+            (obj["kind"], obj["metadata"]["name"]): obj
+            for obj in (out.get("items", []) if out.get("kind") == "List" else [out])
+            if obj
+        }
+        errors = result.err().splitlines()
+        ret = []
+        for obj in objs:
+            name = obj["metadata"]["name"]
+            if (obj["kind"], name) in created:
+                ret.append(created[(obj["kind"], name)])
+                continue
+            err = next((line for line in errors if f'"{name}"' in line), result.err())
+            code = None
+            for key, value in OcTransport.ERROR_CODES.items():
+                if key in err:
+                    code = value
+            ret.append(TransportError(f"oc create failed: {err}", code=code))
+        return ret
+
+    def patch(self, kind, namespace, name, patch):
+        data = json.dumps(patch)
+        add_payload_size(len(data))
+        out = self._invoke(
+            "patch",
+            [self.qname(kind, name), "--type=merge", "-p", data, "-o=json"],
+            namespace=namespace,
+        )
+        return json.loads(out)
+
+    def delete(self, kind, namespace, name):
+        self._invoke(
+            "delete", [self.qname(kind, name), "--ignore-not-found"], namespace=namespace
+        )
+
+    def watch(self, kind, namespace, resource_version=None, name=None, timeout=None):
+        params = self.watch_params(resource_version, name, timeout)
+        path = self.path(kind, namespace) + "?" + "&".join(
+            key + "=" + quote(value) for key, value in params.items()
+        )
+        files = []
+        try:
+            process = subprocess.Popen(
+                self._oc_command(files, "get", "--raw", path),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except BaseException:
+            _remove_files(files)
+            raise
+
+        def close():
+            process.kill()
+            process.wait()
+            _remove_files(files)
+
+        return Watch.from_lines(process.stdout, close)
+
+    @staticmethod
+    def _oc_command(files, *args):
+        """
+        Returns `oc` command of current openshift_client context. Token is
+        not passed on command line (visible in process list), it is stored
+        with server into temporary kubeconfig, its path is added to 'files'.
+        """
+        context = ocp.cur_context()
+        cmd = [context.get_oc_path()]
+        kubeconfig = context.get_kubeconfig_path()
+        server = context.get_api_server()
+        if context.get_token():
+            server = server or _current_server(kubeconfig)
+            kubeconfig = _token_kubeconfig(
+                server, context.get_token(), context.get_skip_tls_verify()
+            )
+            files.append(kubeconfig)
+        if kubeconfig:
+            cmd.append("--kubeconfig=" + kubeconfig)
+        if server:
+            cmd.append("--server=" + server)
+        if context.get_skip_tls_verify():
+            cmd.append("--insecure-skip-tls-verify")
+        cmd.extend(args)
+        return cmd
+
+    def _invoke(self, verb, cmd_args, namespace=None, obj=None):
+        if namespace:
+            cmd_args = cmd_args + ["--namespace=" + namespace]
+        stdin_str = json.dumps(obj) if obj is not None else None
+        result = self._ocp().invoke(
+            verb, cmd_args, stdin_str=stdin_str, no_namespace=True, auto_raise=False
+        )
+        add_payload_size(len(stdin_str or "") + len(result.out()))
+        if result.status():
+            err = result.err()
+            code = None
+            for key, value in OcTransport.ERROR_CODES.items():
+                if key in err:
+                    code = value
+            raise TransportError(f"oc {verb} failed: {err}", code=code)
+        return result.out()
+
+
+class HttpTransport(Transport):
+    """
+    Transport which talks to API server directly over pooled keep-alive
+    HTTP session. Credentials are loaded from kubeconfig or from service account.
+    """
+
+    SERVICE_ACCOUNT_DIR = "/var/run/secrets/kubernetes.io/serviceaccount"
+
+    def __init__(
+        self,
+        server,
+        token=None,
+        verify=True,
+        cert=None,
+        namespace=None,
+        pool_size=10,
+        timeout=60,
+    ):
+        self._server = server.rstrip("/")
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self.namespace = namespace
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.verify = verify
+        self._session.cert = cert
+        # files with decoded kubeconfig data (keys, certificates)
+        self._temp_files = []
+        self._finalizer = weakref.finalize(self, _remove_files, self._temp_files)
+        self._session.headers["Accept"] = "application/json"
+        if token:
+            self._session.headers["Authorization"] = "Bearer " + token
+
+    @classmethod
+    def in_cluster(cls, **kwargs):
+        """Returns transport configured by pod service account."""
+        sa_dir = HttpTransport.SERVICE_ACCOUNT_DIR
+        host = os.environ["KUBERNETES_SERVICE_HOST"]
+        port = os.environ.get("KUBERNETES_SERVICE_PORT", "443")
+        with open(os.path.join(sa_dir, "token")) as token_file:
+            kwargs.setdefault("token", token_file.read().strip())
+        with open(os.path.join(sa_dir, "namespace")) as ns_file:
+            kwargs.setdefault("namespace", ns_file.read().strip())
+        kwargs.setdefault("verify", os.path.join(sa_dir, "ca.crt"))
+        if ":" in host:
+            host = f"[{host}]"
+        return cls(f"https://{host}:{port}", **kwargs)
+
+    @classmethod
+    def from_kubeconfig(cls, path=None, context=None, **kwargs):
+        """Returns transport configured by kubeconfig context."""
+        with open(_kubeconfig_path(path)) as config_file:
+            config = yaml.safe_load(config_file)
+        ctx = _named(config.get("contexts"), context or config["current-context"])
+        cluster = _named(config.get("clusters"), ctx["cluster"])
+        user = _named(config.get("users"), ctx.get("user"))
+
+        files = []
+        try:
+            if cluster.get("insecure-skip-tls-verify"):
+                kwargs.setdefault("verify", False)
+            elif "verify" not in kwargs:
+                kwargs["verify"] = (
+                    _data_file(cluster, "certificate-authority", files) or True
+                )
+            token = user.get("token")
+            if not token and user.get("tokenFile"):
+                with open(user["tokenFile"]) as token_file:
+                    token = token_file.read().strip()
+            kwargs.setdefault("token", token)
+            if "cert" not in kwargs:
+                client_cert = _data_file(user, "client-certificate", files)
+                if client_cert:
+                    kwargs["cert"] = (client_cert, _data_file(user, "client-key", files))
+            kwargs.setdefault("namespace", ctx.get("namespace"))
+            transport = cls(cluster["server"], **kwargs)
+        except BaseException:
+            _remove_files(files)
+            raise
+        transport._temp_files.extend(files)
+        return transport
+
+    @classmethod
+    def from_environment(cls, **kwargs):
+        """Returns in cluster transport in pod, otherwise transport from kubeconfig."""
+        if os.environ.get("KUBERNETES_SERVICE_HOST") and os.path.exists(
+            os.path.join(HttpTransport.SERVICE_ACCOUNT_DIR, "token")
+        ):
+            return cls.in_cluster(**kwargs)
+        return cls.from_kubeconfig(**kwargs)
+
+    def close(self):
+        """Closes HTTP session and removes temporary files with kubeconfig data."""
+        self._session.close()
+        self._finalizer()
+
+    def list(self, kind, namespace):
+        return self._request("GET", self.path(kind, namespace))
+
+    def get(self, kind, namespace, name):
+        return self._request("GET", self.path(kind, namespace, name), not_found=None)
+
+    def create(self, obj):
+        path = self.path(obj["kind"], obj["metadata"]["namespace"])
+        return self._request("POST", path, obj=obj)
+
+    def replace(self, obj):
+        metadata = obj["metadata"]
+        path = self.path(obj["kind"], metadata["namespace"], metadata["name"])
+        return self._request("PUT", path, obj=obj)
+
+    def create_many(self, objs):
+        """Objects are created by concurrent requests over pooled connections."""
+        if len(objs) < 2:
+            return super().create_many(objs)
+        with concurrent.futures.ThreadPoolExecutor(self._pool_size) as executor:
+            return list(executor.map(self._create_or_error, objs))
+
+    def patch(self, kind, namespace, name, patch):
+        return self._request(
+            "PATCH",
+            self.path(kind, namespace, name),
+            obj=patch,
+            content_type="application/merge-patch+json",
+        )
+
+    def delete(self, kind, namespace, name):
+        self._request("DELETE", self.path(kind, namespace, name), not_found=None)
+
+    def watch(self, kind, namespace, resource_version=None, name=None, timeout=None):
+        response = self._session.get(
+            self._server + self.path(kind, namespace),
+            params=self.watch_params(resource_version, name, timeout),
+            stream=True,
+            timeout=(self._timeout, None),
+        )
+        self._check(response, "WATCH", kind)
+        return Watch.from_lines(response.iter_lines(decode_unicode=True), response.close)
+
+    def _request(
+        self, method, path, obj=None, not_found=False, content_type="application/json"
+    ):
+        data = json.dumps(obj) if obj is not None else None
+        headers = {"Content-Type": content_type} if data else None
+        response = self._session.request(
+            method, self._server + path, data=data, headers=headers, timeout=self._timeout
+        )
+        add_payload_size(len(data or "") + len(response.content))
+        if response.status_code == 404 and not_found is not False:
+            return not_found
+        self._check(response, method, path)
+        return response.json()
+
+    @staticmethod
+    def _check(response, method, path):
+        if not response.ok:
+            raise TransportError(
+                f"{method} {path} failed({response.status_code}): {response.text}",
+                code=response.status_code,
+            )
+
+
+def default_namespace(kubeconfig=None):
+    """
+    Returns namespace of current kubeconfig context ('default' if the context
+    has none), without kubeconfig namespace of pod service account.
+    Returns None if neither is available. It is read without `oc`.
+    """
+    path = _kubeconfig_path(kubeconfig)
+    if os.path.exists(path):
+        with open(path) as config_file:
+            config = yaml.safe_load(config_file) or {}
+        ctx = _named(config.get("contexts"), config.get("current-context"))
+        if ctx:
+            return ctx.get("namespace") or "default"
+    ns_path = os.path.join(HttpTransport.SERVICE_ACCOUNT_DIR, "namespace")
+    if os.path.exists(ns_path):
+        with open(ns_path) as ns_file:
+            return ns_file.read().strip() or None
+    return None
+
+
+def _kubeconfig_path(path=None):
+    """Returns path to kubeconfig, first file from KUBECONFIG is used."""
+    if path is None:
+        path = os.environ.get("KUBECONFIG", "~/.kube/config").split(os.pathsep)[0]
+    return os.path.expanduser(path)
+
+
+def _named(items, name):
+    """Returns content of named item from kubeconfig list."""
+    for item in items or []:
+        if item["name"] == name:
+            for key, value in item.items():
+                if key != "name":
+                    return value or {}
+    return {}
+
+
+def _data_file(config, key, files):
+    """
+    Returns path to file from kubeconfig, '<key>-data' is stored into temp.
+    file readable only by owner, its path is added to 'files'.
+    """
+    if config.get(key + "-data"):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pem") as data_file:
+            files.append(data_file.name)
+            data_file.write(base64.b64decode(config[key + "-data"]))
+        return data_file.name
+    return config.get(key)
+
+
+def _remove_files(files):
+    """Removes temporary files, missing ones are ignored."""
+    while files:
+        try:
+            os.unlink(files.pop())
+        except FileNotFoundError:
+            pass
+
+
+def _token_kubeconfig(server, token, skip_tls_verify=False):
+    """Returns path to temp. kubeconfig with server and token, it is readable only by owner."""
+    cluster = {"server": server}
+    if skip_tls_verify:
+        cluster["insecure-skip-tls-verify"] = True
+    config = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": "cluster", "cluster": cluster}],
+        "users": [{"name": "user", "user": {"token": token}}],
+        "contexts": [{"name": "ctx", "context": {"cluster": "cluster", "user": "user"}}],
+        "current-context": "ctx",
+    }
+    fd, path = tempfile.mkstemp(suffix=".kubeconfig")
+    with os.fdopen(fd, "w") as config_file:
+        json.dump(config, config_file)
+    return path
+
+
+def _current_server(path=None):
+    """Returns API server of current context of kubeconfig or None."""
+    path = _kubeconfig_path(path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as config_file:
+        config = yaml.safe_load(config_file) or {}
+    ctx = _named(config.get("contexts"), config.get("current-context"))
+    return _named(config.get("clusters"), ctx.get("cluster")).get("server")